@@ -13,12 +13,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from cli_chess.core.main import MainModel, MainPresenter
+from cli_chess.core.main.main_model import MainModel
 
 
 def main() -> None:
-    """Main entry point"""
-    MainPresenter(MainModel()).run()
+    """Main entry point. The arguments are handled before the UI is imported, so
+       the commands which exit right away (e.g. --version) don't have to load it.
+    """
+    model = MainModel()
+
+    from cli_chess.core.main.main_presenter import MainPresenter
+    MainPresenter(model).run()
 
 
 if __name__ == "__main__":
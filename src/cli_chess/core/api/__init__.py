@@ -1,3 +1,9 @@
-from cli_chess.core.api.incoming_event_manger import IncomingEventManager
-from cli_chess.core.api.game_state_dispatcher import GameStateDispatcher
-from cli_chess.core.api.api_manager import required_token_scopes
+from cli_chess.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".incoming_event_manger": ("IncomingEventManager",),
+    ".game_state_dispatcher": ("GameStateDispatcher",),
+    ".token_scopes": ("required_token_scopes",),
+    ".stream_broker": ("stream_broker", "StreamPriority"),
+    ".tv_directory": ("tv_directory",),
+})
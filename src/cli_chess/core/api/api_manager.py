@@ -14,27 +14,33 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from cli_chess.core.api.incoming_event_manger import IncomingEventManager
+from cli_chess.core.api.token_scopes import required_token_scopes
+from cli_chess.core.api.rate_limiter import rate_limiter
 from cli_chess.utils.logging import log
 from berserk import Client, TokenSession
 from typing import Optional
 
-required_token_scopes: set = {"board:play", "challenge:read", "challenge:write"}
 api_session: Optional[TokenSession]
 api_client: Optional[Client]
 api_iem: Optional[IncomingEventManager]
 api_ready = False
 
 
-def _start_api(token: str):
+def _start_api(token: str, base_url: Optional[str] = None):
     """Handles creating a new API session, client, and IEM
        when the API token has been updated. This generally
        should only ever be called via the Token Manager on
-       token verification.
+       token verification. The base url defaults to lichess.org
+       and is only overridden to point at a local test server.
     """
     global api_session, api_client, api_iem, api_ready
     try:
+        if api_ready and api_iem:
+            api_iem.stop()  # The stream of the previously linked account is no longer needed
+
         api_session = TokenSession(token)
-        api_client = Client(api_session)
+        rate_limiter.install(api_session)
+        api_client = Client(api_session, base_url=base_url)
         api_iem = IncomingEventManager()
         api_iem.start()
         api_ready = True
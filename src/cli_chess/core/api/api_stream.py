@@ -0,0 +1,156 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api.stream_broker import StreamBroker, StreamPriority, stream_broker
+from cli_chess.utils.logging import log
+from berserk import Client
+from berserk.exceptions import ApiError, ResponseError
+from typing import Callable, Iterator, Optional
+from urllib.parse import urljoin
+import requests
+import threading
+import socket
+import json
+
+_live_streams = 0
+_live_streams_lock = threading.Lock()
+
+
+def get_live_stream_count() -> int:
+    """Returns the number of API streams currently open"""
+    with _live_streams_lock:
+        return _live_streams
+
+
+def _update_live_stream_count(delta: int) -> None:
+    global _live_streams
+    with _live_streams_lock:
+        _live_streams += delta
+
+
+class ApiStream:
+    """An NDJSON stream from the Lichess API which can be closed from any
+       thread. Closing aborts the underlying HTTP response immediately rather
+       than waiting for the next event to arrive (as closing a berserk stream
+       generator would). Iterating a closed stream ends without an exception.
+       If a broker is passed in, the stream waits for a slot from the broker
+       before opening. The broker may close (preempt) the stream at any time
+       to make room for a more important stream, in which case `preempted` is set.
+       If a read timeout is set, a stream which is silent for longer than the
+       timeout (Lichess sends keep-alive lines) raises an ApiError.
+    """
+    # The stream can be opened again to pick up where it dropped
+    reconnectable = True
+
+    def __init__(self, client: Client, path: str, converter: Optional[Callable[[dict], dict]] = None,
+                 priority: StreamPriority = StreamPriority.TV, broker: Optional[StreamBroker] = None,
+                 read_timeout: Optional[float] = None):
+        # berserk doesn't expose the response of its streams,
+        # so the request is made using the client's session
+        self.session: requests.Session = client._r.session
+        self.url = urljoin(client._r.base_url, path)
+        self.converter = converter
+        self.priority = priority
+        self.broker = broker
+        self.read_timeout = read_timeout
+        self.closed = False
+        self.preempted = False
+        self._response: Optional[requests.Response] = None
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[dict]:
+        if self.closed or (self.broker and not self.broker.acquire(self)):
+            return
+
+        try:
+            response = self.session.get(self.url, stream=True, headers={"Accept": "application/x-ndjson"},
+                                        timeout=self.read_timeout)
+        except requests.RequestException as e:
+            self.close()
+            raise ApiError(e)
+
+        with self._lock:
+            if self.closed:  # Closed while the request was being made
+                response.close()
+                return
+            self._response = response
+            _update_live_stream_count(1)
+
+        try:
+            if not response.ok:
+                raise ResponseError(response)
+
+            for line in response.iter_lines():
+                if self.closed:
+                    break
+                if line:
+                    event = json.loads(line.decode("utf-8"))
+                    yield self.converter(event) if self.converter else event
+        except Exception as e:
+            if not self.closed:
+                if isinstance(e, requests.RequestException):
+                    raise ApiError(e)
+                raise
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Closes the stream. This is safe to call from any thread"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            response = self._response
+
+        if response is not None:
+            _abort_response(response)
+            _update_live_stream_count(-1)
+            log.debug(f"Closed stream: {self.url}")
+
+        if self.broker:
+            self.broker.release(self)
+
+
+def open_api_stream(client: Client, path: str, priority: StreamPriority,
+                    converter: Optional[Callable[[dict], dict]] = None,
+                    read_timeout: Optional[float] = None) -> ApiStream:
+    """Returns a closable stream of the API path which is managed by the
+       stream broker. Clients standing in for the berserk client (e.g. a
+       journal replay) can provide their own streams by implementing `open_stream`
+    """
+    if hasattr(client, "open_stream"):
+        return client.open_stream(path, converter)
+    return ApiStream(client, path, converter, priority, stream_broker, read_timeout)
+
+
+def _abort_response(response: requests.Response) -> None:
+    """Shuts down the socket of the response so a read blocked
+       in another thread returns immediately, then closes it
+    """
+    try:
+        response.raw.shutdown()  # urllib3 >= 2.3
+    except (AttributeError, ValueError, RuntimeError):
+        sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+        if sock is None:
+            fp = getattr(getattr(response.raw, "_fp", None), "fp", None)
+            sock = getattr(getattr(fp, "raw", None), "_sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    except OSError:
+        pass  # The socket is already closed
+    response.close()
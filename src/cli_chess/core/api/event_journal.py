@@ -0,0 +1,260 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.logging import log
+from berserk import models
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Callable, Dict, Iterator, List, Optional
+import threading
+import atexit
+import json
+
+JOURNAL_VERSION = 1
+
+# Recorded events are buffered and written to the journal file at most
+# this often (in seconds), so recording doesn't block the stream threads
+JOURNAL_FLUSH_INTERVAL = 1.0
+SOURCE_GSD = "gsd"
+SOURCE_IEM = "iem"
+SOURCE_TV = "tv"
+
+
+class EventJournal:
+    """An append-only NDJSON journal of the raw events received from the Lichess
+       streams. Each run appends a session header line followed by one line per
+       event containing a monotonic timestamp (seconds since the session started),
+       the stream source, the stream key (game id) and the event itself. Events
+       are buffered and flushed to the file every `JOURNAL_FLUSH_INTERVAL` seconds,
+       and when the journal is closed.
+    """
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._start = monotonic()
+        self._last_flush = self._start
+        self._file = open(filename, "a", encoding="utf-8")
+        self._write({'journal': JOURNAL_VERSION, 'created': datetime.now(timezone.utc).isoformat()})
+
+    def record(self, source: str, key: str, event: dict, **extra) -> None:
+        """Appends the event to the journal. This is safe to call from any thread"""
+        entry = {'t': round(monotonic() - self._start, 6), 'src': source, 'key': key, 'event': event}
+        entry.update(extra)
+        self._write(entry)
+
+    def flush(self) -> None:
+        """Writes the buffered events to the journal file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._last_flush = monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, default=_json_default, separators=(",", ":"))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                if monotonic() - self._last_flush >= JOURNAL_FLUSH_INTERVAL:
+                    self._file.flush()
+                    self._last_flush = monotonic()
+
+
+def _json_default(obj):
+    """Stores datetimes as milliseconds since epoch which is how lichess sends them"""
+    if isinstance(obj, datetime):
+        return int(obj.timestamp() * 1000)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_journal: Optional[EventJournal] = None
+_close_at_exit = False
+
+
+def start_event_journal(filename: str) -> EventJournal:
+    """Starts recording all stream events to the passed in journal
+       file. The journal is closed (and flushed) on exit.
+    """
+    global _journal, _close_at_exit
+    stop_event_journal()
+    if not _close_at_exit:
+        atexit.register(stop_event_journal)
+        _close_at_exit = True
+    _journal = EventJournal(filename)
+    log.info(f"Recording stream events to {filename}")
+    return _journal
+
+
+def stop_event_journal() -> None:
+    """Stops recording stream events"""
+    global _journal
+    if _journal:
+        _journal.close()
+        _journal = None
+
+
+def journal_event(source: str, key: str, event: dict, **extra) -> None:
+    """Records the event if a journal has been started"""
+    if _journal:
+        _journal.record(source, key, event, **extra)
+
+
+def load_journal(filename: str, session: int = -1) -> List[dict]:
+    """Returns the event entries of a journal session. By
+       default, the last session in the journal is returned.
+    """
+    sessions: List[List[dict]] = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if 'journal' in entry or not sessions:
+                sessions.append([])
+            if 'journal' not in entry:
+                sessions[-1].append(entry)
+
+    if not sessions:
+        raise ValueError(f"No journal sessions found in {filename}")
+    return sessions[session]
+
+
+class JournalReplayClient:
+    """Stands in for the berserk client to feed a journal back through the
+       GameStateDispatcher, IncomingEventManager and StreamTVChannel. Events
+       are yielded at their recorded time divided by `speed`. A speed of 0
+       replays events as fast as possible. Requests which are not streams
+       (making moves, creating challenges, etc.) are accepted and ignored.
+    """
+    def __init__(self, entries: List[dict], speed: float = 1.0):
+        self.speed = speed
+        self._streams: Dict[tuple, List[dict]] = {}
+        self._tv_games: Dict[str, List[str]] = {}
+        for entry in entries:
+            self._streams.setdefault((entry['src'], entry['key']), []).append(entry)
+            if entry['src'] == SOURCE_TV:
+                games = self._tv_games.setdefault(entry.get('channel', ""), [])
+                if entry['key'] not in games:
+                    games.append(entry['key'])
+
+        self._started: Dict[tuple, bool] = {}
+        self._t0 = entries[0]['t'] if entries else 0.0
+        self._start = monotonic()
+
+        self.board = _ReplayNamespace(stream_incoming_events=self._stream_incoming_events,
+                                      stream_game_state=self._stream_game_state)
+        self.games = _ReplayNamespace(stream_game_moves=self._stream_game_moves)
+        self.tv = _ReplayNamespace(get_current_games=self._get_current_games)
+        self.challenges = _ReplayNamespace()
+        self.account = _ReplayNamespace()
+
+    def has_source(self, source: str) -> bool:
+        return any(src == source for src, _ in self._streams)
+
+    def get_game_ids(self, source: str) -> List[str]:
+        return [key for src, key in self._streams if src == source]
+
+    def get_tv_channels(self) -> List[str]:
+        return list(self._tv_games.keys())
+
+    def is_replayed(self, source: str, key: str) -> bool:
+        """Returns True if the stream has been requested"""
+        return self._started.get((source, key), False)
+
+    def open_stream(self, path: str, converter: Optional[Callable[[dict], dict]] = None) -> "_ReplayStream":
+        """Returns a closable replay of the stream for the API path"""
+        parts = path.strip("/").split("/")
+        if path == "/api/stream/event":
+            events = self._stream_incoming_events
+        elif parts[:4] == ["api", "board", "game", "stream"]:
+            events = self._stream_game_state
+            converter = None  # game states are converted as they're replayed
+        elif parts[:3] == ["api", "stream", "game"]:
+            events = self._stream_game_moves
+        else:
+            raise ValueError(f"Journal replay does not support streaming {path}")
+
+        args = () if events == self._stream_incoming_events else (parts[-1],)
+        return _ReplayStream(lambda stopped: events(*args, stopped=stopped), converter)
+
+    def _stream_incoming_events(self, stopped: Optional[threading.Event] = None) -> Iterator[dict]:
+        yield from self._replay((SOURCE_IEM, ""), stopped)
+
+    def _stream_game_state(self, game_id: str, stopped: Optional[threading.Event] = None) -> Iterator[dict]:
+        for event in self._replay((SOURCE_GSD, game_id), stopped):
+            yield models.GameState.convert(event)
+
+    def _stream_game_moves(self, game_id: str, stopped: Optional[threading.Event] = None) -> Iterator[dict]:
+        yield from self._replay((SOURCE_TV, game_id), stopped)
+
+    def _get_current_games(self) -> dict:
+        """Returns the first TV game on each channel that hasn't been replayed yet"""
+        current_games = {}
+        for channel, games in self._tv_games.items():
+            pending = [game_id for game_id in games if not self._started.get((SOURCE_TV, game_id))]
+            current_games[channel] = {'gameId': pending[0] if pending else games[-1]}
+        return current_games
+
+    def _replay(self, stream_key: tuple, stopped: Optional[threading.Event] = None) -> Iterator[dict]:
+        self._started[stream_key] = True
+        stopped = stopped or threading.Event()
+        for entry in self._streams.get(stream_key, []):
+            if self.speed:
+                delay = self._start + (entry['t'] - self._t0) / self.speed - monotonic()
+                if delay > 0 and stopped.wait(delay):
+                    return
+            if stopped.is_set():
+                return
+            yield json.loads(json.dumps(entry['event']))  # copy, as consumers may modify events
+
+
+class _ReplayStream:
+    """A closable journal replay of a single stream"""
+    # A replay ends with the journal, so there is nothing to reconnect to
+    reconnectable = False
+
+    def __init__(self, events: Callable[[threading.Event], Iterator[dict]], converter: Optional[Callable[[dict], dict]] = None):
+        self._stopped = threading.Event()
+        self._events = events
+        self.converter = converter
+        self.preempted = False
+
+    @property
+    def closed(self) -> bool:
+        return self._stopped.is_set()
+
+    def __iter__(self) -> Iterator[dict]:
+        for event in self._events(self._stopped):
+            yield self.converter(event) if self.converter else event
+
+    def close(self) -> None:
+        self._stopped.set()
+
+
+class _ReplayNamespace:
+    """Provides the client methods used for a replay. Any other method is a no-op"""
+    def __init__(self, **methods):
+        self._methods = methods
+
+    def __getattr__(self, name):
+        return self._methods.get(name, _no_op)
+
+
+def _no_op(*args, **kwargs) -> dict:
+    return {}
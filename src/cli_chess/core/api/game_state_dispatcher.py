@@ -13,9 +13,35 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from cli_chess.utils import Event, log, retry
-from typing import Callable
+from cli_chess.core.api.event_journal import journal_event, SOURCE_GSD
+from cli_chess.core.api.api_stream import ApiStream, open_api_stream
+from cli_chess.core.api.stream_broker import StreamPriority
+from cli_chess.core.api.rate_limiter import rate_limiter, is_retryable_api_error, RateLimitTimeout
+from cli_chess.utils import Event, RetryPolicy, log
+from berserk import models
+from typing import Callable, Optional
 from threading import Thread
+from time import monotonic
+from math import ceil
+import threading
+
+# Board API commands are retried quickly, as a move must land before our clock runs out.
+# When rate limited, commands aren't retried until the rate limit pause has passed.
+BOARD_API_RETRY_POLICY = RetryPolicy(attempts=3, base_delay=0.2, max_delay=2.0, retry_on=is_retryable_api_error,
+                                     min_delay=lambda e: rate_limiter.get_pause_remaining())
+
+# Board API commands are sent from the UI, so they are never held by the rate
+# limiter or retried for longer than this. A command fails rather than block.
+BOARD_COMMAND_TIMEOUT = 2.0
+
+# Lichess sends a keep-alive line every few seconds, so
+# a game stream silent for longer than this has stalled
+GAME_STREAM_HEARTBEAT_TIMEOUT = 20.0
+
+# The backoff between attempts to reconnect a dropped game stream. The backoff
+# is reset once a reconnected stream has stayed up for the healthy time.
+GAME_STREAM_RECONNECT_BACKOFF = RetryPolicy(base_delay=0.5, max_delay=15.0)
+GAME_STREAM_HEALTHY_SECONDS = 30.0
 
 
 class GameStateDispatcher(Thread):
@@ -28,6 +54,11 @@ class GameStateDispatcher(Thread):
         super().__init__()
         self.game_id = game_id
         self.e_game_state_dispatcher_event = Event()
+        self._stream: Optional[ApiStream] = None
+        self._stopped = threading.Event()
+        self._game_over = False
+        self._resync = False
+        self._lock = threading.Lock()
 
         try:
             from cli_chess.core.api.api_manager import api_client
@@ -39,78 +70,154 @@ class GameStateDispatcher(Thread):
 
     def run(self):
         """This is the threads main function. It handles emitting the game state to
-           listeners (typically the OnlineGameModel).
+           listeners (typically the OnlineGameModel). When the stream drops or stalls
+           before the game is over, it's reconnected with a capped backoff. The
+           `gameFull` sent on reconnection is flagged with `resync` so listeners
+           can apply it to the game they already have.
         """
         log.info(f"Started streaming game state: {self.game_id}")
+        reconnects = 0
+
+        while True:
+            with self._lock:
+                if self._stopped.is_set():
+                    break
+                self._stream = open_api_stream(self.api_client, f"/api/board/game/stream/{self.game_id}",
+                                               StreamPriority.GAME, models.GameState.convert,
+                                               read_timeout=GAME_STREAM_HEARTBEAT_TIMEOUT)
+            connected_at = None
+            try:
+                for event in self._stream:
+                    if connected_at is None:
+                        connected_at = monotonic()
+                    self._handle_event(event)
+            except Exception as e:
+                if not is_retryable_api_error(e):
+                    log.error(f"Game stream error: {e}")
+                    break
+                log.warning(f"Game stream dropped: {e}")
+
+            if self._game_over or self._stopped.is_set() or not self._stream.reconnectable:
+                break
+
+            if connected_at is not None and monotonic() - connected_at >= GAME_STREAM_HEALTHY_SECONDS:
+                reconnects = 0
+            reconnects += 1
+            self._resync = True
+            delay = GAME_STREAM_RECONNECT_BACKOFF.get_delay(reconnects)
+            log.info(f"Reconnecting to game stream of {self.game_id} in {delay:.2f} seconds (attempt {reconnects})")
+            if self._stopped.wait(delay):
+                break
 
-        for event in self.api_client.board.stream_game_state(self.game_id):
-            log.debug(f"Stream event received: {event['type']}")
-            if event['type'] == "gameFull":
-                self.e_game_state_dispatcher_event.notify(gameFull=event)
+        log.info(f"Completed streaming of: {self.game_id}")
 
-            elif event['type'] == "gameState":
-                status = event.get('status', None)
-                is_game_over = status and status != "started" and status != "created"
+    def _handle_event(self, event: dict) -> None:
+        """Notifies listeners of the event received from the stream"""
+        journal_event(SOURCE_GSD, self.game_id, event)
+        log.debug("Stream event received: %s", event['type'])
+        if event['type'] == "gameFull":
+            self.e_game_state_dispatcher_event.notify(gameFull=event, resync=self._resync)
 
-                self.e_game_state_dispatcher_event.notify(gameState=event, gameOver=is_game_over)
-                if is_game_over:
-                    self._game_ended()
+            # The game may have ended while the stream was disconnected
+            state = event.get('state', {})
+            if self._is_game_over(state):
+                self.e_game_state_dispatcher_event.notify(gameState=state, gameOver=True)
+                self._game_ended()
 
-            elif event['type'] == "chatLine":
-                self.e_game_state_dispatcher_event.notify(chatLine=event)
+        elif event['type'] == "gameState":
+            is_game_over = self._is_game_over(event)
+            self.e_game_state_dispatcher_event.notify(gameState=event, gameOver=is_game_over)
+            if is_game_over:
+                self._game_ended()
 
-            elif event['type'] == "opponentGone":
-                is_gone = event.get('gone', False)
-                secs_until_claim = event.get('claimWinInSeconds', None)
+        elif event['type'] == "chatLine":
+            self.e_game_state_dispatcher_event.notify(chatLine=event)
 
-                if is_gone and secs_until_claim:
-                    pass  # TODO implement call to auto-claim win when `secs_until_claim` elapses
+        elif event['type'] == "opponentGone":
+            is_gone = event.get('gone', False)
+            secs_until_claim = event.get('claimWinInSeconds', None)
 
-                if not is_gone:
-                    pass  # TODO: Cancel auto-claim countdown
+            if is_gone and secs_until_claim:
+                pass  # TODO implement call to auto-claim win when `secs_until_claim` elapses
 
-                self.e_game_state_dispatcher_event.notify(opponentGone=event)
+            if not is_gone:
+                pass  # TODO: Cancel auto-claim countdown
 
-        log.info(f"Completed streaming of: {self.game_id}")
+            self.e_game_state_dispatcher_event.notify(opponentGone=event)
 
-    @retry(times=3, exceptions=(Exception, ))
-    def make_move(self, move: str):
+    @staticmethod
+    def _is_game_over(state: dict) -> bool:
+        """Returns True if the status of the passed in game state has ended the game"""
+        status = state.get('status', None)
+        return bool(status and status != "started" and status != "created")
+
+    def make_move(self, move: str, deadline: Optional[float] = None):
         """Sends the move to lichess. This move should have already
            been verified as valid in the current context of the board.
-           The move must be in UCI format.
+           The move must be in UCI format. If a deadline (a monotonic
+           time, e.g. when our clock runs out) is passed in, the move
+           isn't retried or held by the rate limiter past it. Like all
+           commands, the move is never held past `BOARD_COMMAND_TIMEOUT`.
         """
-        log.debug(f"Sending move ({move}) to lichess")
-        self.api_client.board.make_move(self.game_id, move)
+        log.debug("Sending move (%s) to lichess", move)
+        self._send_command(self.api_client.board.make_move, self.game_id, move, deadline=deadline)
 
-    @retry(times=3, exceptions=(Exception,))
     def send_takeback_request(self) -> None:
         """Sends a takeback request to our opponent"""
         log.debug("Sending takeback offer to opponent")
-        self.api_client.board.offer_takeback(self.game_id)
+        self._send_command(self.api_client.board.offer_takeback, self.game_id)
 
-    @retry(times=3, exceptions=(Exception,))
     def send_draw_offer(self) -> None:
         """Sends a draw offer to our opponent"""
         log.debug("Sending draw offer to opponent")
-        self.api_client.board.offer_draw(self.game_id)
+        self._send_command(self.api_client.board.offer_draw, self.game_id)
 
-    @retry(times=3, exceptions=(Exception,))
     def resign(self) -> None:
         """Resigns the game"""
         log.debug("Sending resignation")
-        self.api_client.board.resign_game(self.game_id)
+        self._send_command(self.api_client.board.resign_game, self.game_id)
 
-    @retry(times=3, exceptions=(Exception,))
     def claim_victory(self) -> None:
         """Submits a claim of victory to lichess as the opponent is gone.
            This is to only be called when the opponentGone timer has elapsed.
         """
         pass
 
+    @staticmethod
+    def _send_command(fn: Callable, *args, deadline: Optional[float] = None) -> None:
+        """Calls the Board API function using the retry policy. The command
+           isn't held past the deadline or `BOARD_COMMAND_TIMEOUT`, whichever
+           is sooner. Raises `RateLimitTimeout` if it's held by a rate limit.
+        """
+        timeout = monotonic() + BOARD_COMMAND_TIMEOUT
+        deadline = timeout if deadline is None else min(deadline, timeout)
+        try:
+            with rate_limiter.within_deadline(deadline):
+                BOARD_API_RETRY_POLICY.run(fn, *args, deadline=deadline)
+        except RateLimitTimeout as e:
+            pause = rate_limiter.get_pause_remaining()
+            retry_in = f"in {ceil(pause)} seconds" if pause else "shortly"
+            raise RateLimitTimeout(f"Rate limited by Lichess, try again {retry_in}") from e
+
+    def stop(self) -> None:
+        """Closes the game stream which ends the thread"""
+        with self._lock:
+            self._stopped.set()
+            stream = self._stream
+        if stream:
+            stream.close()
+
     def _game_ended(self) -> None:
         """Handles removing all event listeners since the game has completed"""
+        self._game_over = True
         self.e_game_state_dispatcher_event.remove_all_listeners()
 
-    def subscribe_to_events(self, listener: Callable) -> None:
-        """Subscribes the passed in method to GSD events"""
-        self.e_game_state_dispatcher_event.add_listener(listener)
+    def subscribe_to_events(self, listener: Callable, ui: bool = False) -> None:
+        """Subscribes the passed in method to GSD events. Set `ui`
+           to have the listener called on the UI event loop.
+        """
+        self.e_game_state_dispatcher_event.add_listener(listener, ui)
+
+    def unsubscribe_from_events(self, listener: Callable) -> None:
+        """Unsubscribes the passed in method from GSD events"""
+        self.e_game_state_dispatcher_event.remove_listener(listener)
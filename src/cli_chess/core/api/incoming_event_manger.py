@@ -13,9 +13,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from cli_chess.core.api.event_journal import journal_event, SOURCE_IEM
+from cli_chess.core.api.api_stream import ApiStream, open_api_stream
+from cli_chess.core.api.stream_broker import StreamPriority
 from cli_chess.utils.event import Event
 from cli_chess.utils.logging import log
-from typing import Callable
+from typing import Callable, Optional
 import threading
 
 
@@ -27,6 +30,9 @@ class IncomingEventManager(threading.Thread):
         super().__init__(daemon=True)
         self.e_new_event_received = Event()
         self.my_games = []
+        self._stream: Optional[ApiStream] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
 
     def run(self) -> None:
         try:
@@ -38,50 +44,78 @@ class IncomingEventManager(threading.Thread):
 
         log.info("Started listening to Lichess incoming events")
 
-        for event in api_client.board.stream_incoming_events():
-            if event['type'] == 'gameStart':
-                game_id = event['game']['gameId']
-                log.info(f"Received gameStart for: {game_id}")
-                self.my_games.append(game_id)
-                self.e_new_event_received.notify(gameStart=event)
-
-            elif event['type'] == 'gameFinish':
-                game_id = event['game']['gameId']
-                try:
-                    self.my_games.remove(event['game']['gameId'])
-                except ValueError:
-                    pass
-
-                log.info(f"Received gameEnd for: {game_id}")
-                self.e_new_event_received.notify(gameFinish=event)
-
-            elif event['type'] == 'challenge':
-                # A challenge was sent by us or to us
-                challenge_id = event['challenge']['id']
-                log.info(f"Received challenge event for: {challenge_id}")
-                self.e_new_event_received.notify(challenge=event)
-
-            elif event['type'] == 'challengeCanceled':
-                challenge_id = event['challenge']['id']
-                log.info(f"Received challengeCanceled event for: {challenge_id}")
-                self.e_new_event_received.notify(challengeCanceled=event)
-
-            elif event['type'] == 'challengeDeclined':
-                challenge_id = event['challenge']['id']
-                log.info(f"Received challengeDeclined event for: {challenge_id}")
-                self.e_new_event_received.notify(challengeCanceled=event)
-
-            else:
-                log.info(f"Received other event: {event}")
-                self.e_new_event_received.notify(other=event)
+        while True:
+            with self._lock:
+                # Checked along with opening the stream, so a stop
+                # during a reconnect closes the reopened stream
+                if self._stopped.is_set():
+                    break
+                self._stream = open_api_stream(api_client, "/api/stream/event", StreamPriority.IEM)
+            for event in self._stream:
+                journal_event(SOURCE_IEM, "", event)
+                self._handle_event(event)
+
+            if not self._stream.preempted:
+                break
+            log.info("Incoming event stream preempted. Waiting to reconnect.")
+
+        log.info("Stopped listening to Lichess incoming events")
+
+    def _handle_event(self, event: dict) -> None:
+        """Notifies listeners of the event received from the stream"""
+        if event['type'] == 'gameStart':
+            game_id = event['game']['gameId']
+            log.info(f"Received gameStart for: {game_id}")
+            self.my_games.append(game_id)
+            self.e_new_event_received.notify(gameStart=event)
+
+        elif event['type'] == 'gameFinish':
+            game_id = event['game']['gameId']
+            try:
+                self.my_games.remove(event['game']['gameId'])
+            except ValueError:
+                pass
+
+            log.info(f"Received gameEnd for: {game_id}")
+            self.e_new_event_received.notify(gameFinish=event)
+
+        elif event['type'] == 'challenge':
+            # A challenge was sent by us or to us
+            challenge_id = event['challenge']['id']
+            log.info(f"Received challenge event for: {challenge_id}")
+            self.e_new_event_received.notify(challenge=event)
+
+        elif event['type'] == 'challengeCanceled':
+            challenge_id = event['challenge']['id']
+            log.info(f"Received challengeCanceled event for: {challenge_id}")
+            self.e_new_event_received.notify(challengeCanceled=event)
+
+        elif event['type'] == 'challengeDeclined':
+            challenge_id = event['challenge']['id']
+            log.info(f"Received challengeDeclined event for: {challenge_id}")
+            self.e_new_event_received.notify(challengeCanceled=event)
+
+        else:
+            log.info(f"Received other event: {event}")
+            self.e_new_event_received.notify(other=event)
+
+    def stop(self) -> None:
+        """Closes the incoming event stream which ends the thread"""
+        with self._lock:
+            self._stopped.set()
+            stream = self._stream
+        if stream:
+            stream.close()
 
     def get_active_games(self) -> list:
         """Returns a list of games in progress for this account"""
         return self.my_games
 
-    def subscribe_to_events(self, listener: Callable) -> None:
-        """Subscribes the passed in method to IEM events"""
-        self.e_new_event_received.add_listener(listener)
+    def subscribe_to_events(self, listener: Callable, ui: bool = False) -> None:
+        """Subscribes the passed in method to IEM events. Set `ui`
+           to have the listener called on the UI event loop.
+        """
+        self.e_new_event_received.add_listener(listener, ui)
 
     def unsubscribe_from_events(self, listener: Callable) -> None:
         """Unsubscribes the passed in method to IEM events"""
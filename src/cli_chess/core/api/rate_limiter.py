@@ -0,0 +1,163 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.logging import log
+from berserk.exceptions import ApiError, ResponseError
+from contextlib import contextmanager
+from requests import PreparedRequest, Response, Session
+from requests.adapters import HTTPAdapter
+from time import monotonic, sleep
+from typing import Iterator, Optional
+import threading
+
+# Lichess doesn't publish its limits, this keeps bursts of
+# requests (e.g. opening several TV streams) well under them
+DEFAULT_REQUEST_RATE = 5.0
+DEFAULT_REQUEST_BURST = 10
+
+# Lichess asks clients to wait a full minute after receiving a 429
+DEFAULT_RATE_LIMIT_PAUSE = 60.0
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request can't be made before its deadline"""
+    pass
+
+
+class RateLimiter:
+    """A process wide token bucket shared by all requests made to the Lichess
+       API. Each request takes a token, blocking until one is available. When
+       Lichess responds with a 429, requests are paused for the time given in
+       the Retry-After header (a minute if it isn't set). A thread can set a
+       deadline using `within_deadline()`, its requests then raise
+       `RateLimitTimeout` rather than waiting past the deadline.
+    """
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, burst: int = DEFAULT_REQUEST_BURST,
+                 rate_limit_pause: float = DEFAULT_RATE_LIMIT_PAUSE):
+        self.rate = rate
+        self.burst = burst
+        self.rate_limit_pause = rate_limit_pause
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Blocks until a token is available. Returns False if a token won't be
+           available before the deadline (a monotonic time). The deadline defaults
+           to the one set for the calling thread.
+        """
+        if deadline is None:
+            deadline = getattr(self._local, 'deadline', None)
+
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            sleep(wait)
+
+    def pause(self, seconds: Optional[float] = None) -> None:
+        """Pauses all requests for the passed in number of seconds
+           (defaults to `rate_limit_pause`) and empties the bucket
+        """
+        seconds = self.rate_limit_pause if seconds is None else seconds
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+            self._tokens = 0.0
+        log.warning(f"Rate limiter: Pausing API requests for {seconds} seconds")
+
+    def get_pause_remaining(self) -> float:
+        """Returns the number of seconds left until requests are resumed"""
+        with self._lock:
+            return max(0.0, self._paused_until - monotonic())
+
+    def reset(self) -> None:
+        """Refills the bucket and resumes paused requests"""
+        with self._lock:
+            self._tokens = float(self.burst)
+            self._updated = monotonic()
+            self._paused_until = 0.0
+
+    @contextmanager
+    def within_deadline(self, deadline: Optional[float]) -> Iterator[None]:
+        """Sets the deadline (a monotonic time) of the requests made by the
+           calling thread while in the context. None leaves it unchanged.
+        """
+        previous = getattr(self._local, 'deadline', None)
+        if deadline is not None:
+            self._local.deadline = deadline if previous is None else min(previous, deadline)
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def install(self, session: Session) -> None:
+        """Routes the requests of the passed in session through the rate limiter"""
+        adapter = _RateLimitedAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter which takes a token from the rate limiter
+       before each request and pauses it on rate limit responses
+    """
+    def __init__(self, limiter: RateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if not self.limiter.acquire():
+            raise RateLimitTimeout(f"Rate limited, unable to send request before its deadline: {request.url}")
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 429:
+            self.limiter.pause(_get_retry_after(response))
+        return response
+
+
+def _get_retry_after(response: Response) -> Optional[float]:
+    """Returns the number of seconds of the Retry-After header, or None if it isn't set"""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def is_retryable_api_error(e: Exception) -> bool:
+    """Returns True if the API call which raised the passed in exception
+       is worth retrying. Connection errors, rate limiting (429) and server
+       errors are, while other error responses (e.g. an illegal move) are not.
+    """
+    if isinstance(e, ResponseError):
+        return e.status_code == 429 or e.status_code >= 500
+    return isinstance(e, ApiError)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,114 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+from cli_chess.utils.logging import log
+from enum import IntEnum
+from typing import List, TYPE_CHECKING
+import threading
+if TYPE_CHECKING:
+    from cli_chess.core.api.api_stream import ApiStream
+
+# Lichess allows 8 open streams per IP
+DEFAULT_STREAM_BUDGET = 8
+
+
+class StreamPriority(IntEnum):
+    """Stream priorities. Lower values are more important"""
+    GAME = 0
+    IEM = 1
+    TV = 2
+
+
+class StreamBroker:
+    """Keeps the number of open API streams within the budget. A stream must
+       be granted a slot before it's opened. When the budget is used up, a
+       stream preempts (closes) the most recently opened stream of a lower
+       priority, otherwise it's queued until a slot is released. Queued
+       streams are granted slots by priority, then in order of request.
+    """
+    def __init__(self, budget: int = DEFAULT_STREAM_BUDGET):
+        self.budget = budget
+        self._open: List[ApiStream] = []
+        self._queued: List[ApiStream] = []
+        self._cond = threading.Condition(threading.RLock())
+
+    def acquire(self, stream: ApiStream) -> bool:
+        """Blocks until the stream is granted a slot. Returns False
+           if the stream was closed while waiting for a slot.
+        """
+        with self._cond:
+            self._queued.append(stream)
+            try:
+                while not stream.closed:
+                    if self._is_next(stream):
+                        if len(self._open) < self.budget:
+                            self._open.append(stream)
+                            return True
+                        if self._preempt_for(stream):
+                            continue
+
+                    log.debug(f"Stream queued ({len(self._open)} of {self.budget} streams open): {stream.url}")
+                    self._cond.wait()
+                return False
+            finally:
+                self._queued.remove(stream)
+                self._cond.notify_all()
+
+    def release(self, stream: ApiStream) -> None:
+        """Releases the slot held by the stream (if any) and wakes queued streams"""
+        with self._cond:
+            if stream in self._open:
+                self._open.remove(stream)
+            self._cond.notify_all()
+
+    def set_budget(self, budget: int) -> None:
+        with self._cond:
+            self.budget = budget
+            self._cond.notify_all()
+
+    def get_state(self) -> dict:
+        """Returns the budget along with the open and queued streams"""
+        with self._cond:
+            return {
+                'budget': self.budget,
+                'open': [self._describe(stream) for stream in self._open],
+                'queued': [self._describe(stream) for stream in self._queued],
+            }
+
+    def _is_next(self, stream: ApiStream) -> bool:
+        """Returns True if no queued stream is ahead of the passed in stream"""
+        return min(self._queued, key=lambda s: s.priority) is stream
+
+    def _preempt_for(self, stream: ApiStream) -> bool:
+        """Closes the most recently opened stream with the lowest priority, if
+           it's lower than the passed in stream. Returns True if a stream was closed.
+        """
+        victims = [s for s in self._open if s.priority > stream.priority]
+        if not victims:
+            return False
+
+        victim = max(reversed(victims), key=lambda s: s.priority)
+        log.info(f"Preempting {victim.priority.name} stream for {stream.priority.name} stream: {victim.url}")
+        victim.preempted = True
+        victim.close()
+        return True
+
+    @staticmethod
+    def _describe(stream: ApiStream) -> dict:
+        return {'url': stream.url, 'priority': stream.priority.name, 'preempted': stream.preempted}
+
+
+stream_broker = StreamBroker()
@@ -0,0 +1,87 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.logging import log
+from berserk import Client
+from time import monotonic
+from typing import Optional
+import threading
+
+DEFAULT_TV_DIRECTORY_TTL = 3.0
+
+
+class TVDirectory:
+    """A process wide cache of the current TV games (/api/tv/channels) shared
+       by all TV watchers. The directory is fetched at most once per `ttl`
+       seconds. Concurrent lookups of a stale directory wait on a single
+       refresh rather than each making a request.
+    """
+    def __init__(self, ttl: float = DEFAULT_TV_DIRECTORY_TTL):
+        self.ttl = ttl
+        self._games: dict = {}
+        self._client: Optional[Client] = None
+        self._fetched_at: Optional[float] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def get_game_id(self, client: Client, channel: str) -> Optional[str]:
+        """Returns the game ID of the ongoing TV game of the passed in channel"""
+        return self.get_current_games(client).get(channel, {}).get('gameId')
+
+    def get_current_games(self, client: Client) -> dict:
+        """Returns the current TV game of every channel, refreshing the directory if it's stale"""
+        games = self._get_fresh(client)
+        if games is not None:
+            return games
+
+        with self._refresh_lock:
+            # Another thread may have refreshed the directory while we were waiting
+            games = self._get_fresh(client)
+            if games is not None:
+                return games
+
+            with self._lock:
+                generation = self._generation
+
+            log.debug("Refreshing TV directory")
+            games = client.tv.get_current_games()
+
+            with self._lock:
+                # Results of a request made before an invalidation aren't cached
+                if generation == self._generation:
+                    self._games = games
+                    self._client = client
+                    self._fetched_at = monotonic()
+            return games
+
+    def invalidate(self) -> None:
+        """Marks the directory as stale so the next lookup refreshes it
+           (e.g. a TV game ended so the channel has a new game)
+        """
+        with self._lock:
+            self._generation += 1
+            self._fetched_at = None
+
+    def _get_fresh(self, client: Client) -> Optional[dict]:
+        """Returns the cached directory if it's fresh and was fetched by the passed in client"""
+        with self._lock:
+            if (self._fetched_at is not None and self._client is client
+                    and monotonic() - self._fetched_at < self.ttl):
+                return self._games
+            return None
+
+
+tv_directory = TVDirectory()
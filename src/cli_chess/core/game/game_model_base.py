@@ -16,9 +16,10 @@
 from cli_chess.modules.board import BoardModel
 from cli_chess.modules.move_list import MoveListModel
 from cli_chess.modules.material_difference import MaterialDifferenceModel
-from cli_chess.utils import EventManager, log
+from cli_chess.utils import EventManager, log, worker_pool
 from chess import Color, WHITE, COLOR_NAMES
 from random import getrandbits
+from time import monotonic
 from abc import ABC, abstractmethod
 
 
@@ -51,6 +52,7 @@ class GameModelBase:
         """Cleans up after this model by clearing all associated models event listeners.
            This should only ever be run when the models are no longer needed.
         """
+        worker_pool.cancel(self)
         self._event_manager.purge_all_events()
 
         # Notify associated models to clean up
@@ -65,6 +67,14 @@ class GameModelBase:
         """Notify listeners that the model has updated"""
         self.e_game_model_updated.notify(**kwargs)
 
+    def _set_clock_running(self, running: bool) -> None:
+        """Sets whether the clock of the side to move is counting down. The
+           clock times are counted from now, so this must be called whenever
+           the times are updated.
+        """
+        self.game_metadata['clock']['running'] = running
+        self.game_metadata['clock']['updated'] = monotonic()
+
     @staticmethod
     def _default_game_metadata() -> dict:
         """Returns the default structure for game metadata"""
@@ -89,6 +99,8 @@ class GameModelBase:
             },
             'clock': {
                 'units': "ms",
+                'running': False,  # True if the clock of the side to move is counting down
+                'updated': 0.0,    # The monotonic time the clock times were received
                 'white': {
                     'time': 0,
                     'increment': 0
@@ -20,14 +20,17 @@ from cli_chess.modules.move_list import MoveListPresenter
 from cli_chess.modules.material_difference import MaterialDifferencePresenter
 from cli_chess.modules.player_info import PlayerInfoPresenter
 from cli_chess.modules.clock import ClockPresenter
-from cli_chess.utils import log, AlertType, RequestSuccessfullySent
+from cli_chess.utils import log, AlertType, RequestSuccessfullySent, worker_pool
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.core.game import GameModelBase, PlayableGameModelBase
 
 
 class GamePresenterBase(ABC):
+    # The game model update topics handled by update() (None for all updates)
+    update_topics: Optional[Tuple[str, ...]] = None
+
     def __init__(self, model: GameModelBase):
         self.model = model
         self.board_presenter = BoardPresenter(model.board_model)
@@ -37,7 +40,8 @@ class GamePresenterBase(ABC):
         self.clock_presenter = ClockPresenter(model)
         self.view = self._get_view()
 
-        self.model.e_game_model_updated.add_listener(self.update)
+        self.model.e_game_model_updated.add_listener(self.update, ui=True, topics=self.update_topics)
+        worker_pool.e_task_failed.add_listener(self._handle_task_failed, ui=True, weak=True)
         log.debug(f"Created {type(self).__name__} (id={id(self)})")
 
     @abstractmethod
@@ -52,6 +56,15 @@ class GamePresenterBase(ABC):
         """
         pass
 
+    def _handle_task_failed(self, task: str, owner: object, error: Exception) -> None:
+        """Shows an alert when a background task of this game fails"""
+        if owner is self.model or owner is self:
+            self.view.alert.show_alert(self._get_task_failed_message(task, error), AlertType.ERROR)
+
+    def _get_task_failed_message(self, task: str, error: Exception) -> str:
+        """Returns the alert message shown when a background task of this game fails"""
+        return str(error)
+
     def flip_board(self) -> None:
         """Flip the board orientation"""
         self.model.board_model.set_board_orientation(not self.model.board_model.get_board_orientation())
@@ -59,11 +72,16 @@ class GamePresenterBase(ABC):
     def exit(self) -> None:
         """Exit current presenter/view"""
         log.debug("Exiting game presenter")
+        worker_pool.cancel(self)
+        worker_pool.e_task_failed.remove_listener(self._handle_task_failed)
+        self.clock_presenter.stop()
         self.model.cleanup()
         self.view.exit()
 
 
 class PlayableGamePresenterBase(GamePresenterBase, ABC):
+    update_topics = ("successfulMoveMade",)
+
     def __init__(self, model: PlayableGameModelBase):
         super().__init__(model)
         self.model = model
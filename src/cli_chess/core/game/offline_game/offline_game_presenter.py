@@ -28,6 +28,8 @@ def start_offline_game(game_parameters: dict):
 
 
 class OfflineGamePresenter(PlayableGamePresenterBase):
+    update_topics = PlayableGamePresenterBase.update_topics + ("offlineGameOver",)
+
     def __init__(self, model: OfflineGameModel):
         self.model = model
         self.engine_presenter = EnginePresenter(self.model.engine_model)
@@ -70,7 +72,7 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
 
             elif engine_move.move:
                 move = engine_move.move.uci()
-                log.debug(f"Received move ({move}) from engine.")
+                log.debug("Received move (%s) from engine.", move)
                 self.board_presenter.make_move(move)
         except Exception as e:
             log.error(f"Engine error {e}")
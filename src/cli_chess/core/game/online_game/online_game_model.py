@@ -18,6 +18,7 @@ from cli_chess.core.game.game_options import GameOption
 from cli_chess.core.api import GameStateDispatcher
 from cli_chess.utils import log, threaded, RequestSuccessfullySent
 from chess import COLOR_NAMES, WHITE
+from datetime import datetime, timedelta
 from typing import Optional
 
 
@@ -47,7 +48,7 @@ class OnlineGameModel(PlayableGameModelBase):
     def create_a_game(self, is_vs_ai: bool) -> None:
         """Sends a request to lichess to start an AI challenge using the selected game parameters"""
         # Note: Only subscribe to IEM events right before creating challenge to lessen chance of grabbing another game
-        self.api_iem.subscribe_to_events(self.handle_iem_event)
+        self.api_iem.subscribe_to_events(self.handle_iem_event, ui=True)
         self._notify_game_model_updated(searchingForOpponent=True)
         self.vs_ai = is_vs_ai
         self.searching = True
@@ -77,7 +78,7 @@ class OnlineGameModel(PlayableGameModelBase):
             self.playing_game_id = game_id
 
             self.game_state_dispatcher = GameStateDispatcher(game_id)
-            self.game_state_dispatcher.subscribe_to_events(self.handle_game_state_dispatcher_event)
+            self.game_state_dispatcher.subscribe_to_events(self.handle_game_state_dispatcher_event, ui=True)
             self.game_state_dispatcher.start()
 
     def _game_end(self) -> None:
@@ -108,20 +109,22 @@ class OnlineGameModel(PlayableGameModelBase):
         if 'gameFull' in kwargs:
             event = kwargs['gameFull']
             self._save_game_metadata(gsd_gameFull=event)
-            self.board_model.reinitialize_board(variant=self.game_metadata['variant'],
-                                                orientation=(self.my_color if self.board_model.get_variant_name() != "racingkings" else WHITE),
-                                                fen=event.get('initialFen', ""))
-            self.board_model.make_moves_from_list(event.get('state', {}).get('moves', []).split())
+            if kwargs.get('resync'):
+                # The stream reconnected, so only the moves missed while disconnected are applied
+                self.board_model.sync_moves(event.get('state', {}).get('moves', "").split())
+            else:
+                self.board_model.reinitialize_board(variant=self.game_metadata['variant'],
+                                                    orientation=(self.my_color if self.board_model.get_variant_name() != "racingkings" else WHITE),
+                                                    fen=event.get('initialFen', ""))
+                self.board_model.make_moves_from_list(event.get('state', {}).get('moves', "").split())
 
         elif 'gameState' in kwargs:
             event = kwargs['gameState']
             self._save_game_metadata(gsd_gameState=event)
 
-            # TODO: Take some time measurements to see how much of an impact this approach is
-            # Resetting and replaying the moves guarantees the game between lichess
-            # and our local board are in sync (eg. takebacks, moves played on website, etc)
-            self.board_model.reset(notify=False)
-            self.board_model.make_moves_from_list(event.get('moves', []).split())
+            # Syncing against the full move list keeps the game between lichess and
+            # our local board in sync (eg. takebacks, moves played on website, etc)
+            self.board_model.sync_moves(event.get('moves', "").split())
 
             if kwargs['gameOver']:
                 self._report_game_over(status=event.get('status'), winner=event.get('winner', ""))
@@ -153,7 +156,7 @@ class OnlineGameModel(PlayableGameModelBase):
                     raise Warning("Null moves are not supported in online games")
 
                 move = self.board_model.verify_move(move)
-                self.game_state_dispatcher.make_move(move)
+                self.game_state_dispatcher.make_move(move, deadline=self._get_move_deadline())
             except Exception:
                 raise
         else:
@@ -225,11 +228,9 @@ class OnlineGameModel(PlayableGameModelBase):
                 self.game_metadata['ai_level'] = data.get(GameOption.COMPUTER_SKILL_LEVEL)  # Only games against AI will have this data
                 self.game_metadata['clock']['white']['time'] = data.get(GameOption.TIME_CONTROL)[0]       # mins
                 self.game_metadata['clock']['white']['increment'] = data.get(GameOption.TIME_CONTROL)[1]  # secs
-                self.game_metadata['clock']['black'] = self.game_metadata['clock']['white']
-
                 if self.game_metadata['ai_level']:
                     self.game_metadata['clock']['white']['time'] = data.get(GameOption.TIME_CONTROL)[0] * 60  # challenges need time in seconds
-                    self.game_metadata['clock']['black'] = self.game_metadata['clock']['white']
+                self.game_metadata['clock']['black'] = dict(self.game_metadata['clock']['white'])  # A copy, as the clocks are updated separately
 
             elif 'iem_gameStart' in kwargs:
                 # Reset game metadata
@@ -260,21 +261,51 @@ class OnlineGameModel(PlayableGameModelBase):
                         self.game_metadata['players'][color]['name'] = f"Stockfish level {data.get(color, {}).get('aiLevel', '?')}"
 
                 self.game_metadata['clock']['units'] = "ms"
-                self.game_metadata['clock']['white']['time'] = data.get('state', {}).get('wtime')
-                self.game_metadata['clock']['white']['increment'] = data.get('state', {}).get('winc')
-                self.game_metadata['clock']['black']['time'] = data.get('state', {}).get('btime')
-                self.game_metadata['clock']['black']['increment'] = data.get('state', {}).get('binc')
+                self.game_metadata['clock']['white']['time'] = self._to_milliseconds(data.get('state', {}).get('wtime'))
+                self.game_metadata['clock']['white']['increment'] = self._to_milliseconds(data.get('state', {}).get('winc'))
+                self.game_metadata['clock']['black']['time'] = self._to_milliseconds(data.get('state', {}).get('btime'))
+                self.game_metadata['clock']['black']['increment'] = self._to_milliseconds(data.get('state', {}).get('binc'))
+                self._set_clock_running(self._is_clock_running(data.get('state', {})))
 
             elif 'gsd_gameState' in kwargs:
                 data = kwargs['gsd_gameState']
-                self.game_metadata['clock']['white']['time'] = data.get('wtime')
-                self.game_metadata['clock']['black']['time'] = data.get('btime')
+                self.game_metadata['clock']['white']['time'] = self._to_milliseconds(data.get('wtime'))
+                self.game_metadata['clock']['black']['time'] = self._to_milliseconds(data.get('btime'))
+                self._set_clock_running(self._is_clock_running(data))
 
             self._notify_game_model_updated()
         except Exception as e:
             log.exception(f"Error saving online game metadata: {e}")
             raise
 
+    def _get_move_deadline(self) -> Optional[float]:
+        """Returns the monotonic time our clock runs out, or None
+           if our clock isn't counting down (e.g. the first moves)
+        """
+        clock = self.game_metadata['clock']
+        time = clock[COLOR_NAMES[self.my_color]]['time']
+        if not clock['running'] or clock.get('units') != "ms" or time is None:
+            return None
+        return clock['updated'] + time / 1000
+
+    @staticmethod
+    def _to_milliseconds(value) -> Optional[int]:
+        """Returns the passed in clock time in milliseconds. berserk converts
+           the clock times of game states to datetimes (since the epoch).
+        """
+        if isinstance(value, datetime):
+            return round(value.timestamp() * 1000)
+        if isinstance(value, timedelta):
+            return round(value.total_seconds() * 1000)
+        return value
+
+    @staticmethod
+    def _is_clock_running(state: dict) -> bool:
+        """Returns True if the clock is running in the passed in game state.
+           Lichess starts the clock once both sides have made a move.
+        """
+        return state.get('status') == "started" and len(state.get('moves', "").split()) >= 2
+
     def _default_game_metadata(self) -> dict:
         """Returns the default structure for game metadata"""
         game_metadata = super()._default_game_metadata()
@@ -293,6 +324,7 @@ class OnlineGameModel(PlayableGameModelBase):
         self._game_end()
         self.game_metadata['state']['status'] = status  # status list can be found in lila status.ts
         self.game_metadata['state']['winner'] = winner
+        self._set_clock_running(False)
         self._notify_game_model_updated(onlineGameOver=True)
 
     def cleanup(self) -> None:
@@ -308,4 +340,5 @@ class OnlineGameModel(PlayableGameModelBase):
 
         if self.game_in_progress:
             self.game_state_dispatcher.unsubscribe_from_events(self.handle_game_state_dispatcher_event)
+            self.game_state_dispatcher.stop()
             log.debug(f"Cleared subscription from {type(self.game_state_dispatcher).__name__} (id={id(self.game_state_dispatcher)})")
@@ -27,10 +27,12 @@ def start_online_game(game_parameters: dict, is_vs_ai: bool) -> None:
     model = OnlineGameModel(game_parameters)
     presenter = OnlineGamePresenter(model)
     change_views(presenter.view, presenter.view.input_field_container) # noqa
-    model.create_a_game(is_vs_ai)
+    presenter.create_a_game(is_vs_ai)
 
 
 class OnlineGamePresenter(PlayableGamePresenterBase):
+    update_topics = PlayableGamePresenterBase.update_topics + ("searchingForOpponent", "opponentFound", "onlineGameOver")
+
     def __init__(self, model: OnlineGameModel):
         self.model = model
         super().__init__(model)
@@ -39,6 +41,18 @@ class OnlineGamePresenter(PlayableGamePresenterBase):
         """Sets and returns the view to use"""
         return OnlineGameView(self)
 
+    def create_a_game(self, is_vs_ai: bool) -> None:
+        """Notifies the model to create the game. The request is made in the
+           background, and an alert is shown if it fails.
+        """
+        self.model.create_a_game(is_vs_ai)
+
+    def _get_task_failed_message(self, task: str, error: Exception) -> str:
+        """Returns the alert message shown when a background task of this game fails"""
+        if task.endswith("create_a_game"):
+            return f"Failed to create game: {error}"
+        return super()._get_task_failed_message(task, error)
+
     def update(self, **kwargs) -> None:
         """Update method called on game model updates. Overrides base."""
         super().update(**kwargs)
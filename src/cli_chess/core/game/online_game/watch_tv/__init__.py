@@ -1,3 +1,6 @@
 from .watch_tv_model import WatchTVModel
 from .watch_tv_view import WatchTVView
 from .watch_tv_presenter import WatchTVPresenter, start_watching_tv
+from .tv_wall_model import TVWallModel
+from .tv_wall_view import TVWallView
+from .tv_wall_presenter import TVWallPresenter, start_tv_wall
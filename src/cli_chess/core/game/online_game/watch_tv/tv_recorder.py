@@ -0,0 +1,289 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.config import lichess_config
+from cli_chess.utils.logging import log
+from chess import COLOR_NAMES
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import chess.variant
+import chess.pgn
+import threading
+import atexit
+import queue
+import gzip
+import json
+import io
+import os
+
+_DRAW_STATUSES = ("draw", "stalemate", "outoftime", "timeout", "insufficientMaterialClaim")
+_UNFINISHED_STATUSES = ("created", "started", "aborted", "noStart", "unknownFinish")
+
+
+class TVArchive:
+    """A per-day archive of recorded TV games. Games are appended to a gzip
+       compressed PGN file (tv-YYYY-MM-DD.pgn.gz), each game as its own gzip
+       member, so a single game can be read by seeking to its offset. The
+       offset, players and result of each game are appended to an index file
+       (tv-YYYY-MM-DD.idx) with one JSON object per line. Games are written
+       on a separate thread so recording never blocks the caller.
+    """
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+        self._queue: "queue.Queue[Optional[Tuple[str, dict]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def add_game(self, pgn: str, index_entry: dict) -> None:
+        """Queues the game to be written to the archive"""
+        with self._lock:
+            if not self._writer or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_games, daemon=True)
+                self._writer.start()
+            self._queue.put((pgn, index_entry))
+
+    def flush(self) -> None:
+        """Blocks until all queued games have been written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Writes the queued games and stops the writer thread"""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+        if writer and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+
+    def get_filenames(self, day: Optional[datetime] = None) -> Tuple[str, str]:
+        """Returns the archive and index filenames of the passed in day (UTC, defaults to today)"""
+        day = day or datetime.now(timezone.utc)
+        name = os.path.join(self.directory, f"tv-{day.strftime('%Y-%m-%d')}")
+        return name + ".pgn.gz", name + ".idx"
+
+    def _write_games(self) -> None:
+        """Writes queued games until closed. Games queued together
+           are written as a batch with a single flush
+        """
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                games = [game for game in batch if game is not None]
+                if games:
+                    self._write_batch(games)
+            except OSError as e:
+                log.error(f"TV archive: Error writing games: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if None in batch:
+                return
+
+    def _write_batch(self, games: List[Tuple[str, dict]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        archive_filename, index_filename = self.get_filenames()
+        with open(archive_filename, "ab") as archive, open(index_filename, "a") as index:
+            for pgn, index_entry in games:
+                index_entry = dict(index_entry, offset=archive.tell())
+                archive.write(gzip.compress(pgn.encode("utf-8")))
+                index.write(json.dumps(index_entry) + "\n")
+        log.debug(f"TV archive: Wrote {len(games)} game(s) to {archive_filename}")
+
+
+def read_archived_game(archive_filename: str, offset: int) -> Optional[chess.pgn.Game]:
+    """Reads a single game from the archive using the offset from the index"""
+    with open(archive_filename, "rb") as archive:
+        archive.seek(offset)
+        with gzip.GzipFile(fileobj=archive) as member:
+            return chess.pgn.read_game(io.TextIOWrapper(member, encoding="utf-8"))
+
+
+def load_archive_index(index_filename: str) -> List[dict]:
+    """Returns the entries of an archive index"""
+    with open(index_filename, "r") as index:
+        return [json.loads(line) for line in index if line.strip()]
+
+
+_archives: Dict[str, TVArchive] = {}
+
+
+def get_tv_archive() -> Optional[TVArchive]:
+    """Returns the archive of the directory set in the configuration,
+       or None if recording TV games is disabled
+    """
+    directory = (lichess_config.get_value(lichess_config.Keys.TV_ARCHIVE_DIRECTORY) or "").strip()
+    if not directory:
+        return None
+    if directory not in _archives:
+        _archives[directory] = TVArchive(directory)
+        atexit.register(_archives[directory].close)
+    return _archives[directory]
+
+
+class TVGameRecorder:
+    """Rebuilds a TV game from its stream events. Moves are found by matching
+       the position of successive events, as the `lm` field lichess sends isn't
+       always valid UCI. A game joined after it started is recorded from the
+       first position seen. When the game ends it's added to the archive.
+    """
+    def __init__(self, archive: TVArchive, channel: str):
+        self.archive = archive
+        self.channel = channel
+        self.game: Optional[chess.pgn.Game] = None
+        self.board: Optional[chess.Board] = None
+        self.game_id = ""
+        self._node: Optional[chess.pgn.GameNode] = None
+        self._complete = True
+
+    def handle_event(self, event: dict) -> None:
+        """Records the stream event"""
+        try:
+            if 'id' in event:
+                status = event.get('status', {}).get('name')
+                if status == "started" and self.game is None:
+                    self._start_game(event)
+                elif status != "started" and self.game is not None:
+                    self._end_game(event)
+            elif self.game is not None and event.get('fen'):
+                self._add_position(event['fen'], event.get('lm', ""))
+        except Exception as e:
+            log.error(f"TV recorder: Error recording event: {e}")
+            self.game = None
+
+    def finish(self) -> None:
+        """Archives the game being recorded as unfinished (e.g. TV was
+           stopped before the game ended). Games without moves are dropped.
+        """
+        if self.game is not None and self.board.move_stack:
+            self._archive("*")
+        self.game = None
+
+    def _start_game(self, event: dict) -> None:
+        self.game_id = event['id']
+        variant = event.get('variant', {}).get('key', "standard")
+        board_type = chess.Board if variant in ("standard", "fromPosition", "chess960") else chess.variant.find_variant(variant)
+        self.board = board_type(event.get('initialFen') or board_type.starting_fen, chess960=(variant == "chess960"))
+
+        fen = event.get('fen')
+        if fen and not self._is_position(self.board, fen):
+            # Joined a game in progress, so it's recorded from the current position
+            self.board.set_fen(self._full_fen(fen, event.get('turns', 0)))
+
+        self.game = chess.pgn.Game.from_board(self.board)
+        self._node = self.game
+        self.board = self.game.board()
+        self._complete = True
+
+        headers = self.game.headers
+        headers["Event"] = f"Lichess TV: {self.channel}"
+        headers["Site"] = f"https://lichess.org/{self.game_id}"
+        headers["Date"] = datetime.now(timezone.utc).strftime("%Y.%m.%d")
+        headers["Variant"] = event.get('variant', {}).get('name', "Standard")
+        for color in COLOR_NAMES:
+            player = event.get('players', {}).get(color, {})
+            name = player.get('user', {}).get('name') or (f"Stockfish level {player['aiLevel']}" if player.get('aiLevel') else "?")
+            headers[color.capitalize()] = name
+            if player.get('rating'):
+                headers[f"{color.capitalize()}Elo"] = str(player['rating'])
+        if headers["Variant"] == "Standard":
+            del headers["Variant"]
+
+    def _add_position(self, fen: str, last_move: str) -> None:
+        """Adds the move leading to the passed in position"""
+        if not self._complete or self._is_position(self.board, fen):
+            return
+
+        move = self._find_move(fen, last_move)
+        if move is None:
+            # Positions were missed, the moves after this can't be rebuilt
+            log.error(f"TV recorder: Unable to rebuild move {last_move} in {self.game_id}")
+            self._complete = False
+            self._node.comment = "Recording incomplete"
+            return
+
+        self.board.push(move)
+        self._node = self._node.add_variation(move)
+
+    def _find_move(self, fen: str, last_move: str) -> Optional[chess.Move]:
+        """Returns the legal move leading to the position of the passed in FEN"""
+        candidates = list(self.board.legal_moves)
+        try:
+            uci_move = chess.Move.from_uci(last_move)
+            candidates.insert(0, uci_move)
+        except ValueError:
+            pass
+
+        for move in candidates:
+            if move in self.board.legal_moves:
+                self.board.push(move)
+                matched = self._is_position(self.board, fen)
+                self.board.pop()
+                if matched:
+                    return move
+        return None
+
+    def _end_game(self, event: dict) -> None:
+        status = event.get('status', {}).get('name', "")
+        winner = event.get('winner')
+        if event.get('fen'):
+            self._add_position(event['fen'], event.get('lastMove', ""))
+
+        if winner:
+            result = "1-0" if winner == "white" else "0-1"
+        elif status in _DRAW_STATUSES:
+            result = "1/2-1/2"
+        else:
+            result = "*"
+
+        self.game.headers["Termination"] = status
+        if status not in _UNFINISHED_STATUSES:
+            self._archive(result)
+        self.game = None
+
+    def _archive(self, result: str) -> None:
+        self.game.headers["Result"] = result
+        pgn = str(self.game) + "\n\n"
+        self.archive.add_game(pgn, {
+            'gameId': self.game_id,
+            'white': self.game.headers.get("White"),
+            'black': self.game.headers.get("Black"),
+            'result': result,
+        })
+        log.info(f"TV recorder: Recorded {self.game_id} ({result})")
+
+    @staticmethod
+    def _is_position(board: chess.Board, fen: str) -> bool:
+        """Returns True if the board matches the placement and turn of the FEN.
+           Lichess TV move events only include these two fields.
+        """
+        parts = fen.split()
+        turn = parts[1] if len(parts) > 1 else None
+        return board.board_fen() == parts[0].split("[")[0] and (turn is None or turn == ("w" if board.turn else "b"))
+
+    @staticmethod
+    def _full_fen(fen: str, turns: int) -> str:
+        """Returns a complete FEN from the (possibly partial) FEN lichess sends"""
+        parts = fen.split()
+        if len(parts) >= 4:
+            return fen
+        turn = parts[1] if len(parts) > 1 else ("w" if turns % 2 == 0 else "b")
+        return f"{parts[0]} {turn} - - 0 {turns // 2 + 1}"
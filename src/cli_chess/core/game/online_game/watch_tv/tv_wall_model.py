@@ -0,0 +1,63 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.game.online_game.watch_tv.watch_tv_model import WatchTVModel
+from cli_chess.core.api.stream_broker import DEFAULT_STREAM_BUDGET
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.utils.logging import log
+from typing import List
+
+# Leaves stream slots for a game being played and the incoming event stream
+MAX_TV_WALL_CHANNELS = DEFAULT_STREAM_BUDGET - 2
+DEFAULT_TV_WALL_SIZE = 4
+
+
+class TVWallModel:
+    """Watches several TV channels at once. Each channel is watched by its own
+       WatchTVModel. All channel streams are opened through the stream broker
+       and share the TV directory, so the wall makes a single directory request
+       per interval regardless of the number of channels being watched.
+    """
+    def __init__(self, channels: List[TVChannelMenuOptions]):
+        channels = list(dict.fromkeys(channels))  # removes duplicates, keeping order
+        if not channels:
+            raise ValueError("At least one TV channel is required")
+        if len(channels) > MAX_TV_WALL_CHANNELS:
+            raise ValueError(f"The TV wall can watch up to {MAX_TV_WALL_CHANNELS} channels")
+
+        self.channels = channels
+        self.tv_models = [WatchTVModel(channel) for channel in self.channels]
+        log.debug(f"Created TV wall for: {[channel.value for channel in self.channels]}")
+
+    def start_watching(self) -> None:
+        """Starts watching all channels"""
+        for model in self.tv_models:
+            model.start_watching()
+
+    def stop_watching(self) -> None:
+        """Stops watching all channels. This closes all streams
+           and waits for the stream threads to finish.
+        """
+        # All streams are closed before waiting on any thread, so
+        # the wall stops in the time of the slowest channel
+        for model in self.tv_models:
+            model.stop_watching(wait=False)
+        for model in self.tv_models:
+            model.stop_watching()
+
+    def cleanup(self) -> None:
+        """Cleans up the models of all channels"""
+        for model in self.tv_models:
+            model.cleanup()
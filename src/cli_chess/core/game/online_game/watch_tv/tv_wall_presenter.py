@@ -0,0 +1,231 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+from cli_chess.core.game.online_game.watch_tv.tv_wall_model import TVWallModel
+from cli_chess.core.game.online_game.watch_tv.tv_wall_view import TVWallView, TVWallBoardView
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.modules.common import get_piece_unicode_symbol
+from cli_chess.utils.render_scheduler import RenderScheduler
+from cli_chess.utils.ui_common import change_views
+from cli_chess.utils.config import game_config
+from cli_chess.utils.logging import log
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from chess import COLOR_NAMES, Color, Square, square_file
+from typing import List, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.core.game.online_game.watch_tv import WatchTVModel
+
+# The minimum number of seconds between renders of a board
+FOCUSED_FRAME_INTERVAL = 0.05
+VISIBLE_FRAME_INTERVAL = 0.25
+HIDDEN_FRAME_INTERVAL = 2.0
+
+
+def start_tv_wall(channels: List[TVChannelMenuOptions]) -> None:
+    presenter = TVWallPresenter(TVWallModel(channels))
+    change_views(presenter.view, presenter.view)
+
+
+class TVWallPresenter:
+    def __init__(self, model: TVWallModel, scheduler: Optional[RenderScheduler] = None):
+        self.model = model
+        self.scheduler = scheduler or RenderScheduler()
+        self.focused_index = 0
+        self.first_visible_index = 0
+        self.visible_slots = len(self.model.tv_models)
+        self.board_presenters = [TVWallBoardPresenter(tv_model, self, i) for i, tv_model in enumerate(self.model.tv_models)]
+        self.view = TVWallView(self)
+
+        self.scheduler.start()
+        for presenter in self.board_presenters:
+            self.scheduler.request_render(presenter)
+        self.model.start_watching()
+
+    def is_focused(self, index: int) -> bool:
+        """Returns True if the board at the passed in index is focused"""
+        return index == self.focused_index
+
+    def is_visible(self, index: int) -> bool:
+        """Returns True if the board at the passed in index fits on screen"""
+        return self.first_visible_index <= index < self.first_visible_index + self.visible_slots
+
+    def get_visible_board_presenters(self) -> List[TVWallBoardPresenter]:
+        return [presenter for presenter in self.board_presenters if self.is_visible(presenter.index)]
+
+    def set_visible_slots(self, slots: int) -> None:
+        """Sets the number of boards which fit on screen. Called by
+           the view when the layout is created or the terminal resized.
+        """
+        slots = max(1, slots)
+        if slots != self.visible_slots:
+            self.visible_slots = slots
+            self._scroll_to_focused()
+
+    def focus_next(self) -> None:
+        self._set_focus((self.focused_index + 1) % len(self.board_presenters))
+
+    def focus_previous(self) -> None:
+        self._set_focus((self.focused_index - 1) % len(self.board_presenters))
+
+    def flip_board(self) -> None:
+        """Flips the orientation of the focused board"""
+        board_model = self.board_presenters[self.focused_index].model.board_model
+        board_model.set_board_orientation(not board_model.get_board_orientation())
+
+    def _set_focus(self, index: int) -> None:
+        """Focuses the board at the passed in index. Boards with a
+           changed frame interval are rendered at their new rate
+        """
+        self.focused_index = index
+        self._scroll_to_focused()
+
+    def _scroll_to_focused(self) -> None:
+        """Scrolls the visible boards so the focused board is on screen
+           and renders all boards using their current frame intervals
+        """
+        if self.focused_index < self.first_visible_index:
+            self.first_visible_index = self.focused_index
+        elif self.focused_index >= self.first_visible_index + self.visible_slots:
+            self.first_visible_index = self.focused_index - self.visible_slots + 1
+
+        for presenter in self.board_presenters:
+            self.scheduler.request_render(presenter)
+
+    def stop_watching(self) -> None:
+        """Stops watching all channels and rendering the boards"""
+        self.model.stop_watching()
+        self.scheduler.stop()
+        for presenter in self.board_presenters:
+            presenter.cleanup()
+        self.model.cleanup()
+
+    def exit(self) -> None:
+        """Stops the TV wall and returns to the main menu"""
+        self.stop_watching()
+        self.view.exit()
+
+
+class TVWallBoardPresenter:
+    """Presents a single channel of the TV wall using a compact board.
+       Renders are made on the UI loop through the wall's render
+       scheduler rather than on every model update.
+    """
+    def __init__(self, model: WatchTVModel, wall: TVWallPresenter, index: int):
+        self.model = model
+        self.wall = wall
+        self.index = index
+        self.status = ""
+        self.view = TVWallBoardView(self)
+
+        self.model.e_game_model_updated.add_listener(self.update, ui=True, weak=True)
+        game_config.e_game_config_updated.add_listener(self._handle_game_config_updated, ui=True, weak=True)
+
+    @property
+    def frame_interval(self) -> float:
+        """Returns the minimum number of seconds between renders of this board"""
+        if not self.wall.is_visible(self.index):
+            return HIDDEN_FRAME_INTERVAL
+        if self.wall.is_focused(self.index):
+            return FOCUSED_FRAME_INTERVAL
+        return VISIBLE_FRAME_INTERVAL
+
+    def update(self, **kwargs) -> None:
+        """Schedules a render on model updates"""
+        if 'searchingForGame' in kwargs:
+            self.status = "Searching..."
+        if 'tvGameFound' in kwargs:
+            self.status = ""
+        if 'onlineGameOver' in kwargs:
+            status = self.model.game_metadata['state'].get('status')
+            self.status = (status.get('name') if isinstance(status, dict) else status) or "Game over"
+        if 'tvError' in kwargs:
+            self.status = kwargs.get('msg', "Error")
+        self.wall.scheduler.request_render(self)
+
+    def render(self) -> None:
+        """Rebuilds the board output. Called by the render scheduler"""
+        self.view.update(self.get_title(), self.get_player_line(not self.model.board_model.get_board_orientation()),
+                         self.get_board_fragments(), self.get_player_line(self.model.board_model.get_board_orientation()))
+
+    def get_title(self) -> str:
+        title = self.model.channel.value
+        return f"{title} - {self.status}" if self.status else title
+
+    def get_player_line(self, color: Color) -> str:
+        """Returns the player name and clock of the passed in color"""
+        player = self.model.game_metadata['players'][COLOR_NAMES[color]]
+        name = player.get('name') or "?"
+        rating = f" {player['rating']}" if player.get('rating') else ""
+        clock = self._format_clock(self.model.game_metadata['clock'][COLOR_NAMES[color]].get('time'))
+        return f"{(name + rating)[:TVWallBoardView.WIDTH - 6]:<{TVWallBoardView.WIDTH - 6}}{clock:>6}"
+
+    def get_board_fragments(self) -> StyleAndTextTuples:
+        """Returns the compact board output (two columns per square, no coordinates)"""
+        fragments: StyleAndTextTuples = []
+        board_model = self.model.board_model
+        last_file = 7 if board_model.is_white_orientation() else 0
+        config = game_config.get_snapshot()
+
+        for square in board_model.get_board_squares():
+            piece = board_model.board.piece_at(square)
+            style = f"class:{self._get_square_color(square)}"
+            piece_str = ""
+            if piece:
+                style += ".light-piece" if piece.color else ".dark-piece"
+                if not config.blindfold_chess:
+                    piece_str = get_piece_unicode_symbol(piece.symbol()) if config.use_unicode_pieces else piece.symbol().upper()
+
+            fragments.append((style, f"{piece_str:<2}"))
+            if square_file(square) == last_file:
+                fragments.append(("", "\n"))
+
+        if fragments:
+            fragments.pop()
+        return fragments
+
+    def _get_square_color(self, square: Square) -> str:
+        board_model = self.model.board_model
+        square_color = "light-square" if board_model.is_light_square(square) else "dark-square"
+
+        if game_config.get_snapshot().show_board_highlights:
+            try:
+                last_move = board_model.get_highlight_move()
+                if bool(last_move) and square in (last_move.from_square, last_move.to_square):
+                    square_color = "last-move"
+            except IndexError:
+                pass
+
+            if board_model.is_square_in_check(square):
+                square_color = "in-check"
+
+        return square_color
+
+    @staticmethod
+    def _format_clock(seconds) -> str:
+        if seconds is None or seconds == "":
+            return "--:--"
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes:02}:{seconds:02}"
+
+    def _handle_game_config_updated(self) -> None:
+        self.wall.scheduler.request_render(self)
+
+    def cleanup(self) -> None:
+        self.model.e_game_model_updated.remove_listener(self.update)
+        game_config.e_game_config_updated.remove_listener(self._handle_game_config_updated)
+        self.wall.scheduler.forget(self)
+        log.debug(f"Cleaned up TV wall board: {self.model.channel.value}")
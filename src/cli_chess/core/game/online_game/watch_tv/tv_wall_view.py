@@ -0,0 +1,145 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+from cli_chess.utils.ui_common import handle_mouse_click, go_back_to_main_menu
+from prompt_toolkit.application import get_app
+from prompt_toolkit.layout import Container, Window, FormattedTextControl, VSplit, HSplit, VerticalAlign, DynamicContainer, D
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.keys import Keys
+from prompt_toolkit.widgets import Box
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.core.game.online_game.watch_tv.tv_wall_presenter import TVWallPresenter, TVWallBoardPresenter
+
+
+class TVWallView:
+    def __init__(self, presenter: TVWallPresenter):
+        self.presenter = presenter
+        self._container = self._create_container()
+
+    def _create_container(self) -> Container:
+        """Creates the container for the TV wall"""
+        function_bar = HSplit([
+            self._create_function_bar()
+        ], align=VerticalAlign.BOTTOM)
+
+        return HSplit([DynamicContainer(self._get_board_grid), function_bar], key_bindings=self.get_key_bindings())
+
+    def _get_board_grid(self) -> Container:
+        """Returns a grid of the boards which fit on screen. The number of
+           boards that fit is passed to the presenter so boards which don't
+           fit can be updated at a lower rate.
+        """
+        size = get_app().output.get_size()
+        columns = max(1, size.columns // (TVWallBoardView.WIDTH + 2))
+        rows = max(1, (size.rows - 1) // (TVWallBoardView.HEIGHT + 1))
+        self.presenter.set_visible_slots(columns * rows)
+
+        board_views = [presenter.view for presenter in self.presenter.get_visible_board_presenters()]
+        grid_rows = [VSplit(board_views[i:i + columns]) for i in range(0, len(board_views), columns)]
+        return HSplit(grid_rows)
+
+    def _create_function_bar(self) -> VSplit:
+        """Create the function bar"""
+        def _get_function_bar_fragments() -> StyleAndTextTuples:
+            return [
+                ("class:function-bar.key", "F1", handle_mouse_click(self.presenter.flip_board)),
+                ("class:function-bar.label", f"{'Flip board':<11}", handle_mouse_click(self.presenter.flip_board)),
+                ("class:function-bar.spacer", " "),
+                ("class:function-bar.key", "Tab", handle_mouse_click(self.presenter.focus_next)),
+                ("class:function-bar.label", f"{'Next board':<11}", handle_mouse_click(self.presenter.focus_next)),
+                ("class:function-bar.spacer", " "),
+                ("class:function-bar.key", "F8", handle_mouse_click(self.presenter.exit)),
+                ("class:function-bar.label", f"{'Exit':<11}", handle_mouse_click(self.presenter.exit))
+            ]
+
+        return VSplit([
+            Window(FormattedTextControl(_get_function_bar_fragments)),
+        ], height=D(max=1, preferred=1))
+
+    def get_key_bindings(self) -> KeyBindings:
+        """Returns the key bindings for this container"""
+        bindings = KeyBindings()
+
+        @bindings.add(Keys.F1, eager=True)
+        def _(event): # noqa
+            self.presenter.flip_board()
+
+        @bindings.add(Keys.Tab, eager=True)
+        @bindings.add(Keys.Right, eager=True)
+        def _(event): # noqa
+            self.presenter.focus_next()
+
+        @bindings.add(Keys.BackTab, eager=True)
+        @bindings.add(Keys.Left, eager=True)
+        def _(event): # noqa
+            self.presenter.focus_previous()
+
+        @bindings.add(Keys.F8, eager=True)
+        def _(event): # noqa
+            self.presenter.exit()
+
+        return bindings
+
+    @staticmethod
+    def exit() -> None:
+        """Exits this view and returns to the main menu"""
+        go_back_to_main_menu()
+
+    def __pt_container__(self) -> Container:
+        """Return the view container"""
+        return self._container
+
+
+class TVWallBoardView:
+    """A compact board of the TV wall. The output is built by the presenter
+       when it's rendered by the scheduler, so painting the view is cheap.
+    """
+    WIDTH = 16
+    HEIGHT = 11
+
+    def __init__(self, presenter: TVWallBoardPresenter):
+        self.presenter = presenter
+        self.title = ""
+        self.upper_player = ""
+        self.board_fragments: StyleAndTextTuples = []
+        self.lower_player = ""
+        self._container = self._create_container()
+
+    def _create_container(self) -> Container:
+        """Create the compact board container"""
+        return Box(HSplit([
+            Window(FormattedTextControl(self._get_title_fragments), height=1),
+            Window(FormattedTextControl(lambda: self.upper_player, style="class:player-info"), height=1),
+            Window(FormattedTextControl(lambda: self.board_fragments), always_hide_cursor=True, height=8),
+            Window(FormattedTextControl(lambda: self.lower_player, style="class:player-info"), height=1),
+        ], width=D(max=self.WIDTH, preferred=self.WIDTH)), padding=0, padding_right=2, padding_bottom=1)
+
+    def _get_title_fragments(self) -> StyleAndTextTuples:
+        style = "class:focused-selected" if self.presenter.wall.is_focused(self.presenter.index) else "class:menu.category-title"
+        return [(style, f"{self.title[:self.WIDTH]:<{self.WIDTH}}")]
+
+    def update(self, title: str, upper_player: str, board_fragments: StyleAndTextTuples, lower_player: str) -> None:
+        """Updates the output with the passed in data. The UI is repainted by the scheduler"""
+        self.title = title
+        self.upper_player = upper_player
+        self.board_fragments = board_fragments
+        self.lower_player = lower_player
+
+    def __pt_container__(self) -> Container:
+        """Returns this container"""
+        return self._container
@@ -13,22 +13,33 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from __future__ import annotations
 from cli_chess.core.game import GameModelBase
+from cli_chess.core.api.event_journal import journal_event, SOURCE_TV
+from cli_chess.core.api.api_stream import ApiStream, open_api_stream
+from cli_chess.core.api.stream_broker import StreamPriority
+from cli_chess.core.api.tv_directory import tv_directory
+from cli_chess.core.game.online_game.watch_tv.tv_recorder import TVArchive, TVGameRecorder, get_tv_archive
 from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 from cli_chess.utils.event import Event
 from cli_chess.utils.logging import log
 from chess import COLOR_NAMES
 from berserk.exceptions import ResponseError
-from time import sleep
+from collections import deque
+from typing import Deque, List, Optional
 import threading
 
 
 class WatchTVModel(GameModelBase):
-    def __init__(self, channel: TVChannelMenuOptions):
+    def __init__(self, channel: TVChannelMenuOptions, archive: Optional[TVArchive] = None):
+        """Watches the TV channel. Watched games are recorded to the passed
+           in archive, or the archive set in the configuration (if any)
+        """
         super().__init__(variant=channel.variant, fen=None)
         self.channel = channel
-        self._tv_stream = StreamTVChannel(self.channel)
-        self._tv_stream.e_tv_stream_event.add_listener(self.stream_event_received)
+        self._tv_stream = StreamTVChannel(self.channel, archive or get_tv_archive())
+        self._ply = 0
+        self._tv_stream.e_tv_stream_event.add_listener(self.stream_event_received, ui=True)
 
     def _default_game_metadata(self) -> dict:
         """Returns the default structure for game metadata"""
@@ -43,10 +54,12 @@ class WatchTVModel(GameModelBase):
         """Notify the TV stream thread to start"""
         self._tv_stream.start()
 
-    def stop_watching(self):
-        """Stop the TV stream thread"""
+    def stop_watching(self, wait: bool = True):
+        """Stop the TV stream thread. This closes the stream and,
+           if `wait` is set, waits for the thread to finish.
+        """
         if self._tv_stream.is_alive():
-            self._tv_stream.stop_watching()
+            self._tv_stream.stop_watching(wait)
 
     def _save_game_metadata(self, **kwargs) -> None:
         """Parses and saves the data of the game being played"""
@@ -62,6 +75,10 @@ class WatchTVModel(GameModelBase):
                 self.game_metadata['speed'] = data.get('speed')
                 self.game_metadata['state']['status'] = data.get('status')
                 self.game_metadata['state']['winner'] = data.get('winner')  # Not included on draws or abort
+                if 'tv_startGameEvent' in kwargs:
+                    self._ply = data.get('turns', 0)
+                if not self._is_game_started():
+                    self._set_clock_running(False)
 
                 for color in COLOR_NAMES:
                     if data.get('players', {}).get(color, {}).get('user'):  # non-ai player data
@@ -76,12 +93,52 @@ class WatchTVModel(GameModelBase):
                 self.game_metadata['clock']['units'] = "sec"
                 self.game_metadata['clock']['white']['time'] = data.get('wc')
                 self.game_metadata['clock']['black']['time'] = data.get('bc')
+                self._ply = self._get_ply(data.get('fen', ""))
+                # Lichess starts the clock once both sides have made a move
+                self._set_clock_running(self._is_game_started() and self._ply >= 2)
 
             self.e_game_model_updated.notify()
         except Exception as e:
             log.error(f"Error saving game metadata: {e}")
             raise
 
+    def _get_ply(self, fen: str) -> int:
+        """Returns the ply of the position of a move event. Move events may have been
+           coalesced by the TV event queue, so the ply is worked out from the FEN rather
+           than counted. Lichess only sends the board and side to move, so unless the FEN
+           has a fullmove number, this is the first ply after the last one with the side
+           to move. This must be called before the board is set to the new position.
+        """
+        fields = fen.split()
+        black_to_move = len(fields) > 1 and fields[1] == "b"
+        if len(fields) >= 6 and fields[5].isdigit():
+            return (int(fields[5]) - 1) * 2 + black_to_move
+
+        ply = self._ply + 1
+        if ply % 2 != black_to_move:
+            ply += 1
+        elif self._ply < 2 and fields and not self._is_one_move_away(fields[0]):
+            # While the clock isn't running, tell the first moves apart from later ones
+            ply += 2
+        return ply
+
+    def _is_one_move_away(self, board_fen: str) -> bool:
+        """Returns True if the board FEN can be reached from the position on the board in a single move"""
+        board_fen = "/".join(board_fen.split("[")[0].replace("~", "").split("/")[:8])
+        board = self.board_model.board.copy(stack=False)
+        for move in board.legal_moves:
+            board.push(move)
+            reached = board.board_fen() == board_fen
+            board.pop()
+            if reached:
+                return True
+        return False
+
+    def _is_game_started(self) -> bool:
+        """Returns True if the game being watched is in progress"""
+        status = self.game_metadata['state']['status']
+        return (status.get('name') if isinstance(status, dict) else status) == "started"
+
     def stream_event_received(self, **kwargs):
         """An event was received from the TV thread. Raises exception on invalid data"""
         try:
@@ -133,14 +190,18 @@ class WatchTVModel(GameModelBase):
 
 
 class StreamTVChannel(threading.Thread):
-    def __init__(self, channel: TVChannelMenuOptions):
+    def __init__(self, channel: TVChannelMenuOptions, archive: Optional[TVArchive] = None):
         super().__init__(daemon=True)
         self.channel = channel
+        self.archive = archive
         self.current_game = ""
         self.running = False
         self.max_retries = 10
         self.retries = 0
+        self.stop_timeout = 5
         self.e_tv_stream_event = Event()
+        self._stream: Optional[ApiStream] = None
+        self._stopped = threading.Event()
 
         try:
             from cli_chess.core.api.api_manager import api_client
@@ -158,7 +219,7 @@ class StreamTVChannel(threading.Thread):
 
     def get_channel_game_id(self, channel: str) -> str:
         """Returns the game ID of the ongoing TV game of the passed in channel"""
-        channel_game_id = self.api_client.tv.get_current_games().get(channel, {}).get('gameId')
+        channel_game_id = tv_directory.get_game_id(self.api_client, channel)
         if not channel_game_id:
             raise ValueError(f"TV Stream: Didn't receive game ID for current {channel} TV game")
 
@@ -175,52 +236,85 @@ class StreamTVChannel(threading.Thread):
 
                 if game_id != self.current_game:
                     self.current_game = game_id
-                    turns_behind = 0
-                    stream = self.api_client.games.stream_game_moves(game_id)
-
-                    for event in stream:
-                        # TODO: This does close the stream, but not until the next event comes in (which can be a while
-                        #  sometimes (especially in longer time format games like Classical). Ideally there's
-                        #  a way to immediately kill the stream, without waiting for another event. This is certainly
-                        #  something to watch for since if a user backs out of multiple TV streams and immediately
-                        #  enters another streams/threads will start to compound streams/threads and quickly
-                        #  bring us close to the 8 streams open per IP limit.
-                        if not self.running:
-                            stream.close()
-                            break
-
-                        fen = event.get('fen')
-                        winner = event.get('winner')
-                        status = event.get('status', {}).get('name')
-
-                        if winner or status != "started" and status:
-                            log.info(f"Game finished: {game_id}")
-                            self.e_tv_stream_event.notify(endGameEvent=event)
-                            break
-
-                        if status == "started":
-                            log.info(f"Started streaming TV game: {game_id}")
-                            self.e_tv_stream_event.notify(startGameEvent=event, tvGameFound=True)
-                            turns_behind = event.get('turns', 0)
-
-                        if fen:
-                            if turns_behind <= 2:
-                                if event.get('wc') and event.get('bc'):
-                                    self.e_tv_stream_event.notify(coreGameEvent=event)
-                            else:
-                                # Keeping track of turns behind allows skipping this event until
-                                # we are caught up. This stops a quick game replay from happening.
-                                # We do however want to grab the last move event to pick up the clock data.
-                                turns_behind -= 1
+                    self._stream = open_api_stream(self.api_client, f"/api/stream/game/{game_id}", StreamPriority.TV)
+                    if not self.running:
+                        self._stream.close()
+
+                    queue = _TVEventQueue()
+                    reader = threading.Thread(target=self._read_stream, args=(self._stream, queue, game_id), daemon=True)
+                    reader.start()
+                    try:
+                        self._handle_stream_events(queue, game_id)
+                    finally:
+                        self._stream.close()
+                        reader.join()
+                        log.debug(f"TV stream closed ({queue.dropped} outdated positions skipped): {game_id}")
+
+                    if self._stream.preempted:
+                        # A more important stream (e.g. a game) needed the slot. The
+                        # stream is queued with the broker until a slot is available
+                        log.info(f"TV stream preempted: {game_id}")
+                        self.current_game = ""
 
             except Exception as e:
-                self.handle_exceptions(e)
+                if self.running:
+                    self.handle_exceptions(e)
 
             else:
                 if self.running:
                     self.retries = 0
                     log.debug("Sleeping 2 seconds before finding next TV game")
-                    sleep(2)
+                    self._stopped.wait(2)
+
+            finally:
+                self._stream = None
+
+        log.info(f"Stopped watching {self.channel.value} TV")
+
+    def _read_stream(self, stream: ApiStream, queue: _TVEventQueue, game_id: str) -> None:
+        """Reads the stream into the queue as fast as events arrive, so a backlog
+           of moves (e.g. when joining a game) is coalesced rather than replayed
+        """
+        error = None
+        recorder = TVGameRecorder(self.archive, self.channel.value) if self.archive else None
+        try:
+            for event in stream:
+                journal_event(SOURCE_TV, game_id, event, channel=self.channel.value)
+                if recorder:
+                    recorder.handle_event(event)
+                queue.put(event)
+        except Exception as e:
+            error = e
+        finally:
+            queue.close(error)
+            if recorder:
+                recorder.finish()
+
+    def _handle_stream_events(self, queue: _TVEventQueue, game_id: str) -> None:
+        """Notifies listeners of the queued stream events until the game finishes
+           or the stream ends. Only the newest of consecutive moves is received.
+        """
+        while True:
+            events = queue.get_all()
+            if events is None:
+                return
+
+            for event in events:
+                winner = event.get('winner')
+                status = event.get('status', {}).get('name')
+
+                if winner or status != "started" and status:
+                    log.info(f"Game finished: {game_id}")
+                    tv_directory.invalidate()
+                    self.e_tv_stream_event.notify(endGameEvent=event)
+                    return
+
+                if status == "started":
+                    log.info(f"Started streaming TV game: {game_id}")
+                    self.e_tv_stream_event.notify(startGameEvent=event, tvGameFound=True)
+
+                elif event.get('fen') and event.get('wc') and event.get('bc'):
+                    self.e_tv_stream_event.notify(coreGameEvent=event)
 
     def handle_exceptions(self, e: Exception):
         """Handles the passed in exception and responds appropriately"""
@@ -236,13 +330,79 @@ class StreamTVChannel(threading.Thread):
             # TODO: Send event to model with retry notification so we can display it to the user
             log.info(f"Sleeping {delay} seconds before retrying ({self.max_retries - self.retries} retries left).")
             self.e_tv_stream_event.notify(tvError=True, msg=f"Error streaming. Retrying in {delay} seconds.")
-            sleep(delay)
+            self._stopped.wait(delay)
             self.retries += 1
         else:
+            self.e_tv_stream_event.notify(tvError=True, msg="Retries exhausted. Stopping TV.")
             self.stop_watching()
 
-    def stop_watching(self):
+    def stop_watching(self, wait: bool = True):
+        """Stops watching TV. The open stream is closed immediately rather than
+           on the next event and, when called from another thread with `wait`
+           set, this blocks until the thread has finished (up to `stop_timeout` seconds)
+        """
         log.info("Stopping TV stream")
-        self.e_tv_stream_event.notify(tvError=True, msg="Retries exhausted. Stopping TV.")
         self.e_tv_stream_event.remove_all_listeners()
         self.running = False
+        self._stopped.set()
+
+        stream = self._stream
+        if stream:
+            stream.close()
+
+        if wait and threading.current_thread() is not self and self.is_alive():
+            self.join(self.stop_timeout)
+            if self.is_alive():
+                log.error(f"TV stream thread did not stop within {self.stop_timeout} seconds")
+
+
+class _TVEventQueue:
+    """Hands TV stream events from the reader thread to the TV thread. A move
+       event replaces a queued move event which hasn't been handled yet, so
+       however far behind the stream is, only the newest position (and clock)
+       reaches the models. Game description events are never dropped.
+    """
+    def __init__(self):
+        self.dropped = 0
+        self._events: Deque[dict] = deque()
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._cond = threading.Condition()
+
+    def put(self, event: dict) -> None:
+        with self._cond:
+            if self._events and self._is_move(event) and self._is_move(self._events[-1]):
+                self._events[-1] = event
+                self.dropped += 1
+            else:
+                self._events.append(event)
+            self._cond.notify()
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        """Marks the end of the stream. The error (if any) is raised once the queue is drained"""
+        with self._cond:
+            self._closed = True
+            self._error = error
+            self._cond.notify()
+
+    def get_all(self) -> Optional[List[dict]]:
+        """Blocks until events are queued and returns them all. Returns None once
+           the queue is closed and empty, raising the error the stream ended with
+        """
+        with self._cond:
+            while not self._events and not self._closed:
+                self._cond.wait()
+
+            if self._events:
+                events = list(self._events)
+                self._events.clear()
+                return events
+
+            if self._error:
+                raise self._error
+            return None
+
+    @staticmethod
+    def _is_move(event: dict) -> bool:
+        """Move events only contain the position and clocks, unlike game description events"""
+        return 'id' not in event and 'fen' in event
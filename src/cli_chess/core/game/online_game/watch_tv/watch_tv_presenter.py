@@ -26,6 +26,8 @@ def start_watching_tv(channel: TVChannelMenuOptions) -> None:
 
 
 class WatchTVPresenter(GamePresenterBase):
+    update_topics = ("searchingForGame", "tvGameFound", "tvError")
+
     def __init__(self, model: WatchTVModel):
         self.model = model
         super().__init__(model)
@@ -49,4 +51,5 @@ class WatchTVPresenter(GamePresenterBase):
     def exit(self) -> None:
         """Stops TV and returns to the main menu"""
         self.model.stop_watching()
+        self.clock_presenter.stop()
         self.view.exit()
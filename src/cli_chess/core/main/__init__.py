@@ -1,3 +1,7 @@
-from .main_model import MainModel
-from .main_view import MainView
-from .main_presenter import MainPresenter
+from cli_chess.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".main_model": ("MainModel",),
+    ".main_view": ("MainView",),
+    ".main_presenter": ("MainPresenter",),
+})
@@ -13,8 +13,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from cli_chess.utils.logging import configure_logger
-from cli_chess.utils import setup_argparse
+from cli_chess.utils.logging import configure_logger, set_log_levels
+from cli_chess.utils.argparse import setup_argparse
+from cli_chess.utils.config import force_recreate_configs, print_program_config
 from cli_chess.__metadata__ import __version__
 from platform import python_version, system, release, machine
 
@@ -24,6 +25,9 @@ class MainModel:
     def __init__(self):
         self._start_loggers()
         self.startup_args = self._parse_args()
+        if self.startup_args.log_level:
+            set_log_levels(self.startup_args.log_level)
+        self._handle_info_args()
 
     @staticmethod
     def _start_loggers():
@@ -35,6 +39,19 @@ class MainModel:
         configure_logger("chess.engine")
         configure_logger("berserk")
 
+    def _handle_info_args(self) -> None:
+        """Handles the arguments which exit without starting the application.
+           These are handled by the model so the UI is never loaded for them.
+        """
+        if self.startup_args.print_config:
+            print_program_config()
+            exit(0)
+
+        if self.startup_args.reset_config:
+            force_recreate_configs()
+            print("Configuration successfully reset")
+            exit(0)
+
     @staticmethod
     def _parse_args():
         """Parse the args passed in at startup"""
@@ -16,9 +16,9 @@
 from __future__ import annotations
 from cli_chess.core.main.main_view import MainView
 from cli_chess.menus.main_menu import MainMenuModel, MainMenuPresenter
-from cli_chess.core.api.api_manager import required_token_scopes
+from cli_chess.core.api.event_journal import start_event_journal
 from cli_chess.modules.token_manager.token_manager_model import g_token_manager_model
-from cli_chess.utils import force_recreate_configs, print_program_config
+from cli_chess.utils import event_tracer
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.core.main import MainModel
@@ -35,19 +35,16 @@ class MainPresenter:
         """Handles the arguments passed"""
         args = self.model.startup_args
 
-        if args.print_config:
-            print_program_config()
-            exit(0)
+        if args.journal:
+            start_event_journal(args.journal)
 
-        if args.reset_config:
-            force_recreate_configs()
-            print("Configuration successfully reset")
-            exit(0)
+        if args.trace_events:
+            event_tracer.start()
 
         if args.token:
-            if not g_token_manager_model.update_linked_account(args.token):
-                self.view.print_error_to_terminal(f"Invalid API token or missing required scopes. Scopes required: {required_token_scopes}")
-                exit(1)
+            # Validated in the background so the UI isn't held up by the request.
+            # The online menu shows the validation status until it completes.
+            g_token_manager_model.update_linked_account_async(args.token)
 
     def run(self):
         """Starts the main application"""
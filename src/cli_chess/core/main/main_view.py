@@ -15,17 +15,18 @@
 
 from __future__ import annotations
 from cli_chess.__metadata__ import __version__
-from cli_chess.utils.ui_common import handle_mouse_click, exit_app, get_custom_style
-from cli_chess.utils import is_windows_os, default, log
+from cli_chess.utils.ui_common import handle_mouse_click, exit_app, get_combined_style, get_view_state, DEFAULT_STYLE
+from cli_chess.utils import is_windows_os, log, ui_dispatcher, event_tracer
 from cli_chess.utils.config import terminal_config
 from prompt_toolkit.application import Application
 from prompt_toolkit.patch_stdout import patch_stdout
-from prompt_toolkit.layout import Layout, Window, Container, FormattedTextControl, VSplit, HSplit, VerticalAlign, WindowAlign, D
+from prompt_toolkit.layout import Window, Container, FormattedTextControl, VSplit, HSplit, VerticalAlign, WindowAlign, D
 from prompt_toolkit.formatted_text import StyleAndTextTuples
 from prompt_toolkit.key_binding import KeyBindings, merge_key_bindings
 from prompt_toolkit.keys import Keys
+from prompt_toolkit.filters import Condition
 from prompt_toolkit.widgets import Box
-from prompt_toolkit.styles import Style, merge_styles
+from prompt_toolkit.styles import BaseStyle
 from prompt_toolkit import print_formatted_text, HTML
 try:
     from prompt_toolkit.output.win32 import NoConsoleScreenBufferError  # noqa
@@ -43,15 +44,15 @@ class MainView:
         try:
             self.presenter = presenter
             self.color_depth = terminal_config.get_value(terminal_config.Keys.TERMINAL_COLOR_DEPTH)
+            self._global_key_bindings = self._create_global_key_bindings()
             self._container = self._create_main_container()
 
             self.app = Application(
-                layout=Layout(self._container),
+                layout=get_view_state(self)[0],
                 color_depth=lambda: self.color_depth,
                 mouse_support=True,
                 full_screen=True,
                 style=self._get_combined_styles(),
-                refresh_interval=0.5
             )
 
             global main_view
@@ -63,7 +64,12 @@ class MainView:
     def run(self) -> None:
         """Runs the main application"""
         with patch_stdout():
-            self.app.run()
+            try:
+                # Rather than redrawing on an interval, the UI is redrawn
+                # on model updates (which are dispatched to the UI loop)
+                self.app.run(pre_run=lambda: ui_dispatcher.attach(invalidate=self.app.invalidate))
+            finally:
+                ui_dispatcher.detach()
 
     def _create_main_container(self):
         """Creates the container for the main view"""
@@ -114,8 +120,12 @@ class MainView:
 
         return merge_key_bindings([main_view_fb_key_bindings, main_menu_fb_key_bindings])
 
-    def get_global_key_bindings(self) -> KeyBindings():
+    def get_global_key_bindings(self) -> KeyBindings:
         """Returns the global key bindings to be used application wide"""
+        return self._global_key_bindings
+
+    def _create_global_key_bindings(self) -> KeyBindings:
+        """Creates the global key bindings. These are built once and shared by all views"""
         bindings = KeyBindings()
 
         # Global binding to refresh style
@@ -123,14 +133,19 @@ class MainView:
         def _(event): # noqa
             log.info("Requested application style refresh")
             self.app.style = self._get_combined_styles(hot_swap=True)
+
+        # Global binding to write the event tracing results to the log (when tracing)
+        @bindings.add(Keys.ControlT, eager=True, is_global=True, filter=Condition(lambda: event_tracer.enabled))
+        def _(event): # noqa
+            event_tracer.dump()
         return bindings
 
-    def _get_combined_styles(self, hot_swap=False) -> "_MergedStyle":  # noqa: F821
+    def _get_combined_styles(self, hot_swap=False) -> BaseStyle:
         """Combines the cli-chess default style with a user
            supplied custom style and returns the result
         """
         try:
-            return merge_styles([Style.from_dict(default), Style.from_dict(get_custom_style())])
+            return get_combined_style()
         except Exception as e:
             log.critical(f"Error parsing custom style: {e}")
             if not hot_swap:
@@ -138,7 +153,7 @@ class MainView:
                 exit(1)
 
             log.info("Ignoring invalid custom style and using default instead")
-            return Style.from_dict(default)
+            return DEFAULT_STYLE
 
     def print_error_to_terminal(self, msg: str, title="Error", ):
         """Prints an error to the terminal. This will only print
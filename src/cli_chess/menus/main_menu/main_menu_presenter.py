@@ -20,6 +20,8 @@ from cli_chess.menus.online_games_menu import OnlineGamesMenuModel, OnlineGamesM
 from cli_chess.menus.offline_games_menu import OfflineGamesMenuModel, OfflineGamesMenuPresenter
 from cli_chess.menus.settings_menu import SettingsMenuModel, SettingsMenuPresenter
 from cli_chess.modules.about import AboutPresenter
+from cli_chess.modules.token_manager.token_manager_model import g_token_manager_model, INVALID_TOKEN_ERROR
+from cli_chess.core.api.token_scopes import required_token_scopes
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.menus.main_menu import MainMenuModel
@@ -37,3 +39,17 @@ class MainMenuPresenter(MenuPresenter):
         self.selection = self.model.get_menu_options()[0].option
 
         super().__init__(self.model, self.view)
+
+    @staticmethod
+    def get_token_validation_status() -> str:
+        """Returns the status of the Lichess API token validation, or an
+           empty string if no validation is pending or has failed
+        """
+        if g_token_manager_model.validation_pending:
+            return "Validating your Lichess API token..."
+        if g_token_manager_model.validation_error == INVALID_TOKEN_ERROR:
+            return (f"{g_token_manager_model.validation_error}.\n"
+                    f"Scopes required: {', '.join(sorted(required_token_scopes))}")
+        if g_token_manager_model.validation_error:
+            return f"{g_token_manager_model.validation_error}."
+        return ""
@@ -24,7 +24,7 @@ from prompt_toolkit.keys import Keys
 from prompt_toolkit.formatted_text import StyleAndTextTuples
 from prompt_toolkit.key_binding.bindings.focus import focus_next, focus_previous
 from prompt_toolkit.filters import Condition, is_done
-from prompt_toolkit.widgets import Box, TextArea
+from prompt_toolkit.widgets import Box, TextArea, Label
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.menus.main_menu import MainMenuPresenter
@@ -46,6 +46,13 @@ class MainMenuView(MenuView):
                     filter=~is_done
                     & Condition(lambda: self.presenter.selection == MainMenuOptions.OFFLINE_GAMES)
                 ),
+                ConditionalContainer(
+                    Label(self.presenter.get_token_validation_status),
+                    filter=~is_done
+                    & Condition(lambda: self.presenter.selection == MainMenuOptions.ONLINE_GAMES)
+                    & ~Condition(api_is_ready)
+                    & Condition(lambda: bool(self.presenter.get_token_validation_status()))
+                ),
                 ConditionalContainer(
                     TextArea(
                         "Missing API Token or API client unavailable.\n"
@@ -57,6 +64,7 @@ class MainMenuView(MenuView):
                     filter=~is_done
                     & Condition(lambda: self.presenter.selection == MainMenuOptions.ONLINE_GAMES)
                     & ~Condition(api_is_ready)
+                    & ~Condition(lambda: bool(self.presenter.get_token_validation_status()))
                 ),
                 ConditionalContainer(
                     Box(self.presenter.online_games_menu_presenter.view, padding=0, padding_right=1),
@@ -58,12 +58,12 @@ class ProgramSettingsMenuModel(MultiValueMenuModel):
     @staticmethod
     def save_selected_game_config_setting(key: game_config.Keys, enabled: bool):
         """Saves the selected option in the game configuration"""
-        game_config.set_value(key, str(enabled))
+        game_config.set_value(key, str(enabled), debounce=True)
 
     @staticmethod
     def save_terminal_color_depth_setting(depth: str):
         """Saves the selected option in the terminal configuration"""
         if depth in VALID_COLOR_DEPTHS:
-            terminal_config.set_value(terminal_config.Keys.TERMINAL_COLOR_DEPTH, depth)
+            terminal_config.set_value(terminal_config.Keys.TERMINAL_COLOR_DEPTH, depth, debounce=True)
         else:
             log.error(f"Invalid color depth value: {depth}")
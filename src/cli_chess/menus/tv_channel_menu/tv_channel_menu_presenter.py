@@ -16,7 +16,9 @@
 from __future__ import annotations
 from cli_chess.menus import MenuPresenter
 from cli_chess.menus.tv_channel_menu import TVChannelMenuView
-from cli_chess.core.game.online_game.watch_tv import start_watching_tv
+from cli_chess.core.game.online_game.watch_tv import start_watching_tv, start_tv_wall
+from cli_chess.core.game.online_game.watch_tv.tv_wall_model import DEFAULT_TV_WALL_SIZE
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.menus.tv_channel_menu import TVChannelMenuModel
@@ -32,3 +34,11 @@ class TVChannelMenuPresenter(MenuPresenter):
     def handle_start_watching_tv(self) -> None:
         """Changes the view to start watching tv"""
         start_watching_tv(self.selection)
+
+    def handle_start_tv_wall(self) -> None:
+        """Changes the view to watch the selected channel
+           along with the channels following it on a TV wall
+        """
+        channels = list(TVChannelMenuOptions)
+        start = channels.index(self.selection)
+        start_tv_wall([channels[(start + i) % len(channels)] for i in range(DEFAULT_TV_WALL_SIZE)])
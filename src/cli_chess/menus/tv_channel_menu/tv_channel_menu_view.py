@@ -45,12 +45,16 @@ class TVChannelMenuView(MenuView):
         return [
             ("class:function-bar.key", "F1", handle_mouse_click(self.presenter.handle_start_watching_tv)),
             ("class:function-bar.label", f"{'Watch channel':<14}", handle_mouse_click(self.presenter.handle_start_watching_tv)),
+            ("class:function-bar.spacer", " "),
+            ("class:function-bar.key", "F2", handle_mouse_click(self.presenter.handle_start_tv_wall)),
+            ("class:function-bar.label", f"{'Watch wall':<14}", handle_mouse_click(self.presenter.handle_start_tv_wall)),
         ]
 
     def get_function_bar_key_bindings(self) -> KeyBindings:
         """Returns the function bar key bindings to use for the tv menu"""
         bindings = KeyBindings()
         bindings.add(Keys.F1)(handle_bound_key_pressed(self.presenter.handle_start_watching_tv))
+        bindings.add(Keys.F2)(handle_bound_key_pressed(self.presenter.handle_start_tv_wall))
         return bindings
 
     def __pt_container__(self) -> Container:
@@ -96,7 +96,7 @@ class BoardModel:
             self.highlight_move = move
 
             if notify:
-                log.debug(f"Made move ({move})")
+                log.debug("Made move (%s)", move)
                 self._notify_board_model_updated(isGameOver=self.is_game_over(), successfulMoveMade=True)
         except Exception as e:
             log.error(e)
@@ -144,9 +144,39 @@ class BoardModel:
                 raise e
 
         if move_list:
-            log.debug(f"Updated board with moves from list. Last move played: {move_list[-1]}")
+            log.debug("Updated board with moves from list. Last move played: %s", move_list[-1])
             self._notify_board_model_updated(successfulMoveMade=True)
 
+    def sync_moves(self, move_list: list) -> None:
+        """Brings the board in line with the provided list of UCI moves played
+           from the initial position. Only the moves which differ from the move
+           stack are taken back and made, rather than replaying the whole game.
+           Raises a ValueError on an illegal move.
+        """
+        move_stack = self.board.move_stack
+        synced = 0
+        while synced < min(len(move_stack), len(move_list)) and move_stack[synced].uci() == move_list[synced]:
+            synced += 1
+
+        if synced == len(move_stack) == len(move_list):
+            return
+
+        if synced < len(move_stack):
+            self._game_over_result = None
+            for _ in range(len(move_stack) - synced):
+                self.board.pop()
+
+        for move in move_list[synced:]:
+            try:
+                self.make_move(move, notify=False)
+            except Exception as e:
+                log.error(f"Exception caught while syncing moves: {e}")
+                raise e
+
+        self.highlight_move = self.board.peek() if self.board.move_stack else chess.Move.null()
+        log.debug("Synced board moves. Kept %d of %d moves", synced, len(move_list))
+        self._notify_board_model_updated(successfulMoveMade=True)
+
     def takeback(self, caller_color: chess.Color):
         """Issues a takeback, so it's the callers move again. Raises a Warning if the move
            stack is empty or takeback of opponents move is attempted.
@@ -208,7 +238,7 @@ class BoardModel:
            If notify is false, a model update notification will not be sent.
         """
         self.orientation = color
-        log.debug(f"Board orientation set to {chess.COLOR_NAMES[self.orientation].upper()}")
+        log.debug("Board orientation set to %s", chess.COLOR_NAMES[self.orientation].upper())
 
         if notify:
             self._notify_board_model_updated(boardOrientationChanged=True)
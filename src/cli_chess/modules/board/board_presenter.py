@@ -27,11 +27,10 @@ if TYPE_CHECKING:
 class BoardPresenter:
     def __init__(self, model: BoardModel) -> None:
         self.model = model
-        self.game_config_values = game_config.get_all_values()
         self.view = BoardView(self, self.get_board_display())
 
-        self.model.e_board_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self._update_cached_config_values)
+        self.model.e_board_model_updated.add_listener(self.update, ui=True)
+        game_config.e_game_config_updated.add_listener(self.update, ui=True, weak=True)
 
     def update(self, **kwargs) -> None: # noqa
         """Updates the board output"""
@@ -39,15 +38,6 @@ class BoardPresenter:
         #       This would allow for this update function to be removed
         self.view.update(self.get_board_display())
 
-    def _update_cached_config_values(self):
-        """Updates the 'game_config_values' variable with the
-           latest configuration values from the game_config. Additionally,
-           this will notify the board_view to update as there has been a change.
-           This function is called automatically on game config updates
-        """
-        self.game_config_values = game_config.get_all_values()
-        self.update()
-
     def make_move(self, move: str) -> None:
         """Sends a move to the board model to attempt to make.
            Raises a ValueError on invalid moves. See model for specifics.
@@ -85,7 +75,7 @@ class BoardPresenter:
            is disabled in the configuration.
         """
         file_labels = ""
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES]
+        show_board_coordinates = game_config.get_snapshot().show_board_coordinates
 
         if show_board_coordinates:
             file_labels = self.model.get_file_labels()
@@ -98,7 +88,7 @@ class BoardPresenter:
         """
         rank_label = ""
         rank_index = self.model.get_square_rank_index(square)
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES]
+        show_board_coordinates = game_config.get_snapshot().show_board_coordinates
 
         if self.is_square_start_of_rank(square) and show_board_coordinates:
             rank_label = self.model.get_rank_label(rank_index)
@@ -136,8 +126,9 @@ class BoardPresenter:
         piece = self.model.board.piece_at(square)
         piece_str = ""
 
-        blindfold_chess = self.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-        use_unicode_pieces = self.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
+        config = game_config.get_snapshot()
+        blindfold_chess = config.blindfold_chess
+        use_unicode_pieces = config.use_unicode_pieces
 
         if piece and not blindfold_chess:
             piece_str = get_piece_unicode_symbol(piece.symbol()) if use_unicode_pieces else piece.symbol().upper()
@@ -168,7 +159,7 @@ class BoardPresenter:
         else:
             square_color = "dark-square"
 
-        show_board_highlights = self.game_config_values[game_config.Keys.SHOW_BOARD_HIGHLIGHTS]
+        show_board_highlights = game_config.get_snapshot().show_board_highlights
         if show_board_highlights:
             try:
                 last_move = self.model.get_highlight_move()
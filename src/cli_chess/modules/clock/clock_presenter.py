@@ -15,43 +15,113 @@
 
 from __future__ import annotations
 from cli_chess.modules.clock import ClockView
+from cli_chess.utils.event import ui_dispatcher
 from chess import Color, COLOR_NAMES
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from time import monotonic
+from weakref import WeakMethod
+from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.core.game import GameModelBase
+    from asyncio import TimerHandle
+
+# Ticks are scheduled just past the point the display changes
+TICK_MARGIN_SECONDS = 0.01
 
 
 class ClockPresenter:
+    # The game model update topics the clock is updated on
+    update_topics = frozenset(("boardOrientationChanged", "successfulMoveMade", "onlineGameOver", "tvPositionUpdated"))
+
     def __init__(self, model: GameModelBase):
         self.model = model
+        self._tick_handle: Optional[TimerHandle] = None
 
         orientation = self.model.board_model.get_board_orientation()
         self.view_upper = ClockView(self, self.get_clock_display(not orientation))
         self.view_lower = ClockView(self, self.get_clock_display(orientation))
 
-        self.model.e_game_model_updated.add_listener(self.update)
+        self.model.e_game_model_updated.add_listener(self.update, ui=True, topics=self.update_topics)
 
     def update(self, **kwargs) -> None:
         """Updates the view based on specific model updates"""
-        if 'boardOrientationChanged' in kwargs or 'successfulMoveMade' in kwargs or 'onlineGameOver' in kwargs or 'tvPositionUpdated' in kwargs:
-            orientation = self.model.board_model.get_board_orientation()
-            self.view_upper.update(self.get_clock_display(not orientation))
-            self.view_lower.update(self.get_clock_display(orientation))
+        if not self.update_topics.isdisjoint(kwargs):
+            self._update_views()
 
-    def get_clock_display(self, color: Color) -> str:
-        """Returns the formatted clock display for the color passed in"""
+    def stop(self) -> None:
+        """Stops the clock from ticking (e.g. when the game view is exited)"""
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+    def _update_views(self) -> None:
+        """Updates both clock views and schedules the next tick"""
+        orientation = self.model.board_model.get_board_orientation()
+        self.view_upper.update(self.get_clock_display(not orientation))
+        self.view_lower.update(self.get_clock_display(orientation))
+        self._schedule_tick()
+
+    def _schedule_tick(self) -> None:
+        """Schedules the views to be updated when the display of the clock
+           counting down changes. Nothing is scheduled while no clock is
+           counting down, so the UI isn't redrawn while the clocks are idle.
+        """
+        self.stop()
+        interval = self.get_tick_interval()
+        if interval is not None:
+            tick = WeakMethod(self._tick)  # Ticks don't keep the presenter alive
+
+            def _tick() -> None:
+                method = tick()
+                if method is not None:
+                    method()
+
+            self._tick_handle = ui_dispatcher.call_later(interval, _tick)
+
+    def _tick(self) -> None:
+        self._tick_handle = None
+        self._update_views()
+
+    def get_tick_interval(self) -> Optional[float]:
+        """Returns the number of seconds until the display of the clock counting
+           down changes, or None if no clock is counting down. The clock is
+           displayed to the second, so this is at most a second.
+        """
+        counting_color = self._get_counting_color()
+        if counting_color is None:
+            return None
+
+        remaining = self.get_remaining_seconds(counting_color)
+        if remaining is None or remaining <= 0:
+            return None
+        return (remaining % 1 or 1.0) + TICK_MARGIN_SECONDS
+
+    def get_remaining_seconds(self, color: Color) -> Optional[float]:
+        """Returns the number of seconds left on the clock of the passed in
+           color, including the time elapsed since the clock was last updated
+           if it's counting down. Returns None if the clock isn't set.
+        """
         clock_data = self.model.game_metadata.get('clock')
-        units = clock_data.get('units')
         time = clock_data.get(COLOR_NAMES[color]).get('time')
-
         if not time:
-            return "--:--"
+            return None
 
-        if not isinstance(time, datetime):
-            if units == "ms":
-                time = datetime.fromtimestamp(time / 1000, timezone.utc)
-            elif units == "sec":
-                time = datetime.fromtimestamp(time, timezone.utc)
+        seconds = time / 1000 if clock_data.get('units') == "ms" else time
+        if color == self._get_counting_color():
+            seconds -= monotonic() - clock_data.get('updated', 0.0)
+        return max(0.0, seconds)
+
+    def _get_counting_color(self) -> Optional[Color]:
+        """Returns the color whose clock is counting down, or None"""
+        if self.model.game_metadata.get('clock').get('running'):
+            return self.model.board_model.board.turn
+        return None
+
+    def get_clock_display(self, color: Color) -> str:
+        """Returns the formatted clock display for the color passed in"""
+        seconds = self.get_remaining_seconds(color)
+        if seconds is None:
+            return "--:--"
 
+        time = datetime.fromtimestamp(seconds, timezone.utc)
         return time.strftime("%M:%S") if not time.hour else time.strftime("%H:%M:%S")
@@ -88,7 +88,7 @@ class EngineModel:
                 raise Warning("Engine is not running")
             raise
 
-        log.debug(f"Returning {result}")
+        log.debug("Returning %s", result)
         return result
 
     def quit_engine(self) -> None:
@@ -33,8 +33,8 @@ class MaterialDifferencePresenter:
         self.view_upper = MaterialDifferenceView(self, self.format_diff_output(not orientation), self.show_diff)
         self.view_lower = MaterialDifferenceView(self, self.format_diff_output(orientation), self.show_diff)
 
-        self.model.e_material_difference_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self.update)
+        self.model.e_material_difference_model_updated.add_listener(self.update, ui=True)
+        game_config.e_game_config_updated.add_listener(self.update, ui=True, weak=True)
 
     def update(self) -> None:
         """Updates the material differences for both sides"""
@@ -46,8 +46,9 @@ class MaterialDifferencePresenter:
         """Returns the formatted difference of the color passed in as a string"""
         output = ""
         material_difference = self.model.get_material_difference(color)
-        use_unicode = game_config.get_boolean(game_config.Keys.SHOW_MATERIAL_DIFF_IN_UNICODE)
-        pad_unicode = game_config.get_boolean(game_config.Keys.PAD_UNICODE)
+        config = game_config.get_snapshot()
+        use_unicode = config.show_material_diff_in_unicode
+        pad_unicode = config.pad_unicode
 
         if self.is_crazyhouse:
             return self._get_crazyhouse_pocket_output(color, use_unicode, pad_unicode)
@@ -28,8 +28,8 @@ class MoveListPresenter:
         self.model = model
         self.view = MoveListView(self)
 
-        self.model.e_move_list_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self.update)
+        self.model.e_move_list_model_updated.add_listener(self.update, ui=True)
+        game_config.e_game_config_updated.add_listener(self.update, ui=True, weak=True)
 
     def update(self) -> None:
         """Update the move list output"""
@@ -39,8 +39,9 @@ class MoveListPresenter:
         """Returns a list containing the formatted moves"""
         formatted_move_list = []
         move_list_data = self.model.get_move_list_data()
-        use_unicode = game_config.get_boolean(game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE)
-        pad_unicode = game_config.get_boolean(game_config.Keys.PAD_UNICODE)
+        config = game_config.get_snapshot()
+        use_unicode = config.show_move_list_in_unicode
+        pad_unicode = config.pad_unicode
 
         for entry in move_list_data:
             move = self.get_move_as_unicode(entry, pad_unicode) if use_unicode else (entry['move'])
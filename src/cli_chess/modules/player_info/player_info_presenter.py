@@ -22,6 +22,9 @@ if TYPE_CHECKING:
 
 
 class PlayerInfoPresenter:
+    # The game model update topics the player info is updated on
+    update_topics = frozenset(("boardOrientationChanged", "onlineGameOver"))
+
     def __init__(self, model: GameModelBase):
         self.model = model
 
@@ -29,11 +32,11 @@ class PlayerInfoPresenter:
         self.view_upper = PlayerInfoView(self, self.get_player_info(not orientation))
         self.view_lower = PlayerInfoView(self, self.get_player_info(orientation))
 
-        self.model.e_game_model_updated.add_listener(self.update)
+        self.model.e_game_model_updated.add_listener(self.update, ui=True, topics=self.update_topics)
 
     def update(self, **kwargs) -> None:
         """Updates the view based on specific model updates"""
-        if 'boardOrientationChanged' in kwargs or 'onlineGameOver' in kwargs:
+        if not self.update_topics.isdisjoint(kwargs):
             orientation = self.model.board_model.get_board_orientation()
             self.view_upper.update(self.get_player_info(not orientation))
             self.view_lower.update(self.get_player_info(orientation))
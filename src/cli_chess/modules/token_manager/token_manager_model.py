@@ -13,10 +13,22 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from cli_chess.core.api.rate_limiter import rate_limiter
 from cli_chess.utils.config import lichess_config
 from cli_chess.utils import Event, log, threaded
 from berserk import Client, TokenSession
+from typing import Optional
 import berserk.exceptions
+import threading
+import hashlib
+import time
+
+# How long the scopes of a validated token are trusted before
+# the token is validated with Lichess again on startup
+TOKEN_VALIDATION_TTL_SECONDS = 24 * 60 * 60
+
+INVALID_TOKEN_ERROR = "Invalid API token or missing required scopes"
+TOKEN_CONNECTION_ERROR = "Unable to reach Lichess to validate your API token"
 
 linked_token_scopes = set()
 
@@ -24,44 +36,145 @@ linked_token_scopes = set()
 class TokenManagerModel:
     def __init__(self):
         self.linked_account = ""
+        self.validation_pending = False
+        self.validation_error = ""
+        self._validation_id = 0
+        self._validation_lock = threading.Lock()
         self.e_token_manager_model_updated = Event()
 
-    @threaded
     def validate_existing_linked_account(self) -> None:
         """Queries the Lichess config file for an existing token. If a token
-           exists, verification is attempted. Invalid data will be cleared.
+           exists, verification is attempted in the background. Invalid data
+           will be cleared.
+        """
+        existing_token = lichess_config.get_value(lichess_config.Keys.API_TOKEN)
+        if existing_token:
+            self._start_validation()
+            self._validate_existing_token(existing_token, self._validation_id)
+
+    def update_linked_account_async(self, api_token: str) -> None:
+        """Runs `update_linked_account()` in the background so the caller (e.g. the
+           UI on startup) isn't blocked by the request. Any validation in progress is
+           superseded by this one. On failure `validation_error` is set.
         """
+        self._start_validation()
+        self._update_linked_account(api_token, self._validation_id)
+
+    @threaded
+    def _validate_existing_token(self, existing_token: str, validation_id: int) -> None:
         try:
-            existing_token = lichess_config.get_value(lichess_config.Keys.API_TOKEN)
-            account = self.validate_token(existing_token)
-            if account:
-                self.save_account_data(api_token=existing_token, account_data=account, valid=True)
-            else:
-                self.save_account_data(api_token="", account_data={})
+            account = self._validate_token_cached(existing_token)
+            with self._validation_lock:
+                if validation_id != self._validation_id:
+                    return
+                if account:
+                    self.save_account_data(api_token=existing_token, account_data=account, valid=True)
+                else:
+                    self.save_account_data(api_token="", account_data={})
         except Exception as e:
             # Rather than the token being invalid, this means there was a
             # connection problem. Ignore so the existing token is not overridden.
             if not isinstance(e, berserk.exceptions.ApiError):
                 log.error(f"Unexpected exception caught: {e}")
+        finally:
+            self._finish_validation(validation_id)
+
+    @threaded
+    def _update_linked_account(self, api_token: str, validation_id: int) -> None:
+        error = ""
+        try:
+            if not self._link_account(api_token, validation_id):
+                error = INVALID_TOKEN_ERROR
+        except Exception as e:
+            # A token rejected by Lichess is invalid, while other errors
+            # (e.g. being offline) say nothing about the token itself
+            log.error(f"Error updating linked account: {e}")
+            error = INVALID_TOKEN_ERROR if _is_token_rejected(e) else TOKEN_CONNECTION_ERROR
+        finally:
+            with self._validation_lock:
+                if error and validation_id == self._validation_id:
+                    self.validation_error = error
+            self._finish_validation(validation_id)
 
-    def update_linked_account(self, api_token: str) -> bool:
+    def update_linked_account(self, api_token: str, validation_id: Optional[int] = None) -> bool:
         """Attempts to update the linked account using the passed in API token.
            If the token is deemed valid, the api token is saved to the Lichess
            configuration. Returns True on success. Existing account data is
            only overwritten on success.
          """
+        try:
+            return self._link_account(api_token, validation_id)
+        except Exception as e:
+            log.error(f"Error updating linked account: {e}")
+            return False
+
+    def _link_account(self, api_token: str, validation_id: Optional[int] = None) -> bool:
+        """Links the account of the passed in API token if it's valid. Returns
+           False if the token is invalid or the validation was superseded.
+           Raises an exception if the token couldn't be validated.
+        """
         if api_token:
-            try:
-                account = self.validate_token(api_token)
-                if account:
+            account = self._validate_token_cached(api_token)
+            if account:
+                with self._validation_lock:
+                    if validation_id is None:
+                        # Supersedes any validation running in the background
+                        self._validation_id += 1
+                        self.validation_pending = False
+                    elif validation_id != self._validation_id:
+                        return False
                     log.info("Updating linked Lichess account")
                     self.save_account_data(api_token=api_token, account_data=account, valid=True)
-                    return True
-            except Exception as e:
-                log.error(f"Error updating linked account: {e}")
-                return False
+                return True
         return False
 
+    def _validate_token_cached(self, api_token: str) -> Optional[dict]:
+        """Returns the account data of the token cached in the configuration when
+           the token was validated within TOKEN_VALIDATION_TTL_SECONDS. Otherwise,
+           the token is validated with Lichess and the result is cached.
+        """
+        account = self._get_cached_account(api_token)
+        if account:
+            global linked_token_scopes
+            linked_token_scopes = set(account['scopes'].split(sep=","))
+            log.info("Using cached Lichess token validation")
+            return account
+
+        account = self.validate_token(api_token)
+        if account:
+            self._cache_account(api_token, account)
+        return account
+
+    @staticmethod
+    def _get_cached_account(api_token: str) -> Optional[dict]:
+        """Returns the cached account data of the passed in token, or
+           None if the token isn't cached or the cache has expired
+        """
+        keys = lichess_config.Keys
+        if not api_token or lichess_config.get_value(keys.VALIDATED_TOKEN_HASH) != _hash_token(api_token):
+            return None
+
+        try:
+            validated_time = float(lichess_config.get_value(keys.VALIDATED_TOKEN_TIME))
+        except ValueError:
+            return None
+
+        from cli_chess.core.api.token_scopes import required_token_scopes
+        scopes = lichess_config.get_value(keys.VALIDATED_TOKEN_SCOPES)
+        if 0 <= time.time() - validated_time < TOKEN_VALIDATION_TTL_SECONDS and set(scopes.split(sep=",")) >= required_token_scopes:
+            return {'scopes': scopes, 'userId': lichess_config.get_value(keys.VALIDATED_TOKEN_USER)}
+        return None
+
+    @staticmethod
+    def _cache_account(api_token: str, account: dict) -> None:
+        """Caches the validated account data of the passed in token"""
+        keys = lichess_config.Keys
+        with lichess_config.batch():
+            lichess_config.set_value(keys.VALIDATED_TOKEN_HASH, _hash_token(api_token))
+            lichess_config.set_value(keys.VALIDATED_TOKEN_USER, account.get('userId') or "")
+            lichess_config.set_value(keys.VALIDATED_TOKEN_SCOPES, account.get('scopes') or "")
+            lichess_config.set_value(keys.VALIDATED_TOKEN_TIME, str(int(time.time())))
+
     @staticmethod
     def validate_token(api_token: str) -> dict:
         """Validates the proper scopes are available for the passed in token.
@@ -69,6 +182,7 @@ class TokenManagerModel:
         """
         if api_token:
             session = TokenSession(api_token)
+            rate_limiter.install(session)
             oauth_client = Client(session).oauth
             try:
                 token_data = oauth_client.test_tokens(api_token)
@@ -78,7 +192,7 @@ class TokenManagerModel:
                     for scope in token_data[api_token]['scopes'].split(sep=","):
                         found_scopes.add(scope)
 
-                    from cli_chess.core.api.api_manager import required_token_scopes
+                    from cli_chess.core.api.token_scopes import required_token_scopes
                     if found_scopes >= required_token_scopes:
                         global linked_token_scopes
                         linked_token_scopes.clear()
@@ -113,9 +227,37 @@ class TokenManagerModel:
             from cli_chess.core.api.api_manager import _start_api  # noqa
             _start_api(api_token)
 
+    def _start_validation(self) -> None:
+        """Marks a new validation as pending, superseding any in progress"""
+        with self._validation_lock:
+            self._validation_id += 1
+            self.validation_pending = True
+            self.validation_error = ""
+        self._notify_token_manager_model_updated()
+
+    def _finish_validation(self, validation_id: int) -> None:
+        """Clears the pending state if the passed in validation is the latest"""
+        with self._validation_lock:
+            if validation_id != self._validation_id:
+                return
+            self.validation_pending = False
+        self._notify_token_manager_model_updated()
+
     def _notify_token_manager_model_updated(self) -> None:
         """Notifies listeners of token manager model updates"""
         self.e_token_manager_model_updated.notify()
 
 
+def _is_token_rejected(e: Exception) -> bool:
+    """Returns True if the exception is Lichess rejecting the token (unauthorized or forbidden)"""
+    return isinstance(e, berserk.exceptions.ResponseError) and e.status_code in (401, 403)
+
+
+def _hash_token(api_token: str) -> str:
+    """Returns the hash identifying a token in the validation cache,
+       so a copy of the token itself isn't stored
+    """
+    return hashlib.sha256(api_token.strip().encode("utf-8")).hexdigest()
+
+
 g_token_manager_model = TokenManagerModel()
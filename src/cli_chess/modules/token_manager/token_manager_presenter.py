@@ -16,6 +16,7 @@
 from __future__ import annotations
 from cli_chess.modules.token_manager import TokenManagerView
 from cli_chess.utils.common import open_url_in_browser
+from cli_chess.utils.ui_common import repaint_ui
 from cli_chess.core.api.api_manager import API_TOKEN_CREATION_URL
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -26,12 +27,13 @@ class TokenManagerPresenter:
     def __init__(self, model: TokenManagerModel):
         self.model = model
         self.view = TokenManagerView(self)
-        self.model.e_token_manager_model_updated.add_listener(self.update)
+        self.model.e_token_manager_model_updated.add_listener(self.update, ui=True)
         self.model.validate_existing_linked_account()
 
     def update(self):
         """Updates the token manager view"""
         self.view.lichess_username = self.model.linked_account
+        repaint_ui()
 
     def update_linked_account(self, api_token: str) -> bool:
         """Calls the model to test api token validity. If the token is
@@ -0,0 +1,43 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.tests.fake_lichess import FakeLichessServer
+from cli_chess.core.api.rate_limiter import rate_limiter
+from berserk import Client, TokenSession
+import pytest
+
+
+@pytest.fixture
+def fake_lichess():
+    """A local stand-in for the Lichess API. Tests using
+       this must be marked with `pytest.mark.enable_socket`
+    """
+    with FakeLichessServer() as server:
+        yield server
+
+
+@pytest.fixture
+def api_client(fake_lichess: FakeLichessServer, monkeypatch):
+    """An API client pointed at the fake Lichess server which is used
+       in place of the api_manager client. Its requests go through the
+       shared rate limiter, which is reset after the test.
+    """
+    session = TokenSession("lip_unitTest")
+    rate_limiter.install(session)
+    client = Client(session, base_url=fake_lichess.url)
+    monkeypatch.setattr('cli_chess.core.api.api_manager.api_client', client, raising=False)
+    yield client
+    session.close()
+    rate_limiter.reset()
@@ -0,0 +1,66 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api.api_stream import ApiStream, get_live_stream_count
+from cli_chess.tests.fake_lichess import FakeLichessServer, events
+from berserk import models
+from berserk.exceptions import ResponseError
+from datetime import datetime
+from time import perf_counter
+import threading
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+STREAM_PATH = "/api/stream/game/TvGame01"
+
+
+def test_stream_events(api_client, fake_lichess: FakeLichessServer):
+    fake_lichess.set_stream(STREAM_PATH, [events.game_state(["e2e4"]), None, events.game_state(["e2e4", "e7e5"])])
+    stream = ApiStream(api_client, STREAM_PATH, converter=models.GameState.convert)
+
+    received = list(stream)
+    assert [event['moves'] for event in received] == ["e2e4", "e2e4 e7e5"]
+    assert isinstance(received[0]['wtime'], datetime)
+    assert stream.closed
+    assert get_live_stream_count() == 0
+
+
+def test_close_from_another_thread(api_client, fake_lichess: FakeLichessServer):
+    # The stream stays open with no further events
+    fake_lichess.set_stream(STREAM_PATH, [events.tv_description("TvGame01")], keep_open=True)
+    stream = ApiStream(api_client, STREAM_PATH)
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(stream))
+    reader.start()
+    assert fake_lichess.wait_for_stream(STREAM_PATH)
+    assert get_live_stream_count() == 1
+
+    start = perf_counter()
+    stream.close()
+    reader.join(timeout=5)
+    assert not reader.is_alive()
+    assert perf_counter() - start < 1
+    assert len(received) == 1
+    assert get_live_stream_count() == 0
+
+    # A closed stream doesn't reopen
+    assert list(stream) == []
+
+
+def test_error_response(api_client, fake_lichess: FakeLichessServer):
+    with pytest.raises(ResponseError) as e:
+        list(ApiStream(api_client, "/api/stream/game/Missing1"))
+    assert e.value.status_code == 404
+    assert get_live_stream_count() == 0
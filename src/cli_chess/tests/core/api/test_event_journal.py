@@ -0,0 +1,122 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api import GameStateDispatcher
+from cli_chess.core.api.event_journal import (start_event_journal, stop_event_journal, journal_event,
+                                              load_journal, JournalReplayClient, SOURCE_GSD)
+from cli_chess.tests.fake_lichess import FakeLichessServer, events
+from cli_chess.tests.fake_lichess.load_harness import run_tv_load_test, run_journal_replay
+from datetime import datetime, timezone
+from time import perf_counter
+from unittest.mock import Mock
+import pytest
+
+GAME_ID = "TestGame"
+
+
+@pytest.fixture
+def journal_file(tmp_path):
+    yield str(tmp_path / "journal.ndjson")
+    stop_event_journal()
+
+
+def test_record_and_load(journal_file: str):
+    # Nothing is recorded until a journal is started
+    journal_event(SOURCE_GSD, GAME_ID, {"type": "ignored"})
+
+    start_event_journal(journal_file)
+    journal_event(SOURCE_GSD, "first", {"type": "gameState"})
+    start_event_journal(journal_file)  # Appends a new session
+    created_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    journal_event(SOURCE_GSD, GAME_ID, {"type": "gameFull", "createdAt": created_at})
+    journal_event("tv", "TvGame01", {"fen": "8/8/8/8/8/8/8/8 w"}, channel="Blitz")
+    stop_event_journal()
+
+    assert [entry['key'] for entry in load_journal(journal_file, session=0)] == ["first"]
+    entries = load_journal(journal_file)
+    assert [entry['src'] for entry in entries] == [SOURCE_GSD, "tv"]
+    assert entries[0]['event'] == {"type": "gameFull", "createdAt": 1672531200000}
+    assert entries[1]['channel'] == "Blitz"
+    assert 0 <= entries[0]['t'] <= entries[1]['t']
+
+
+def test_buffered_writes(journal_file: str, monkeypatch):
+    register = Mock()
+    monkeypatch.setattr('cli_chess.core.api.event_journal.atexit.register', register)
+    monkeypatch.setattr('cli_chess.core.api.event_journal._close_at_exit', False)
+    monkeypatch.setattr('cli_chess.core.api.event_journal.JOURNAL_FLUSH_INTERVAL', 60)
+
+    # Events are buffered until the flush interval passes or the journal is flushed
+    journal = start_event_journal(journal_file)
+    journal_event(SOURCE_GSD, GAME_ID, {"type": "gameFull"})
+    with open(journal_file) as f:
+        assert f.read() == ""
+    journal.flush()
+    assert [entry['key'] for entry in load_journal(journal_file)] == [GAME_ID]
+
+    monkeypatch.setattr('cli_chess.core.api.event_journal.JOURNAL_FLUSH_INTERVAL', 0)
+    journal_event(SOURCE_GSD, "second", {"type": "gameState"})
+    assert len(load_journal(journal_file)) == 2
+
+    # The journal is closed on exit
+    start_event_journal(journal_file)
+    register.assert_called_once_with(stop_event_journal)
+
+
+def test_replay_speed():
+    entries = [{'t': 10.0, 'src': "iem", 'key': "", 'event': {"type": "gameStart"}},
+               {'t': 10.5, 'src': "iem", 'key': "", 'event': {"type": "gameFinish"}}]
+
+    start = perf_counter()
+    assert [e['type'] for e in JournalReplayClient(entries, speed=10).board.stream_incoming_events()] == ["gameStart", "gameFinish"]
+    assert 0.05 <= perf_counter() - start < 0.5
+
+    # Non-stream requests are ignored
+    assert JournalReplayClient(entries).board.make_move(GAME_ID, "e2e4") == {}
+
+
+@pytest.mark.enable_socket
+def test_replay_matches_live_stream(journal_file: str, api_client, fake_lichess: FakeLichessServer, monkeypatch):
+    moves = events.random_game_moves(10)
+    fake_lichess.set_stream(f"/api/board/game/stream/{GAME_ID}", events.played_game_events(GAME_ID, moves) + [events.chat_line("gg")])
+
+    start_event_journal(journal_file)
+    live_listener = Mock()
+    gsd = GameStateDispatcher(GAME_ID)
+    gsd.subscribe_to_events(live_listener)
+    gsd.run()
+    stop_event_journal()
+
+    entries = load_journal(journal_file)
+    assert len(entries) == len(moves) + 3
+
+    monkeypatch.setattr('cli_chess.core.api.api_manager.api_client', JournalReplayClient(entries, speed=0))
+    replay_listener = Mock()
+    gsd = GameStateDispatcher(GAME_ID)
+    gsd.subscribe_to_events(replay_listener)
+    gsd.run()
+
+    assert replay_listener.call_args_list == live_listener.call_args_list
+
+
+@pytest.mark.enable_socket
+def test_tv_journal_replay(journal_file: str):
+    start_event_journal(journal_file)
+    live = run_tv_load_test(move_count=15, interval=0.001, timeout=10)
+    stop_event_journal()
+
+    replay = run_journal_replay(journal_file, speed=0, timeout=10)
+    assert replay.events_sent == live.events_sent == 15
+    assert 0 < replay.renders <= replay.events_sent
@@ -0,0 +1,234 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api import GameStateDispatcher
+from cli_chess.core.api.game_state_dispatcher import BOARD_API_RETRY_POLICY
+from cli_chess.core.api.rate_limiter import RateLimitTimeout
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+from cli_chess.utils import RetryPolicy
+from berserk.exceptions import ResponseError
+from unittest.mock import Mock
+from time import monotonic
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+GAME_ID = "TestGame"
+STREAM_PATH = f"/api/board/game/stream/{GAME_ID}"
+
+
+@pytest.fixture
+def gsd_listener():
+    return Mock()
+
+
+@pytest.fixture
+def gsd(api_client, gsd_listener: Mock):
+    gsd = GameStateDispatcher(GAME_ID)
+    gsd.subscribe_to_events(gsd_listener)
+    return gsd
+
+
+def test_stream_events(gsd: GameStateDispatcher, gsd_listener: Mock, fake_lichess: FakeLichessServer):
+    moves = events.random_game_moves(4)
+    fake_lichess.set_stream(STREAM_PATH, [
+        events.game_full(GAME_ID),
+        None,  # keep-alive
+        events.chat_line("Good luck"),
+        events.opponent_gone(True, claim_win_in_seconds=10),
+        events.game_state(moves[:1]),
+        events.game_state(moves, status="mate", winner="white"),
+        events.chat_line("Not dispatched after game over"),
+    ])
+    gsd.run()
+
+    notified = [call.kwargs for call in gsd_listener.call_args_list]
+    assert len(notified) == 5
+    assert notified[0]['gameFull']['id'] == GAME_ID
+    assert notified[1]['chatLine']['text'] == "Good luck"
+    assert notified[2]['opponentGone']['claimWinInSeconds'] == 10
+    assert notified[3]['gameState']['moves'] == moves[0] and not notified[3]['gameOver']
+    assert notified[4]['gameState']['status'] == "mate" and notified[4]['gameOver']
+
+    # Listeners are removed when the game ends
+    assert not gsd.e_game_state_dispatcher_event.listeners
+
+
+def test_stream_burst(gsd: GameStateDispatcher, gsd_listener: Mock, fake_lichess: FakeLichessServer):
+    # Every event in a burst is dispatched in order
+    moves = events.random_game_moves(60)
+    fake_lichess.set_stream(STREAM_PATH, events.played_game_events(GAME_ID, moves), burst=20)
+    gsd.run()
+
+    states = [call.kwargs['gameState']['moves'] for call in gsd_listener.call_args_list if 'gameState' in call.kwargs]
+    assert len(states) == len(moves) + 1
+    assert states[-2].split() == moves
+
+
+def test_game_commands(gsd: GameStateDispatcher, fake_lichess: FakeLichessServer):
+    for path in (f"/api/board/game/{GAME_ID}/move/e2e4", f"/api/board/game/{GAME_ID}/takeback/yes",
+                 f"/api/board/game/{GAME_ID}/draw/yes", f"/api/board/game/{GAME_ID}/resign"):
+        fake_lichess.set_response("POST", path, {"ok": True})
+
+    gsd.make_move("e2e4")
+    gsd.send_takeback_request()
+    gsd.send_draw_offer()
+    gsd.resign()
+
+    assert [path for method, path, _ in fake_lichess.requests if method == "POST"] == [
+        f"/api/board/game/{GAME_ID}/move/e2e4",
+        f"/api/board/game/{GAME_ID}/takeback/yes",
+        f"/api/board/game/{GAME_ID}/draw/yes",
+        f"/api/board/game/{GAME_ID}/resign",
+    ]
+
+
+def test_game_command_retries(gsd: GameStateDispatcher, fake_lichess: FakeLichessServer, monkeypatch):
+    monkeypatch.setattr('cli_chess.utils.common.sleep', lambda seconds: None)
+    move_path = f"/api/board/game/{GAME_ID}/move/e2e4"
+
+    # Server errors are retried, while rejected moves aren't
+    fake_lichess.set_response("POST", move_path, {"error": "Server error"}, status=500)
+    with pytest.raises(ResponseError):
+        gsd.make_move("e2e4")
+    assert fake_lichess.request_count("POST", move_path) == BOARD_API_RETRY_POLICY.attempts
+
+    fake_lichess.set_response("POST", move_path, {"error": "Not your turn"}, status=400)
+    with pytest.raises(ResponseError):
+        gsd.make_move("e2e4")
+    assert fake_lichess.request_count("POST", move_path) == BOARD_API_RETRY_POLICY.attempts + 1
+
+
+def test_move_deadline(gsd: GameStateDispatcher, fake_lichess: FakeLichessServer):
+    move_path = f"/api/board/game/{GAME_ID}/move/e2e4"
+    fake_lichess.set_response("POST", move_path, {"error": "Too many requests"}, status=429)
+
+    # After a 429 the move isn't retried, as the rate limit pause would outlast our clock
+    start = monotonic()
+    with pytest.raises(ResponseError):
+        gsd.make_move("e2e4", deadline=monotonic() + 1)
+    assert fake_lichess.request_count("POST", move_path) == 1
+    assert monotonic() - start < 1
+
+
+def test_commands_fail_fast_when_rate_limited(gsd: GameStateDispatcher, fake_lichess: FakeLichessServer):
+    resign_path = f"/api/board/game/{GAME_ID}/resign"
+    takeback_path = f"/api/board/game/{GAME_ID}/takeback/yes"
+    fake_lichess.set_response("POST", resign_path, {"error": "Too many requests"}, status=429)
+    fake_lichess.set_response("POST", takeback_path, {"ok": True})
+
+    # Commands sent without a deadline aren't held by the rate limit pause
+    start = monotonic()
+    with pytest.raises(ResponseError):
+        gsd.resign()
+    with pytest.raises(RateLimitTimeout, match="try again in 60 seconds"):
+        gsd.send_takeback_request()
+    assert fake_lichess.request_count("POST", resign_path) == 1
+    assert fake_lichess.request_count("POST", takeback_path) == 0
+    assert monotonic() - start < 1
+
+
+@pytest.fixture
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr('cli_chess.core.api.game_state_dispatcher.GAME_STREAM_RECONNECT_BACKOFF', RetryPolicy(base_delay=0.05, jitter=0))
+
+
+def test_reconnect(fast_reconnect, gsd: GameStateDispatcher, gsd_listener: Mock, fake_lichess: FakeLichessServer):
+    moves = events.random_game_moves(6)
+    game_over = events.game_full(GAME_ID, moves)
+    game_over['state'] = events.game_state(moves, status="mate", winner="white")
+
+    # The stream drops mid-game, and the game ends before it's reconnected
+    fake_lichess.set_stream(STREAM_PATH, [events.game_full(GAME_ID, moves[:2]), events.game_state(moves[:4])])
+    fake_lichess.on_request("GET", STREAM_PATH, lambda: fake_lichess.set_stream(STREAM_PATH, [game_over]))
+    gsd.run()
+
+    assert fake_lichess.request_count("GET", STREAM_PATH) == 2
+    notified = [call.kwargs for call in gsd_listener.call_args_list]
+    assert [(notify['gameFull']['state']['moves'], notify['resync']) for notify in notified if 'gameFull' in notify] == [
+        (" ".join(moves[:2]), False),
+        (" ".join(moves), True),
+    ]
+    assert notified[-1]['gameState']['status'] == "mate" and notified[-1]['gameOver']
+
+
+def test_heartbeat_timeout(fast_reconnect, gsd: GameStateDispatcher, gsd_listener: Mock, fake_lichess: FakeLichessServer, monkeypatch):
+    monkeypatch.setattr('cli_chess.core.api.game_state_dispatcher.GAME_STREAM_HEARTBEAT_TIMEOUT', 0.3)
+    moves = events.random_game_moves(4)
+
+    # Keep-alive lines keep the stream open, while a silent stream is reconnected
+    fake_lichess.set_stream(STREAM_PATH, [events.game_full(GAME_ID, moves[:2]), None, None, None], interval=0.15, keep_open=True)
+    gsd.start()
+    try:
+        assert wait_for(lambda: fake_lichess.request_count("GET", STREAM_PATH) == 2)
+        assert fake_lichess.wait_for_stream(STREAM_PATH)
+        fake_lichess.push(STREAM_PATH, events.game_state(moves, status="resign", winner="black"))
+        gsd.join(timeout=5)
+        assert not gsd.is_alive()
+    finally:
+        gsd.stop()
+        fake_lichess.close_streams(STREAM_PATH)
+
+    assert [call.kwargs['resync'] for call in gsd_listener.call_args_list if 'gameFull' in call.kwargs] == [False, True]
+
+
+def test_stop_and_errors(fast_reconnect, gsd: GameStateDispatcher, fake_lichess: FakeLichessServer):
+    # Error responses other than server errors and rate limiting aren't reconnected
+    gsd.run()
+    assert fake_lichess.request_count("GET", STREAM_PATH) == 1
+
+    fake_lichess.set_stream(STREAM_PATH, [events.game_full(GAME_ID)], keep_open=True)
+    gsd = GameStateDispatcher(GAME_ID)
+    gsd.start()
+    assert fake_lichess.wait_for_stream(STREAM_PATH)
+    gsd.stop()
+    gsd.join(timeout=5)
+    assert not gsd.is_alive()
+    assert fake_lichess.request_count("GET", STREAM_PATH) == 2
+
+
+class RecordingBackoff(RetryPolicy):
+    def __init__(self):
+        super().__init__(base_delay=0.001, jitter=0)
+        self.retries = []
+
+    def get_delay(self, retry: int) -> float:
+        self.retries.append(retry)
+        return super().get_delay(retry)
+
+
+def test_reconnect_backoff(gsd: GameStateDispatcher, fake_lichess: FakeLichessServer, monkeypatch):
+    backoff = RecordingBackoff()
+    monkeypatch.setattr('cli_chess.core.api.game_state_dispatcher.GAME_STREAM_RECONNECT_BACKOFF', backoff)
+    game_over = events.game_full(GAME_ID)
+    game_over['state'] = events.game_state([], status="aborted")
+
+    def end_game_after(requests: int) -> None:
+        fake_lichess.on_request("GET", STREAM_PATH, lambda: (fake_lichess.request_count("GET", STREAM_PATH) == requests
+                                                             and fake_lichess.set_stream(STREAM_PATH, [game_over])))
+
+    # A stream which drops right after the gameFull backs off further on each reconnect
+    fake_lichess.set_stream(STREAM_PATH, [events.game_full(GAME_ID)])
+    end_game_after(4)
+    gsd.run()
+    assert backoff.retries == [1, 2, 3, 4]
+    assert [backoff.get_delay(retry) for retry in (1, 2, 3)] == [0.001, 0.002, 0.004]
+
+    # The backoff is reset once a stream has stayed up for the healthy time
+    monkeypatch.setattr('cli_chess.core.api.game_state_dispatcher.GAME_STREAM_HEALTHY_SECONDS', 0)
+    backoff.retries.clear()
+    fake_lichess.set_stream(STREAM_PATH, [events.game_full(GAME_ID)])
+    end_game_after(8)
+    GameStateDispatcher(GAME_ID).run()
+    assert backoff.retries == [1, 1, 1]
@@ -0,0 +1,101 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api import IncomingEventManager
+from cli_chess.tests.fake_lichess import FakeLichessServer, events
+from unittest.mock import Mock
+from time import sleep
+import threading
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+STREAM_PATH = "/api/stream/event"
+
+
+@pytest.fixture
+def iem_listener():
+    return Mock()
+
+
+@pytest.fixture
+def iem(api_client, iem_listener: Mock):
+    iem = IncomingEventManager()
+    iem.subscribe_to_events(iem_listener)
+    return iem
+
+
+def test_stream_events(iem: IncomingEventManager, iem_listener: Mock, fake_lichess: FakeLichessServer):
+    fake_lichess.set_stream(STREAM_PATH, [
+        events.game_start("game0001"),
+        events.game_start("game0002"),
+        None,  # keep-alive
+        events.challenge("chal0001"),
+        events.challenge("chal0001", event_type="challengeCanceled"),
+        events.challenge("chal0002", event_type="challengeDeclined"),
+        events.game_finish("game0001"),
+        {"type": "unknownEvent"},
+    ])
+    iem.run()
+
+    notified = [call.kwargs for call in iem_listener.call_args_list]
+    assert [list(kwargs.keys())[0] for kwargs in notified] == [
+        "gameStart", "gameStart", "challenge", "challengeCanceled", "challengeCanceled", "gameFinish", "other"
+    ]
+    assert notified[5]['gameFinish']['game']['gameId'] == "game0001"
+    assert iem.get_active_games() == ["game0002"]
+
+
+def test_unsubscribe_from_events(iem: IncomingEventManager, iem_listener: Mock, fake_lichess: FakeLichessServer):
+    fake_lichess.set_stream(STREAM_PATH, [events.game_start("game0001")])
+    iem.unsubscribe_from_events(iem_listener)
+    iem.run()
+
+    iem_listener.assert_not_called()
+    assert iem.get_active_games() == ["game0001"]
+
+
+class ClosableStream:
+    """Stands in for an API stream. Unless preempted, it stays open until closed"""
+    def __init__(self, preempted: bool = False):
+        self.preempted = preempted
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        if not self.preempted:
+            self.closed.wait(5)
+        return iter([])
+
+    def close(self):
+        self.closed.set()
+
+
+def test_stop_while_reconnecting(iem: IncomingEventManager, monkeypatch):
+    streams = [ClosableStream(preempted=True), ClosableStream()]
+
+    def open_api_stream(*args):
+        stream = streams[len(opened)]
+        opened.append(stream)
+        if len(opened) == 2:
+            # Stopped while the preempted stream is being reopened
+            threading.Thread(target=iem.stop).start()
+            sleep(0.05)
+        return stream
+
+    opened = []
+    monkeypatch.setattr('cli_chess.core.api.incoming_event_manger.open_api_stream', open_api_stream)
+    iem.start()
+    iem.join(timeout=2)
+    assert not iem.is_alive()
+    assert opened == streams and streams[1].closed.is_set()
@@ -0,0 +1,103 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api.rate_limiter import RateLimiter, RateLimitTimeout, is_retryable_api_error
+from cli_chess.tests.fake_lichess import FakeLichessServer
+from berserk import Client, TokenSession
+from berserk.exceptions import ApiError, ResponseError
+from time import monotonic
+import pytest
+
+
+@pytest.fixture
+def limited_client(fake_lichess: FakeLichessServer):
+    limiter = RateLimiter(rate=100, burst=2, rate_limit_pause=0.3)
+    session = TokenSession("lip_unitTest")
+    limiter.install(session)
+    yield limiter, Client(session, base_url=fake_lichess.url)
+    session.close()
+
+
+def test_token_bucket():
+    limiter = RateLimiter(rate=20, burst=3)
+    start = monotonic()
+    for _ in range(3):
+        assert limiter.acquire()
+    assert monotonic() - start < 0.05
+
+    # Once the burst is used up, tokens are handed out at the rate
+    for _ in range(4):
+        assert limiter.acquire()
+    assert monotonic() - start >= 0.15
+
+
+def test_deadline():
+    limiter = RateLimiter(rate=5, burst=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(deadline=monotonic() + 0.1)
+
+    # The deadline of the calling thread is used by default
+    with limiter.within_deadline(monotonic() + 0.1):
+        with limiter.within_deadline(monotonic() + 10):
+            assert not limiter.acquire()
+    assert limiter.acquire(deadline=monotonic() + 2)
+
+
+def test_pause():
+    limiter = RateLimiter(rate=100, burst=5)
+    limiter.pause(0.2)
+    assert 0.1 < limiter.get_pause_remaining() <= 0.2
+    assert not limiter.acquire(deadline=monotonic() + 0.1)
+
+    start = monotonic()
+    assert limiter.acquire()
+    assert monotonic() - start >= 0.05
+
+    limiter.pause(10)
+    limiter.reset()
+    assert limiter.get_pause_remaining() == 0 and limiter.acquire(deadline=monotonic())
+
+
+@pytest.mark.enable_socket
+def test_rate_limit_response(limited_client, fake_lichess: FakeLichessServer):
+    limiter, client = limited_client
+    fake_lichess.set_response("GET", "/api/account", {"error": "Too many requests"}, status=429)
+    with pytest.raises(ResponseError) as e:
+        client.account.get()
+    assert e.value.status_code == 429 and limiter.get_pause_remaining() > 0.2
+
+    # All requests wait out the pause, or give up at their deadline
+    fake_lichess.set_response("GET", "/api/account", {"id": "unittest"})
+    with limiter.within_deadline(monotonic() + 0.1):
+        with pytest.raises(RateLimitTimeout):
+            client.account.get()
+    assert client.account.get()['id'] == "unittest"
+    assert fake_lichess.request_count("GET", "/api/account") == 2
+
+
+@pytest.mark.enable_socket
+def test_is_retryable_api_error(api_client, fake_lichess: FakeLichessServer):
+    errors = []
+    for status in (400, 404, 500, 503, 429):  # A 429 pauses the requests which follow it
+        fake_lichess.set_response("GET", "/api/account", {}, status=status)
+        try:
+            api_client.account.get()
+        except ResponseError as e:
+            errors.append(e)
+
+    assert [is_retryable_api_error(e) for e in errors] == [False, False, True, True, True]
+    assert is_retryable_api_error(ApiError(ConnectionError("Connection reset")))
+    assert not is_retryable_api_error(RateLimitTimeout())
+    assert not is_retryable_api_error(ValueError())
@@ -0,0 +1,113 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.api import StreamPriority
+from cli_chess.core.api.stream_broker import StreamBroker
+from cli_chess.core.api.api_stream import ApiStream, get_live_stream_count
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+import threading
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+
+
+@pytest.fixture
+def broker():
+    return StreamBroker(budget=2)
+
+
+@pytest.fixture
+def open_stream(api_client, fake_lichess: FakeLichessServer, broker: StreamBroker):
+    """Returns a function which starts reading a stream that stays open in a new thread"""
+    streams = []
+
+    def _open_stream(game_id: str, priority: StreamPriority) -> ApiStream:
+        path = f"/api/stream/game/{game_id}"
+        fake_lichess.set_stream(path, [events.tv_description(game_id)], keep_open=True)
+        stream = ApiStream(api_client, path, priority=priority, broker=broker)
+        reader = threading.Thread(target=lambda: list(stream), daemon=True)
+        reader.start()
+        streams.append((stream, reader))
+        return stream
+
+    yield _open_stream
+    for stream, reader in streams:
+        stream.close()
+        reader.join(timeout=5)
+    assert get_live_stream_count() == 0
+
+
+def priorities(broker: StreamBroker, key: str) -> list:
+    return [stream['priority'] for stream in broker.get_state()[key]]
+
+
+def test_queue_when_over_budget(broker: StreamBroker, open_stream, fake_lichess: FakeLichessServer):
+    tv1 = open_stream("TvGame01", StreamPriority.TV)
+    open_stream("TvGame02", StreamPriority.TV)
+    assert wait_for(lambda: len(broker.get_state()['open']) == 2)
+
+    # Equal priority streams wait for a free slot
+    open_stream("TvGame03", StreamPriority.TV)
+    assert wait_for(lambda: len(broker.get_state()['queued']) == 1)
+    assert broker.get_state()['budget'] == 2
+    assert wait_for(lambda: fake_lichess.open_stream_count() == 2)
+
+    tv1.close()
+    assert wait_for(lambda: broker.get_state()['queued'] == [] and len(broker.get_state()['open']) == 2)
+    assert wait_for(lambda: fake_lichess.request_count("GET", "/api/stream/game/TvGame03") == 1)
+    assert not tv1.preempted
+
+
+def test_preempt_lower_priority(broker: StreamBroker, open_stream):
+    tv = open_stream("TvGame01", StreamPriority.TV)
+    iem = open_stream("TvGame02", StreamPriority.IEM)
+    assert wait_for(lambda: len(broker.get_state()['open']) == 2)
+
+    # The game stream takes the slot of the TV stream
+    game = open_stream("Game0001", StreamPriority.GAME)
+    assert wait_for(lambda: sorted(priorities(broker, 'open')) == ["GAME", "IEM"])
+    assert tv.preempted and tv.closed
+    assert not iem.preempted and not game.preempted
+
+    # TV can't preempt more important streams so it's queued
+    open_stream("TvGame03", StreamPriority.TV)
+    assert wait_for(lambda: priorities(broker, 'queued') == ["TV"])
+
+
+def test_queued_by_priority(broker: StreamBroker, open_stream):
+    game1 = open_stream("Game0001", StreamPriority.GAME)
+    open_stream("Game0002", StreamPriority.GAME)
+    assert wait_for(lambda: len(broker.get_state()['open']) == 2)
+
+    open_stream("TvGame01", StreamPriority.TV)
+    assert wait_for(lambda: len(broker.get_state()['queued']) == 1)
+    open_stream("IemEvent", StreamPriority.IEM)
+    assert wait_for(lambda: len(broker.get_state()['queued']) == 2)
+
+    # The IEM stream was queued after the TV stream, but is more important
+    game1.close()
+    assert wait_for(lambda: priorities(broker, 'open') == ["GAME", "IEM"])
+    assert priorities(broker, 'queued') == ["TV"]
+
+
+def test_close_while_queued(broker: StreamBroker, open_stream):
+    open_stream("TvGame01", StreamPriority.TV)
+    open_stream("TvGame02", StreamPriority.TV)
+    queued = open_stream("TvGame03", StreamPriority.TV)
+    assert wait_for(lambda: len(broker.get_state()['queued']) == 1)
+
+    queued.close()
+    assert wait_for(lambda: broker.get_state()['queued'] == [])
+    assert len(broker.get_state()['open']) == 2
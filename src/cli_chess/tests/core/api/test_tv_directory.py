@@ -0,0 +1,87 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.core.game.online_game.watch_tv import WatchTVModel
+from cli_chess.core.api.tv_directory import TVDirectory
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+import threading
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+CHANNELS_PATH = "/api/tv/channels"
+
+
+@pytest.fixture
+def directory(fake_lichess: FakeLichessServer):
+    fake_lichess.set_response("GET", CHANNELS_PATH, events.tv_channels({"Blitz": "TvGame01", "Bullet": "TvGame02"}))
+    return TVDirectory(ttl=60)
+
+
+def test_cached_lookups(directory: TVDirectory, api_client, fake_lichess: FakeLichessServer):
+    assert directory.get_game_id(api_client, "Blitz") == "TvGame01"
+    assert directory.get_game_id(api_client, "Bullet") == "TvGame02"
+    assert directory.get_game_id(api_client, "Rapid") is None
+    assert fake_lichess.request_count("GET", CHANNELS_PATH) == 1
+
+    # Expired entries are refreshed
+    directory.ttl = 0
+    directory.get_game_id(api_client, "Blitz")
+    assert fake_lichess.request_count("GET", CHANNELS_PATH) == 2
+
+
+def test_invalidate(directory: TVDirectory, api_client, fake_lichess: FakeLichessServer):
+    assert directory.get_game_id(api_client, "Blitz") == "TvGame01"
+
+    fake_lichess.set_response("GET", CHANNELS_PATH, events.tv_channels({"Blitz": "TvGame03"}))
+    assert directory.get_game_id(api_client, "Blitz") == "TvGame01"
+
+    directory.invalidate()
+    assert directory.get_game_id(api_client, "Blitz") == "TvGame03"
+    assert fake_lichess.request_count("GET", CHANNELS_PATH) == 2
+
+
+def test_single_flight_refresh(directory: TVDirectory, api_client, fake_lichess: FakeLichessServer):
+    fake_lichess.latency = 0.2
+    results = []
+    lookups = [threading.Thread(target=lambda: results.append(directory.get_game_id(api_client, "Blitz")))
+               for _ in range(10)]
+    for lookup in lookups:
+        lookup.start()
+    for lookup in lookups:
+        lookup.join(timeout=5)
+
+    assert results == ["TvGame01"] * 10
+    assert fake_lichess.request_count("GET", CHANNELS_PATH) == 1
+
+
+def test_shared_by_tv_watchers(api_client, fake_lichess: FakeLichessServer):
+    fake_lichess.set_response("GET", CHANNELS_PATH, events.tv_channels({"Blitz": "TvGame01", "Bullet": "TvGame02"}))
+    for game_id in ("TvGame01", "TvGame02"):
+        fake_lichess.set_stream(f"/api/stream/game/{game_id}", [events.tv_description(game_id)], keep_open=True)
+
+    models = [WatchTVModel(channel) for channel in (TVChannelMenuOptions.BLITZ, TVChannelMenuOptions.BULLET)]
+    try:
+        for model in models:
+            model.start_watching()
+        for model in models:
+            wait_for(lambda: model.game_metadata['gameId'])
+
+        assert [model.game_metadata['gameId'] for model in models] == ["TvGame01", "TvGame02"]
+        assert fake_lichess.request_count("GET", CHANNELS_PATH) == 1
+    finally:
+        for model in models:
+            model.stop_watching()
+            model.cleanup()
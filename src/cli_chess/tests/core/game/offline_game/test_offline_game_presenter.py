@@ -0,0 +1,93 @@
+# Copyright (C) 2021-2022 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.game.offline_game import OfflineGameModel
+from cli_chess.core.game.offline_game.offline_game_presenter import OfflineGamePresenter
+from cli_chess.core.game.game_options import GameOption
+from cli_chess.modules.engine import EnginePresenter
+from cli_chess.utils.config import game_config
+from cli_chess.utils import worker_pool
+from cli_chess.tests.fake_lichess import wait_for
+from prompt_toolkit.application import DummyApplication
+from prompt_toolkit.application.current import set_app
+import tracemalloc
+import gc
+import pytest
+
+FOOLS_MATE = ["f2f3", "e7e5", "g2g4", "d8h4"]
+
+
+@pytest.fixture(autouse=True)
+def no_engine(monkeypatch):
+    monkeypatch.setattr(EnginePresenter, "start_engine", lambda self: None)
+
+
+@pytest.fixture(autouse=True)
+def app():
+    # Without a running application, every repaint creates a new dummy application
+    with set_app(DummyApplication()):
+        yield
+
+
+def play_game() -> None:
+    presenter = OfflineGamePresenter(OfflineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard"}))
+    for move in FOOLS_MATE:
+        presenter.model.board_model.make_move(move)
+    assert presenter.model.board_model.board.is_checkmate()
+
+
+def count_presenters() -> int:
+    return sum(isinstance(obj, OfflineGamePresenter) for obj in gc.get_objects())
+
+
+def test_finished_games_are_released():
+    play_game()
+    gc.collect()
+    listener_count = len(game_config.e_game_config_updated.listeners)
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(100):
+            play_game()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count_presenters() == 0
+    assert len(game_config.e_game_config_updated.listeners) == listener_count
+
+    # A leaked game retains well over 100KB, so 100 leaked games would far exceed this
+    assert current - baseline < 1024 * 1024
+
+
+def test_task_failures_are_alerted():
+    presenter = OfflineGamePresenter(OfflineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard"}))
+    other = OfflineGamePresenter(OfflineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard"}))
+
+    def fail():
+        raise ValueError("Engine crashed")
+
+    # Only the presenter of the game owning the task shows the failure
+    future = worker_pool.submit(fail, owner=presenter.model)
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    assert wait_for(lambda: presenter.view.alert._alert_label.text == "Engine crashed")
+    assert other.view.alert._alert_label.text == ""
+
+    presenter.exit()
+    other.exit()
+    assert presenter._handle_task_failed not in worker_pool.e_task_failed.listeners
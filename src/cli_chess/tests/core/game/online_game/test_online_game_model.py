@@ -0,0 +1,122 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.game.online_game import OnlineGameModel
+from cli_chess.core.game.game_options import GameOption
+from cli_chess.core.api import IncomingEventManager
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+from cli_chess.tests.fake_lichess.load_harness import run_game_load_test
+from cli_chess.modules.clock import ClockPresenter
+from berserk import models
+from chess import WHITE, BLACK
+from unittest.mock import Mock
+from time import monotonic
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+GAME_ID = "TestGame"
+
+
+@pytest.fixture
+def iem(api_client, fake_lichess: FakeLichessServer, monkeypatch):
+    fake_lichess.set_stream("/api/stream/event", [], keep_open=True)
+    iem = IncomingEventManager()
+    monkeypatch.setattr('cli_chess.core.api.api_manager.api_iem', iem, raising=False)
+    iem.start()
+    assert fake_lichess.wait_for_stream("/api/stream/event")
+    yield iem
+    fake_lichess.close_streams("/api/stream/event")
+    iem.join(timeout=5)
+
+
+@pytest.fixture
+def model_listener():
+    return Mock()
+
+
+@pytest.fixture
+def model(iem: IncomingEventManager, model_listener: Mock):
+    model = OnlineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard",
+                             GameOption.TIME_CONTROL: (1, 0), GameOption.COMPUTER_SKILL_LEVEL: 1})
+    model.e_game_model_updated.add_listener(model_listener)
+    yield model
+    model.cleanup()
+
+
+def start_game(model: OnlineGameModel, moves: list, wtime: int, btime: int) -> None:
+    """Feeds the model the game events as the game state dispatcher
+       converts them, where the game state clock times are datetimes
+    """
+    model.game_in_progress = True
+    model.game_state_dispatcher = Mock()
+    model.handle_game_state_dispatcher_event(gameFull=models.GameState.convert(events.game_full(GAME_ID)), resync=False)
+    model.handle_game_state_dispatcher_event(gameState=models.GameState.convert(events.game_state(moves, wtime, btime)), gameOver=False)
+
+
+def test_converted_clock_times(model: OnlineGameModel):
+    start_game(model, ["e2e4", "e7e5"], wtime=14500, btime=13000)
+    assert model.game_metadata['clock']['white']['time'] == 14500
+    assert model.game_metadata['clock']['black']['time'] == 13000
+
+    # The clock of the side to move counts down and ticks
+    presenter = ClockPresenter(model)
+    try:
+        assert presenter.get_clock_display(WHITE) == "00:14"
+        assert presenter.get_clock_display(BLACK) == "00:13"
+        assert presenter.get_tick_interval() == pytest.approx(0.5, abs=0.1)
+        assert wait_for(lambda: presenter.get_clock_display(WHITE) == "00:13", timeout=2)
+    finally:
+        presenter.stop()
+
+
+def test_move_deadline(model: OnlineGameModel):
+    # The clock isn't running until both sides have moved
+    start_game(model, [], wtime=15000, btime=15000)
+    model.make_move("e4")
+    assert model.game_state_dispatcher.make_move.call_args.kwargs['deadline'] is None
+
+    # Moves must land before our clock runs out
+    start_game(model, ["e2e4", "e7e5"], wtime=14500, btime=13000)
+    model.make_move("Nf3")
+    move, = model.game_state_dispatcher.make_move.call_args.args
+    deadline = model.game_state_dispatcher.make_move.call_args.kwargs['deadline']
+    assert move == "g1f3"
+    assert deadline == pytest.approx(monotonic() + 14.5, abs=0.5)
+
+
+def test_play_game_vs_ai(model: OnlineGameModel, model_listener: Mock, fake_lichess: FakeLichessServer):
+    moves = events.random_game_moves(30)
+    fake_lichess.set_stream(f"/api/board/game/stream/{GAME_ID}", events.played_game_events(GAME_ID, moves, status="resign", winner="white"))
+    fake_lichess.set_response("POST", "/api/challenge/ai", {"id": GAME_ID, "status": "started"})
+    fake_lichess.on_request("POST", "/api/challenge/ai", lambda: fake_lichess.push("/api/stream/event", events.game_start(GAME_ID)))
+
+    model.create_a_game(is_vs_ai=True)
+    assert wait_for(lambda: model.game_metadata['state']['status'])
+
+    assert [move.uci() for move in model.board_model.get_move_stack()] == moves
+    assert model.game_metadata['gameId'] == GAME_ID
+    assert model.game_metadata['state'] == {'status': "resign", 'winner': "white"}
+    assert model.game_metadata['players']['black']['name'] == "Stockfish level 1"
+    assert not model.game_in_progress
+
+    notified = [kwarg for call in model_listener.call_args_list for kwarg in call.kwargs]
+    assert notified.index('searchingForOpponent') < notified.index('opponentFound') < notified.index('onlineGameOver')
+
+
+def test_load_harness():
+    result = run_game_load_test(move_count=20, interval=0.001, timeout=10)
+    assert result.events_sent == 20
+    # Positions posted to the UI loop in the same batch are rendered once
+    assert 0 < result.renders <= result.events_sent
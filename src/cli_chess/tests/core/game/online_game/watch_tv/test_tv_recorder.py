@@ -0,0 +1,133 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.core.game.online_game.watch_tv import WatchTVModel
+from cli_chess.core.game.online_game.watch_tv.tv_recorder import TVArchive, TVGameRecorder, read_archived_game, load_archive_index
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+import pytest
+
+GAME_ID = "TvGame01"
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = TVArchive(str(tmp_path))
+    yield archive
+    archive.close()
+
+
+def read_games(archive: TVArchive) -> list:
+    archive.flush()
+    archive_filename, index_filename = archive.get_filenames()
+    return [(entry, read_archived_game(archive_filename, entry['offset'])) for entry in load_archive_index(index_filename)]
+
+
+def record(archive: TVArchive, stream_events: list) -> None:
+    recorder = TVGameRecorder(archive, "Blitz")
+    for event in stream_events:
+        recorder.handle_event(event)
+    recorder.finish()
+
+
+def test_record_games(archive: TVArchive):
+    moves1 = events.random_game_moves(40, seed=1)
+    moves2 = events.random_game_moves(25, seed=2)
+    record(archive, events.watched_game_events("TvGame01", moves1, status="mate", winner="black"))
+    record(archive, events.watched_game_events("TvGame02", moves2, status="draw", winner=None))
+
+    games = read_games(archive)
+    assert [entry['gameId'] for entry, _ in games] == ["TvGame01", "TvGame02"]
+    assert [entry['result'] for entry, _ in games] == ["0-1", "1/2-1/2"]
+    assert games[0][0]['white'] == "WhitePlayer" and games[0][0]['black'] == "BlackPlayer"
+
+    # Each game is read using the offset from the index
+    assert [move.uci() for move in games[0][1].mainline_moves()] == moves1
+    assert [move.uci() for move in games[1][1].mainline_moves()] == moves2
+    assert games[0][1].headers["Site"] == "https://lichess.org/TvGame01"
+    assert games[0][1].headers["WhiteElo"] == "2600"
+    assert games[1][1].headers["Result"] == "1/2-1/2"
+
+
+def test_invalid_last_moves(archive: TVArchive):
+    # Lichess sends castling as king takes rook, and the promotion piece can be missing
+    moves = ["e2e4", "d7d5", "g1f3", "d5e4", "f1c4", "e4f3", "e1g1", "f3g2", "d2d3", "g2f1q"]
+    sent_moves = ["e2e4", "d7d5", "g1f3", "d5e4", "f1c4", "e4f3", "e1h1", "f3g2", "d2d3", "g2f1"]
+    stream_events = events.watched_game_events(GAME_ID, moves, status="resign", winner="black")
+    for event, sent_move in zip(stream_events[1:-1], sent_moves):
+        event['lm'] = sent_move
+        event['fen'] = " ".join(event['fen'].split()[:2])  # Move events only include the placement and turn
+    record(archive, stream_events)
+
+    (entry, game), = read_games(archive)
+    assert [move.uci() for move in game.mainline_moves()] == moves
+
+
+def test_join_game_in_progress(archive: TVArchive):
+    moves = events.random_game_moves(30, seed=3)
+    fens = events.fens_after_moves(moves)
+    stream_events = events.watched_game_events(GAME_ID, moves, status="outoftime", winner="white")
+    stream_events[0] = events.tv_description(GAME_ID, fen=fens[9], turns=10, last_move=moves[9])
+    del stream_events[1:11]
+    record(archive, stream_events)
+
+    (entry, game), = read_games(archive)
+    assert game.headers["FEN"] == fens[9]
+    assert [move.uci() for move in game.mainline_moves()] == moves[10:]
+    assert entry['result'] == "1-0"
+
+
+def test_missed_positions(archive: TVArchive):
+    moves = events.random_game_moves(20, seed=4)
+    stream_events = events.watched_game_events(GAME_ID, moves)
+    del stream_events[5]
+    record(archive, stream_events)
+
+    # Moves after a gap can't be rebuilt, so the recording stops at the gap
+    (entry, game), = read_games(archive)
+    assert [move.uci() for move in game.mainline_moves()] == moves[:4]
+    assert game.end().comment == "Recording incomplete"
+
+
+def test_unfinished_games(archive: TVArchive):
+    moves = events.random_game_moves(10)
+    record(archive, events.watched_game_events(GAME_ID, moves)[:-1])
+    record(archive, events.watched_game_events("Aborted1", [], status="aborted", winner=None))
+    record(archive, events.watched_game_events("NoMoves1", [])[:-1])
+
+    (entry, game), = read_games(archive)
+    assert entry['gameId'] == GAME_ID
+    assert entry['result'] == "*"
+    assert len(list(game.mainline_moves())) == 10
+
+
+@pytest.mark.enable_socket
+def test_record_watched_game(api_client, fake_lichess: FakeLichessServer, archive: TVArchive):
+    moves = events.random_game_moves(30)
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({"Blitz": GAME_ID}))
+    fake_lichess.set_stream(f"/api/stream/game/{GAME_ID}", events.watched_game_events(GAME_ID, moves, status="mate"))
+
+    model = WatchTVModel(TVChannelMenuOptions.BLITZ, archive=archive)
+    model.start_watching()
+    try:
+        wait_for(lambda: model.game_metadata['state']['winner'])
+    finally:
+        model.stop_watching()
+        model.cleanup()
+
+    (entry, game), = read_games(archive)
+    assert entry['result'] == "1-0"
+    assert game.headers["Event"] == "Lichess TV: Blitz"
+    assert [move.uci() for move in game.mainline_moves()] == moves
@@ -0,0 +1,153 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.core.game.online_game.watch_tv import TVWallModel, TVWallPresenter
+from cli_chess.core.game.online_game.watch_tv.tv_wall_model import MAX_TV_WALL_CHANNELS
+from cli_chess.core.game.online_game.watch_tv.tv_wall_presenter import FOCUSED_FRAME_INTERVAL, VISIBLE_FRAME_INTERVAL, HIDDEN_FRAME_INTERVAL
+from cli_chess.core.game.online_game.watch_tv.tv_wall_presenter import TVWallBoardPresenter
+from cli_chess.core.api.api_stream import get_live_stream_count
+from cli_chess.utils.event import ui_dispatcher
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+from concurrent.futures import Future
+from time import monotonic
+import threading
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+CHANNELS = [TVChannelMenuOptions.BLITZ, TVChannelMenuOptions.BULLET, TVChannelMenuOptions.RAPID]
+GAME_IDS = ["TvGame01", "TvGame02", "TvGame03"]
+
+
+@pytest.fixture
+def presenter(api_client, fake_lichess: FakeLichessServer):
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({
+        channel.value: game_id for channel, game_id in zip(CHANNELS, GAME_IDS)
+    }))
+    for game_id in GAME_IDS:
+        fake_lichess.set_stream(f"/api/stream/game/{game_id}", [events.tv_description(game_id)], keep_open=True)
+
+    presenter = TVWallPresenter(TVWallModel(CHANNELS))
+    yield presenter
+    presenter.stop_watching()
+    assert get_live_stream_count() == 0
+
+
+def test_wall_channels(api_client):
+    with pytest.raises(ValueError):
+        TVWallModel([])
+    with pytest.raises(ValueError):
+        TVWallModel(list(TVChannelMenuOptions)[:MAX_TV_WALL_CHANNELS + 1])
+
+    model = TVWallModel([TVChannelMenuOptions.BLITZ, TVChannelMenuOptions.BULLET, TVChannelMenuOptions.BLITZ])
+    assert model.channels == [TVChannelMenuOptions.BLITZ, TVChannelMenuOptions.BULLET]
+    model.cleanup()
+
+
+def test_wall_games(presenter: TVWallPresenter, fake_lichess: FakeLichessServer):
+    boards = presenter.board_presenters
+    assert wait_for(lambda: all(board.view.upper_player.startswith("BlackPlaye") for board in boards))
+    assert [board.model.game_metadata['gameId'] for board in boards] == GAME_IDS
+    assert [board.view.title for board in boards] == [channel.value for channel in CHANNELS]
+    assert all(len(board.view.board_fragments) == 64 + 7 for board in boards)
+    assert fake_lichess.request_count("GET", "/api/tv/channels") == 1
+
+    # Moves are rendered on the board of the channel
+    fen = events.fens_after_moves(["e2e4"])[-1]
+    fake_lichess.push(f"/api/stream/game/{GAME_IDS[1]}", events.tv_move(fen, "e2e4", 170, 180))
+    assert wait_for(lambda: "class:last-move.light-piece" in [style for style, _ in boards[1].view.board_fragments])
+    assert boards[1].view.lower_player.endswith("02:50")
+    assert "class:last-move.light-piece" not in [style for style, _ in boards[0].view.board_fragments]
+
+
+def test_frame_intervals(presenter: TVWallPresenter):
+    boards = presenter.board_presenters
+    assert [board.frame_interval for board in boards] == [FOCUSED_FRAME_INTERVAL, VISIBLE_FRAME_INTERVAL, VISIBLE_FRAME_INTERVAL]
+
+    # Boards which don't fit on screen are updated at the lowest rate
+    presenter.set_visible_slots(2)
+    assert [board.frame_interval for board in boards] == [FOCUSED_FRAME_INTERVAL, VISIBLE_FRAME_INTERVAL, HIDDEN_FRAME_INTERVAL]
+
+    # Focusing a hidden board scrolls it into view
+    presenter.focus_previous()
+    assert presenter.focused_index == 2
+    assert [board.frame_interval for board in boards] == [HIDDEN_FRAME_INTERVAL, VISIBLE_FRAME_INTERVAL, FOCUSED_FRAME_INTERVAL]
+    assert presenter.get_visible_board_presenters() == boards[1:]
+
+    presenter.focus_next()
+    assert presenter.focused_index == 0
+    assert presenter.get_visible_board_presenters() == boards[:2]
+
+
+def test_flip_focused_board(presenter: TVWallPresenter):
+    presenter.focus_next()
+    presenter.flip_board()
+    orientations = [board.model.board_model.get_board_orientation() for board in presenter.board_presenters]
+    assert orientations.count(False) == 1 and not orientations[1]
+
+
+@pytest.fixture
+def ui_loop():
+    """A UI loop running on its own thread, like the application's"""
+    loop = asyncio.new_event_loop()
+    attached = threading.Event()
+
+    def run():
+        ui_dispatcher.attach(loop)
+        attached.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    attached.wait(5)
+    yield loop, thread
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    ui_dispatcher.detach()
+    loop.close()
+
+
+def run_on_loop(loop: asyncio.AbstractEventLoop, fn):
+    future = Future()
+    loop.call_soon_threadsafe(lambda: future.set_result(fn()))
+    return future.result(timeout=10)
+
+
+def test_renders_on_ui_loop(ui_loop, api_client, fake_lichess: FakeLichessServer, monkeypatch):
+    loop, loop_thread = ui_loop
+    render_threads = set()
+    original_render = TVWallBoardPresenter.render
+    monkeypatch.setattr(TVWallBoardPresenter, "render", lambda self: render_threads.add(threading.current_thread()) or original_render(self))
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({
+        channel.value: game_id for channel, game_id in zip(CHANNELS, GAME_IDS)
+    }))
+    for game_id in GAME_IDS:
+        fake_lichess.set_stream(f"/api/stream/game/{game_id}", [events.tv_description(game_id)], keep_open=True)
+
+    presenter = run_on_loop(loop, lambda: TVWallPresenter(TVWallModel(CHANNELS)))
+    boards = presenter.board_presenters
+    try:
+        assert wait_for(lambda: all(board.view.upper_player.startswith("BlackPlaye") for board in boards))
+        assert render_threads == {loop_thread}
+    finally:
+        # All channels are stopped together rather than one after another
+        start = monotonic()
+        run_on_loop(loop, presenter.stop_watching)
+        assert monotonic() - start < 5
+
+    assert get_live_stream_count() == 0
+    for board in boards:
+        assert board.update not in board.model.e_game_model_updated.listeners
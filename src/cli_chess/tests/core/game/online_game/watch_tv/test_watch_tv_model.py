@@ -0,0 +1,129 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.core.game.online_game.watch_tv import WatchTVModel
+from cli_chess.core.api.api_stream import get_live_stream_count
+from cli_chess.tests.fake_lichess import FakeLichessServer, events, wait_for
+from cli_chess.tests.fake_lichess.load_harness import run_tv_load_test
+from unittest.mock import Mock
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+GAME_ID = "TvGame01"
+
+
+@pytest.fixture
+def model_listener():
+    return Mock()
+
+
+@pytest.fixture
+def model(api_client, model_listener: Mock):
+    model = WatchTVModel(TVChannelMenuOptions.BLITZ)
+    model.e_game_model_updated.add_listener(model_listener)
+    yield model
+    model.stop_watching()
+    model.cleanup()
+
+
+def test_watch_tv_game(model: WatchTVModel, model_listener: Mock, fake_lichess: FakeLichessServer):
+    moves = events.random_game_moves(20)
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({"Blitz": GAME_ID, "Bullet": "OtherGme"}))
+    fake_lichess.set_stream(f"/api/stream/game/{GAME_ID}", events.watched_game_events(GAME_ID, moves, status="mate", winner="black"))
+
+    model.start_watching()
+    assert wait_for(lambda: any('onlineGameOver' in call.kwargs for call in model_listener.call_args_list))
+
+    assert model.board_model.board.fen() == events.fens_after_moves(moves)[-1]
+    assert model.game_metadata['gameId'] == GAME_ID
+    assert model.game_metadata['state']['winner'] == "black"
+    assert model.game_metadata['players']['white']['name'] == "WhitePlayer"
+    assert fake_lichess.request_count("GET", f"/api/stream/game/{GAME_ID}") == 1
+
+    # The moves arrive faster than they're handled, so some positions may be skipped
+    notified = [kwarg for call in model_listener.call_args_list for kwarg in call.kwargs]
+    assert 2 <= notified.count('tvPositionUpdated') <= len(moves) + 1
+
+
+def test_clock_after_coalesced_moves(model: WatchTVModel):
+    moves = events.random_game_moves(4)
+    fens = [" ".join(fen.split()[:2]) for fen in events.fens_after_moves(moves)]  # Lichess sends the board and side only
+
+    # The clock runs once both sides have moved, even if the second move event was dropped
+    model.stream_event_received(startGameEvent=events.tv_description(GAME_ID))
+    model.stream_event_received(coreGameEvent=events.tv_move(fens[0], moves[0]))
+    assert not model.game_metadata['clock']['running']
+    model.stream_event_received(coreGameEvent=events.tv_move(fens[2], moves[2]))
+    assert model.game_metadata['clock']['running']
+
+    # Moves coalesced from the start of the game
+    model.stream_event_received(startGameEvent=events.tv_description(GAME_ID))
+    model.stream_event_received(coreGameEvent=events.tv_move(fens[2], moves[2]))
+    assert model.game_metadata['clock']['running']
+
+    model.stream_event_received(startGameEvent=events.tv_description(GAME_ID))
+    model.stream_event_received(coreGameEvent=events.tv_move(fens[1], moves[1]))
+    assert model.game_metadata['clock']['running']
+
+
+def test_tv_error(model: WatchTVModel, model_listener: Mock, fake_lichess: FakeLichessServer):
+    # The channel has no ongoing game
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({"Bullet": "OtherGme"}))
+
+    model.start_watching()
+    assert wait_for(lambda: any('tvError' in call.kwargs for call in model_listener.call_args_list))
+
+
+def test_open_and_close_tv(api_client, fake_lichess: FakeLichessServer):
+    # The TV game stream stays open without sending any further events
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({"Blitz": GAME_ID}))
+    fake_lichess.set_stream(f"/api/stream/game/{GAME_ID}", [events.tv_description(GAME_ID)], keep_open=True)
+
+    for _ in range(50):
+        model = WatchTVModel(TVChannelMenuOptions.BLITZ)
+        model.start_watching()
+        assert wait_for(lambda: model.game_metadata['gameId'] == GAME_ID)
+        assert get_live_stream_count() == 1
+
+        model.stop_watching()
+        assert not model._tv_stream.is_alive()
+        assert get_live_stream_count() == 0
+        model.cleanup()
+
+    assert fake_lichess.request_count("GET", f"/api/stream/game/{GAME_ID}") == 50
+
+
+def test_catch_up(model: WatchTVModel, model_listener: Mock, fake_lichess: FakeLichessServer):
+    # Joining a game with a backlog of moves which arrive all at once
+    moves = events.random_game_moves(200)
+    fens = events.fens_after_moves(moves)
+    backlog = [events.tv_move(fen, move, 60, 60) for move, fen in zip(moves, fens)]
+    fake_lichess.set_response("GET", "/api/tv/channels", events.tv_channels({"Blitz": GAME_ID}))
+    fake_lichess.set_stream(f"/api/stream/game/{GAME_ID}", [events.tv_description(GAME_ID)] + backlog, keep_open=True)
+
+    model.start_watching()
+    assert wait_for(lambda: model.board_model.board.fen() == fens[-1])
+
+    # Outdated positions are dropped before they reach the model
+    notified = [kwarg for call in model_listener.call_args_list for kwarg in call.kwargs]
+    assert notified.count('tvPositionUpdated') < len(moves)
+    assert model._tv_stream.is_alive()
+
+
+def test_load_harness():
+    result = run_tv_load_test(move_count=20, interval=0.001, timeout=10)
+    assert result.events_sent == 20
+    assert 0 < result.renders <= result.events_sent
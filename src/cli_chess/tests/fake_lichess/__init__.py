@@ -0,0 +1,2 @@
+from .server import FakeLichessServer, ScriptedStream
+from .wait import wait_for
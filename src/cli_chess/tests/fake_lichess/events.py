@@ -0,0 +1,219 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Builders for the NDJSON events Lichess sends. Field names
+   follow the Lichess API documentation for each stream.
+"""
+
+from typing import List
+import random
+import chess
+
+STARTING_FEN = chess.STARTING_FEN
+
+
+def random_game_moves(count: int, seed: int = 0) -> List[str]:
+    """Returns a list of up to `count` legal UCI moves from a
+       reproducible random game. The game is never played to completion.
+    """
+    rng = random.Random(seed)
+    board = chess.Board()
+    moves = []
+    while len(moves) < count:
+        legal_moves = list(board.legal_moves)
+        candidates = [m for m in legal_moves if not _ends_game(board, m)]
+        if not candidates:
+            break
+        move = rng.choice(candidates)
+        board.push(move)
+        moves.append(move.uci())
+    return moves
+
+
+def _ends_game(board: chess.Board, move: chess.Move) -> bool:
+    board.push(move)
+    try:
+        return board.is_game_over()
+    finally:
+        board.pop()
+
+
+def fens_after_moves(moves: List[str]) -> List[str]:
+    """Returns the board FEN after each of the passed in moves"""
+    board = chess.Board()
+    fens = []
+    for move in moves:
+        board.push_uci(move)
+        fens.append(board.fen())
+    return fens
+
+
+def game_start(game_id: str, color: str = "white", speed: str = "ultraBullet", ai_level: int = 1) -> dict:
+    """Incoming event stream: a game owned by the account started"""
+    return {
+        "type": "gameStart",
+        "game": {
+            "gameId": game_id,
+            "fullId": game_id + "abcd",
+            "color": color,
+            "fen": STARTING_FEN,
+            "hasMoved": False,
+            "isMyTurn": color == "white",
+            "lastMove": "",
+            "opponent": {"id": None, "username": f"A.I. level {ai_level}", "ai": ai_level},
+            "perf": speed,
+            "rated": False,
+            "secondsLeft": 15,
+            "source": "ai",
+            "speed": speed,
+            "variant": {"key": "standard", "name": "Standard"},
+            "compat": {"bot": False, "board": True},
+            "id": game_id,
+        }
+    }
+
+
+def game_finish(game_id: str, color: str = "white") -> dict:
+    """Incoming event stream: a game owned by the account finished"""
+    event = game_start(game_id, color)
+    event['type'] = "gameFinish"
+    return event
+
+
+def challenge(challenge_id: str, event_type: str = "challenge") -> dict:
+    """Incoming event stream: challenge, challengeCanceled or challengeDeclined"""
+    return {
+        "type": event_type,
+        "challenge": {
+            "id": challenge_id,
+            "status": "created",
+            "challenger": {"id": "opponent", "name": "Opponent", "rating": 1500},
+            "variant": {"key": "standard", "name": "Standard"},
+            "speed": "blitz",
+            "timeControl": {"type": "clock", "limit": 300, "increment": 3},
+            "color": "random",
+        }
+    }
+
+
+def game_full(game_id: str, moves: List[str] = (), clock_ms: int = 15000, white: dict = None, black: dict = None) -> dict:
+    """Board game stream: the full game data sent first on connection"""
+    return {
+        "type": "gameFull",
+        "id": game_id,
+        "rated": False,
+        "variant": {"key": "standard", "name": "Standard", "short": "Std"},
+        "clock": {"initial": clock_ms, "increment": 0},
+        "speed": "ultraBullet",
+        "perf": {"name": "UltraBullet"},
+        "createdAt": 1672531200000,
+        "white": white or {"id": "cli-chess", "name": "cli-chess", "title": None, "rating": 1500},
+        "black": black or {"aiLevel": 1},
+        "initialFen": "startpos",
+        "state": game_state(moves, clock_ms, clock_ms),
+    }
+
+
+def game_state(moves: List[str], wtime: int = 15000, btime: int = 15000, status: str = "started", winner: str = None) -> dict:
+    """Board game stream: the current state sent after each move"""
+    event = {
+        "type": "gameState",
+        "moves": " ".join(moves),
+        "wtime": wtime,
+        "btime": btime,
+        "winc": 0,
+        "binc": 0,
+        "status": status,
+    }
+    if winner:
+        event['winner'] = winner
+    return event
+
+
+def chat_line(text: str, username: str = "lichess", room: str = "player") -> dict:
+    """Board game stream: a chat message"""
+    return {"type": "chatLine", "room": room, "username": username, "text": text}
+
+
+def opponent_gone(gone: bool, claim_win_in_seconds: int = None) -> dict:
+    """Board game stream: the opponent left (or rejoined) the game"""
+    event = {"type": "opponentGone", "gone": gone}
+    if claim_win_in_seconds is not None:
+        event['claimWinInSeconds'] = claim_win_in_seconds
+    return event
+
+
+def played_game_events(game_id: str, moves: List[str], clock_ms: int = 15000, status: str = "resign", winner: str = "white") -> List[dict]:
+    """Returns a complete board game stream: gameFull followed by a gameState
+       for each move and a final gameState ending the game with `status`
+    """
+    events = [game_full(game_id, clock_ms=clock_ms)]
+    for ply in range(1, len(moves) + 1):
+        events.append(game_state(moves[:ply], clock_ms - ply, clock_ms - ply))
+    events.append(game_state(moves, clock_ms - len(moves), clock_ms - len(moves), status=status, winner=winner))
+    return events
+
+
+def tv_channels(game_ids: dict) -> dict:
+    """/api/tv/channels: maps a channel name to the ongoing game ID"""
+    return {channel: {"user": {"id": f"{channel.lower()}-player", "name": f"{channel} Player"},
+                      "rating": 2500, "gameId": game_id, "color": "white"}
+            for channel, game_id in game_ids.items()}
+
+
+def tv_description(game_id: str, fen: str = STARTING_FEN, turns: int = 0, last_move: str = "",
+                   status: str = "started", winner: str = None, variant: str = "standard") -> dict:
+    """Game move stream: the game description sent first (and again on game end)"""
+    event = {
+        "id": game_id,
+        "variant": {"key": variant, "name": variant.capitalize(), "short": variant[:3]},
+        "speed": "bullet",
+        "perf": "bullet",
+        "rated": True,
+        "initialFen": STARTING_FEN,
+        "fen": fen,
+        "player": "white",
+        "turns": turns,
+        "startedAtTurn": 0,
+        "source": "pool",
+        "status": {"id": 20 if status == "started" else 30, "name": status},
+        "createdAt": 1672531200000,
+        "lastMove": last_move,
+        "players": {
+            "white": {"user": {"name": "WhitePlayer", "id": "whiteplayer"}, "rating": 2600},
+            "black": {"user": {"name": "BlackPlayer", "id": "blackplayer"}, "rating": 2550},
+        },
+    }
+    if winner:
+        event['winner'] = winner
+    return event
+
+
+def tv_move(fen: str, last_move: str, white_clock: int = 60, black_clock: int = 60) -> dict:
+    """Game move stream: sent after each move"""
+    return {"fen": fen, "lm": last_move, "wc": white_clock, "bc": black_clock}
+
+
+def watched_game_events(game_id: str, moves: List[str], status: str = "mate", winner: str = "white") -> List[dict]:
+    """Returns a complete game move stream: the description, a move event
+       for each move and the final description ending the game with `status`
+    """
+    fens = fens_after_moves(moves)
+    events = [tv_description(game_id)]
+    for ply, (move, fen) in enumerate(zip(moves, fens), 1):
+        events.append(tv_move(fen, move, 60 - ply // 2, 60 - ply // 2))
+    final_fen = fens[-1] if fens else STARTING_FEN
+    events.append(tv_description(game_id, fen=final_fen, turns=len(moves), status=status, winner=winner))
+    return events
@@ -0,0 +1,322 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Drives the real online game and TV models against the fake Lichess
+   server and measures the latency between an event being sent by the
+   server and the board being rendered, along with the CPU time used.
+   The CPU time includes the in-process server so it is an upper bound.
+   As in the application, the models run under an asyncio loop with the
+   UI dispatcher attached, so a position counts as rendered when the UI
+   is invalidated after the batch of calls posted to the loop is drained.
+
+   A journal recorded with `cli-chess --journal FILE` can be replayed through
+   the same models (without a server) using `--journal FILE --speed N`. This
+   is deterministic so it can be run under a profiler again and again:
+   python -m cProfile -o replay.prof -m cli_chess.tests.fake_lichess.load_harness --journal FILE --speed 0
+
+   Run with: python -m cli_chess.tests.fake_lichess.load_harness --help
+"""
+
+from cli_chess.tests.fake_lichess import FakeLichessServer, wait_for
+from cli_chess.tests.fake_lichess import events
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
+from cli_chess.core.game.online_game import OnlineGameModel
+from cli_chess.core.game.online_game.online_game_presenter import OnlineGamePresenter
+from cli_chess.core.game.online_game.watch_tv import WatchTVModel
+from cli_chess.core.game.online_game.watch_tv.watch_tv_presenter import WatchTVPresenter
+from cli_chess.core.game.game_options import GameOption
+from cli_chess.core.api import api_manager, IncomingEventManager
+from cli_chess.core.api.event_journal import JournalReplayClient, load_journal, SOURCE_GSD, SOURCE_IEM, SOURCE_TV
+from cli_chess.utils.event import ui_dispatcher
+from berserk import Client, TokenSession
+from concurrent.futures import Future
+from contextlib import contextmanager
+from time import perf_counter, process_time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import threading
+import argparse
+import asyncio
+import chess
+
+GAME_ID = "LoadTest"
+TV_GAME_ID = "TvLoadTs"
+TV_CHANNEL = "UltraBullet"
+
+
+class LoadTestResult:
+    """Holds the measurements of a load test run"""
+    def __init__(self, events_sent: int, latencies: List[float], wall_time: float, cpu_time: float):
+        self.events_sent = events_sent
+        self.latencies = sorted(latencies)
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+
+    @property
+    def renders(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, pct: float) -> float:
+        """Returns the latency percentile in milliseconds"""
+        if not self.latencies:
+            return 0.0
+        index = min(len(self.latencies) - 1, int(round(pct / 100 * (len(self.latencies) - 1))))
+        return self.latencies[index] * 1000
+
+    def summary(self) -> str:
+        return (f"events sent: {self.events_sent}, positions rendered: {self.renders}\n"
+                f"event-to-render latency (ms): p50={self.percentile(50):.2f} "
+                f"p95={self.percentile(95):.2f} max={self.percentile(100):.2f}\n"
+                f"wall time: {self.wall_time:.2f}s, cpu time: {self.cpu_time:.2f}s "
+                f"({self.cpu_time / self.wall_time * 100 if self.wall_time else 0:.0f}% of one core)")
+
+
+class _RenderRecorder:
+    """Records when each position was rendered. This is used as the UI loop's
+       invalidate callback, which is where the application redraws the UI
+    """
+    def __init__(self):
+        self.board_model = None
+        self.rendered: Dict[str, float] = {}
+
+    def __call__(self):
+        if self.board_model is not None:
+            self.rendered.setdefault(self.board_model.board.board_fen(), perf_counter())
+
+
+@contextmanager
+def _ui_loop(invalidate: Callable[[], None]) -> Iterator[asyncio.AbstractEventLoop]:
+    """Runs an asyncio loop on its own thread with the UI dispatcher attached, as the
+       application does. `invalidate` is called after each batch of UI calls is drained.
+    """
+    loop = asyncio.new_event_loop()
+    attached = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        ui_dispatcher.attach(loop, invalidate)
+        attached.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="ui-loop", daemon=True)
+    thread.start()
+    attached.wait()
+    try:
+        yield loop
+    finally:
+        ui_dispatcher.detach()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def _run_on_loop(loop: asyncio.AbstractEventLoop, fn: Callable, *args):
+    """Calls the function on the UI loop (as the application would) and returns its result"""
+    future: Future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    loop.call_soon_threadsafe(run)
+    return future.result()
+
+
+def _latencies(sent: List[Tuple[float, str]], rendered: Dict[str, float]) -> List[float]:
+    """Matches each sent position with the time it was first rendered"""
+    return [rendered[fen] - sent_at for sent_at, fen in sent if fen in rendered and rendered[fen] >= sent_at]
+
+
+def run_game_load_test(move_count: int = 100, interval: float = 0.05, burst: int = 1,
+                       latency: float = 0.0, timeout: float = 60.0) -> LoadTestResult:
+    """Plays a simulated game vs the Lichess AI. The server sends a gameState
+       event for every move every `interval` seconds (in bursts of `burst`).
+    """
+    moves = events.random_game_moves(move_count)
+    game_path = f"/api/board/game/stream/{GAME_ID}"
+    saved_api = _save_api_globals()
+
+    with FakeLichessServer(latency=latency) as server:
+        server.set_stream("/api/stream/event", [], keep_open=True)
+        server.set_stream(game_path, events.played_game_events(GAME_ID, moves), interval=interval, burst=burst)
+        server.set_response("POST", "/api/challenge/ai", {"id": GAME_ID, "status": "started"})
+        server.on_request("POST", "/api/challenge/ai", lambda: server.push("/api/stream/event", events.game_start(GAME_ID)))
+
+        recorder = _RenderRecorder()
+        try:
+            api_manager._start_api("lip_loadTest", base_url=server.url)
+            server.wait_for_stream("/api/stream/event")
+
+            with _ui_loop(recorder) as loop:
+                model = OnlineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard",
+                                         GameOption.TIME_CONTROL: (1, 0), GameOption.COMPUTER_SKILL_LEVEL: 1})
+                presenter = _run_on_loop(loop, OnlineGamePresenter, model)
+                recorder.board_model = presenter.board_presenter.model
+
+                wall_start, cpu_start = perf_counter(), process_time()
+                _run_on_loop(loop, model.create_a_game, True)
+                wait_for(lambda: model.game_metadata['state']['status'], timeout)
+                wall_time, cpu_time = perf_counter() - wall_start, process_time() - cpu_start
+
+                fens = [chess.Board(fen).board_fen() for fen in events.fens_after_moves(moves)]
+                sent = [(sent_at, fens[len(event['moves'].split()) - 1]) for sent_at, event in server.sent_events.get(game_path, [])
+                        if event and event.get('type') == "gameState" and event.get('status') == "started"]
+                _run_on_loop(loop, model.cleanup)
+        finally:
+            _restore_api_globals(saved_api)
+
+    return LoadTestResult(len(sent), _latencies(sent, recorder.rendered), wall_time, cpu_time)
+
+
+def run_tv_load_test(move_count: int = 100, interval: float = 0.05, burst: int = 1,
+                     latency: float = 0.0, timeout: float = 60.0) -> LoadTestResult:
+    """Watches a simulated TV game. The server sends a move event
+       every `interval` seconds (in bursts of `burst`).
+    """
+    moves = events.random_game_moves(move_count)
+    game_path = f"/api/stream/game/{TV_GAME_ID}"
+    saved_api = _save_api_globals()
+
+    with FakeLichessServer(latency=latency) as server:
+        server.set_response("GET", "/api/tv/channels", events.tv_channels({TV_CHANNEL: TV_GAME_ID}))
+        server.set_stream(game_path, events.watched_game_events(TV_GAME_ID, moves), interval=interval, burst=burst)
+
+        session = TokenSession("lip_loadTest")
+        api_manager.api_client = Client(session, base_url=server.url)
+        recorder = _RenderRecorder()
+        try:
+            with _ui_loop(recorder) as loop:
+                model = WatchTVModel(TVChannelMenuOptions.ULTRABULLET)
+                recorder.board_model = model.board_model
+                wall_start, cpu_start = perf_counter(), process_time()
+                _run_on_loop(loop, WatchTVPresenter, model)
+                wait_for(lambda: (model.game_metadata['state']['status'] or {}).get('name') not in (None, "started"), timeout)
+                wall_time, cpu_time = perf_counter() - wall_start, process_time() - cpu_start
+
+                sent = [(sent_at, chess.Board(event['fen']).board_fen()) for sent_at, event in server.sent_events.get(game_path, [])
+                        if event and 'lm' in event]
+                model.stop_watching()
+                _run_on_loop(loop, model.cleanup)
+        finally:
+            session.close()
+            _restore_api_globals(saved_api)
+
+    return LoadTestResult(len(sent), _latencies(sent, recorder.rendered), wall_time, cpu_time)
+
+
+class _TimedReplayClient(JournalReplayClient):
+    """Records when each position is handed to the models during a replay"""
+    def __init__(self, entries: List[dict], speed: float):
+        super().__init__(entries, speed)
+        self.sent: List[Tuple[float, str]] = []
+
+    def _stream_game_state(self, game_id: str, stopped=None):
+        board = chess.Board()
+        for event in super()._stream_game_state(game_id, stopped):
+            if event.get('type') == "gameState" and event.get('status') == "started":
+                try:
+                    board.reset()
+                    for move in event.get('moves', "").split():
+                        board.push_uci(move)
+                    self.sent.append((perf_counter(), board.board_fen()))
+                except ValueError:
+                    pass  # Only standard games are timed
+            yield event
+
+    def _stream_game_moves(self, game_id: str, stopped=None):
+        for event in super()._stream_game_moves(game_id, stopped):
+            if 'lm' in event and event.get('fen'):
+                self.sent.append((perf_counter(), event['fen'].split()[0]))
+            yield event
+
+
+def run_journal_replay(filename: str, speed: float = 1.0, session: int = -1, timeout: float = 600.0) -> LoadTestResult:
+    """Replays a recorded event journal through the online game model (if the
+       journal contains a played game) or the TV model (if it contains TV games)
+    """
+    client = _TimedReplayClient(load_journal(filename, session), speed)
+    saved_api = _save_api_globals()
+    api_manager.api_client = client
+    recorder = _RenderRecorder()
+    try:
+        with _ui_loop(recorder) as loop:
+            wall_start, cpu_start = perf_counter(), process_time()
+            if client.has_source(SOURCE_GSD):
+                start_event = next((entry['event'] for entry in load_journal(filename, session)
+                                    if entry['src'] == SOURCE_IEM and entry['event'].get('type') == "gameStart"), {})
+                api_manager.api_iem = IncomingEventManager()
+                model = OnlineGameModel({GameOption.COLOR: start_event.get('game', {}).get('color', "white"),
+                                         GameOption.VARIANT: "standard", GameOption.TIME_CONTROL: (1, 0),
+                                         GameOption.COMPUTER_SKILL_LEVEL: None, GameOption.RATED: False})
+                presenter = _run_on_loop(loop, OnlineGamePresenter, model)
+                recorder.board_model = presenter.board_presenter.model
+
+                _run_on_loop(loop, model.create_a_game, False)
+                wait_for(lambda: model.searching, timeout)
+                api_manager.api_iem.start()
+                wait_for(lambda: hasattr(model.game_state_dispatcher, "is_alive") and not model.game_state_dispatcher.is_alive(), timeout)
+            elif client.has_source(SOURCE_TV):
+                model = WatchTVModel(TVChannelMenuOptions(client.get_tv_channels()[0]))
+                recorder.board_model = model.board_model
+                _run_on_loop(loop, WatchTVPresenter, model)
+                tv_games = client.get_game_ids(SOURCE_TV)
+                wait_for(lambda: all(client.is_replayed(SOURCE_TV, game_id) for game_id in tv_games)
+                         and (model.game_metadata['state']['status'] or {}).get('name') not in (None, "started"), timeout)
+                model.stop_watching()
+            else:
+                raise ValueError(f"No game or TV events found in {filename}")
+
+            wall_time, cpu_time = perf_counter() - wall_start, process_time() - cpu_start
+            _run_on_loop(loop, model.cleanup)
+    finally:
+        _restore_api_globals(saved_api)
+
+    return LoadTestResult(len(client.sent), _latencies(client.sent, recorder.rendered), wall_time, cpu_time)
+
+
+def _save_api_globals() -> Dict[str, Optional[object]]:
+    return {name: getattr(api_manager, name, None) for name in ("api_session", "api_client", "api_iem", "api_ready")}
+
+
+def _restore_api_globals(saved: Dict[str, Optional[object]]) -> None:
+    session = getattr(api_manager, "api_session", None)
+    if session is not None and session is not saved['api_session']:
+        session.close()
+    for name, value in saved.items():
+        setattr(api_manager, name, value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cli-chess load harness using a local fake Lichess server")
+    parser.add_argument("--mode", choices=["game", "tv"], default="game", help="drive an online game or a TV stream")
+    parser.add_argument("--moves", type=int, default=200, help="number of moves to stream")
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between bursts of events")
+    parser.add_argument("--burst", type=int, default=1, help="events sent per burst")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of latency added to each request")
+    parser.add_argument("--journal", metavar="FILE", help="replay a journal recorded with `cli-chess --journal` instead")
+    parser.add_argument("--speed", type=float, default=1.0, help="journal replay speed multiplier (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    if args.journal:
+        result = run_journal_replay(args.journal, speed=args.speed)
+    else:
+        run = run_game_load_test if args.mode == "game" else run_tv_load_test
+        result = run(move_count=args.moves, interval=args.interval, burst=args.burst, latency=args.latency)
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
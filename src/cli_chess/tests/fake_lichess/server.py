@@ -0,0 +1,266 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from typing import Callable, Dict, List, Optional, Tuple
+from time import perf_counter, sleep
+import threading
+import queue
+import json
+
+_CLOSE_STREAM = object()
+
+
+class ScriptedStream:
+    """The script that is replayed to every client connecting to a stream endpoint.
+       Events are sent in bursts of `burst` events with `interval` seconds between
+       each burst. A `None` event is sent as an empty keep-alive line. If `keep_open`
+       is True the connection stays open after the script completes so events
+       can be pushed to it (see `FakeLichessServer.push`).
+    """
+    def __init__(self, events: List[Optional[dict]], interval: float = 0.0, burst: int = 1, keep_open: bool = False):
+        self.events = list(events)
+        self.interval = interval
+        self.burst = max(1, burst)
+        self.keep_open = keep_open
+
+
+class _StreamConnection:
+    """A single client connection to a scripted stream"""
+    def __init__(self, script: ScriptedStream):
+        self.script = script
+        self.queue = queue.Queue()
+        for event in script.events:
+            self.queue.put(event)
+        if not script.keep_open:
+            self.queue.put(_CLOSE_STREAM)
+
+    def close(self) -> None:
+        self.queue.put(_CLOSE_STREAM)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Serves the routes registered on the owning FakeLichessServer. Like Lichess,
+       streams use chunked transfer encoding so each event reaches the client as
+       soon as it's written. The connection is closed when a stream ends.
+    """
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None: # noqa
+        self._handle("GET")
+
+    def do_POST(self) -> None: # noqa
+        self._handle("POST")
+
+    def log_message(self, format, *args) -> None: # noqa
+        pass
+
+    def _handle(self, method: str) -> None:
+        owner = self.server.owner
+        path = urlsplit(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode() if length else ""
+        owner._record_request(method, path, body)
+
+        if owner.latency:
+            sleep(owner.latency)
+
+        script = owner.streams.get(path) if method == "GET" else None
+        if script:
+            self._send_stream(path, script)
+        else:
+            status, data = owner.responses.get((method, path), (404, {"error": "Not found"}))
+            self._send_json(status, data)
+
+        owner._run_request_hooks(method, path)
+
+    def _send_json(self, status: int, data) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_stream(self, path: str, script: ScriptedStream) -> None:
+        owner = self.server.owner
+        connection = owner._open_connection(path, script)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.flush()
+            self.close_connection = True
+
+            while True:
+                batch = [connection.queue.get()]
+                while len(batch) < script.burst and not connection.queue.empty():
+                    batch.append(connection.queue.get_nowait())
+
+                closing = _CLOSE_STREAM in batch
+                batch = [event for event in batch if event is not _CLOSE_STREAM]
+                data = b"".join(b"\n" if event is None else json.dumps(event).encode() + b"\n" for event in batch)
+                if data:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                    owner._record_sent(path, batch)
+
+                if closing:
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                    break
+                if script.interval and not connection.queue.empty():
+                    sleep(script.interval)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            owner._close_connection(path, connection)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, owner: "FakeLichessServer"):
+        self.owner = owner
+        super().__init__(("127.0.0.1", 0), _RequestHandler)
+
+
+class FakeLichessServer:
+    """A local stand-in for the Lichess API. Replays scripted NDJSON streams
+       and canned JSON responses so the API consumers (GameStateDispatcher,
+       IncomingEventManager, WatchTVModel, etc.) can be exercised without
+       reaching lichess.org. Use as a context manager or call start/stop.
+    """
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.streams: Dict[str, ScriptedStream] = {}
+        self.responses: Dict[Tuple[str, str], Tuple[int, object]] = {}
+        self.requests: List[Tuple[str, str, str]] = []
+        self.sent_events: Dict[str, List[Tuple[float, Optional[dict]]]] = {}
+        self._hooks: Dict[Tuple[str, str], List[Callable[[], None]]] = {}
+        self._connections: Dict[str, List[_StreamConnection]] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[_HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "FakeLichessServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Returns the base url to pass to the API client"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Starts serving requests on a random local port"""
+        self._httpd = _HTTPServer(self)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), name="fake-lichess", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Closes all open streams and stops the server"""
+        with self._lock:
+            connections = [c for conns in self._connections.values() for c in conns]
+        for connection in connections:
+            connection.close()
+
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def set_stream(self, path: str, events: List[Optional[dict]], interval: float = 0.0,
+                   burst: int = 1, keep_open: bool = False) -> None:
+        """Registers a scripted NDJSON stream at the passed in path"""
+        self.streams[path] = ScriptedStream(events, interval, burst, keep_open)
+
+    def set_response(self, method: str, path: str, data, status: int = 200) -> None:
+        """Registers a canned JSON response for the method and path"""
+        self.responses[(method, path)] = (status, data)
+
+    def on_request(self, method: str, path: str, hook: Callable[[], None]) -> None:
+        """Registers a hook that is called after a request to the method and path
+           has been answered. Useful to push events in reaction to a client request
+           (e.g. a gameStart event after a challenge is created).
+        """
+        self._hooks.setdefault((method, path), []).append(hook)
+
+    def push(self, path: str, event: Optional[dict]) -> None:
+        """Sends the event to all clients currently connected to the stream"""
+        with self._lock:
+            connections = list(self._connections.get(path, []))
+        for connection in connections:
+            connection.queue.put(event)
+
+    def close_streams(self, path: str) -> None:
+        """Ends all open client connections to the stream"""
+        with self._lock:
+            connections = list(self._connections.get(path, []))
+        for connection in connections:
+            connection.close()
+
+    def open_stream_count(self, path: Optional[str] = None) -> int:
+        """Returns the number of streams currently being served"""
+        with self._lock:
+            if path:
+                return len(self._connections.get(path, []))
+            return sum(len(conns) for conns in self._connections.values())
+
+    def wait_for_stream(self, path: str, timeout: float = 5.0) -> bool:
+        """Blocks until a client is connected to the stream, or the timeout elapses"""
+        end = perf_counter() + timeout
+        while perf_counter() < end:
+            if self.open_stream_count(path):
+                return True
+            sleep(0.005)
+        return False
+
+    def request_count(self, method: str, path: str) -> int:
+        """Returns the number of requests received for the method and path"""
+        with self._lock:
+            return sum(1 for m, p, _ in self.requests if m == method and p == path)
+
+    def _record_request(self, method: str, path: str, body: str) -> None:
+        with self._lock:
+            self.requests.append((method, path, body))
+
+    def _record_sent(self, path: str, events: List[Optional[dict]]) -> None:
+        now = perf_counter()
+        with self._lock:
+            self.sent_events.setdefault(path, []).extend((now, event) for event in events)
+
+    def _run_request_hooks(self, method: str, path: str) -> None:
+        for hook in self._hooks.get((method, path), []):
+            hook()
+
+    def _open_connection(self, path: str, script: ScriptedStream) -> _StreamConnection:
+        connection = _StreamConnection(script)
+        with self._lock:
+            self._connections.setdefault(path, []).append(connection)
+        return connection
+
+    def _close_connection(self, path: str, connection: _StreamConnection) -> None:
+        with self._lock:
+            self._connections.get(path, []).remove(connection)
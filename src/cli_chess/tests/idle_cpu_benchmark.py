@@ -0,0 +1,79 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the CPU used by cli-chess while idle on the main menu. The main
+   view is run headless (piped input and a dummy output) so the layout is
+   still rendered on each redraw. Pass --refresh-interval to compare with
+   redrawing on a fixed interval (which cli-chess used to do every 0.5s).
+
+   Run with: python -m cli_chess.tests.idle_cpu_benchmark --help
+"""
+
+from time import process_time
+from typing import Dict, Optional
+import tempfile
+import argparse
+import asyncio
+import sys
+import os
+
+
+def run_benchmark(seconds: float = 5.0, refresh_interval: Optional[float] = None) -> Dict[str, float]:
+    """Runs the main view idle for the passed in number of seconds and returns
+       the CPU time used (in milliseconds per second) and the number of redraws
+    """
+    # Imported here so the configuration is created in the temporary home directory
+    from cli_chess.core.main import MainModel, MainPresenter
+    from cli_chess.utils.event import ui_dispatcher
+    from prompt_toolkit.application import create_app_session
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.output import DummyOutput
+
+    sys.argv = sys.argv[:1]
+    with create_pipe_input() as pipe_input, create_app_session(input=pipe_input, output=DummyOutput()):
+        app = MainPresenter(MainModel()).view.app
+        app.refresh_interval = refresh_interval
+
+        async def _run() -> Dict[str, float]:
+            task = asyncio.ensure_future(app.run_async(pre_run=lambda: ui_dispatcher.attach(invalidate=app.invalidate)))
+            await asyncio.sleep(0.5)  # Let the startup renders complete
+            start_cpu, start_renders = process_time(), app.render_counter
+            await asyncio.sleep(seconds)
+            results = {
+                'cpu_ms_per_second': (process_time() - start_cpu) * 1000 / seconds,
+                'redraws': app.render_counter - start_renders,
+            }
+            app.exit()
+            await task
+            ui_dispatcher.detach()
+            return results
+
+        return asyncio.run(_run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Idle CPU benchmark")
+    parser.add_argument("-s", "--seconds", type=float, default=5.0, help="Number of seconds to measure for")
+    parser.add_argument("-r", "--refresh-interval", type=float, default=None, help="Redraw on this interval (in seconds)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = os.environ["USERPROFILE"] = home
+        results = run_benchmark(args.seconds, args.refresh_interval)
+    print(f"CPU: {results['cpu_ms_per_second']:.2f}ms per second, redraws: {results['redraws']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -132,6 +132,36 @@ def test_make_moves_from_list(model: BoardModel, board_updated_listener: Mock):
     board_updated_listener.assert_not_called()
 
 
+def test_sync_moves(model: BoardModel, board_updated_listener: Mock, monkeypatch):
+    model.sync_moves(["e2e4", "e7e5", "g1f3"])
+    assert [move.uci() for move in model.get_move_stack()] == ["e2e4", "e7e5", "g1f3"]
+    assert model.get_highlight_move() == chess.Move.from_uci("g1f3")
+    board_updated_listener.assert_called_once()
+
+    # Only moves which differ from the move stack are taken back and made
+    pops = []
+    original_pop = model.board.pop
+    monkeypatch.setattr(model.board, "pop", lambda: pops.append(True) or original_pop())
+    model.sync_moves(["e2e4", "e7e5", "b1c3", "b8c6"])
+    assert [move.uci() for move in model.get_move_stack()] == ["e2e4", "e7e5", "b1c3", "b8c6"]
+    assert len(pops) == 1
+
+    # Syncing the same moves doesn't notify listeners
+    board_updated_listener.reset_mock()
+    model.sync_moves(["e2e4", "e7e5", "b1c3", "b8c6"])
+    board_updated_listener.assert_not_called()
+
+    # A takeback
+    model.sync_moves(["e2e4", "e7e5"])
+    assert model.get_highlight_move() == chess.Move.from_uci("e7e5")
+    model.sync_moves([])
+    assert model.board.fen() == chess.STARTING_FEN
+    assert model.get_highlight_move() == chess.Move.null()
+
+    with pytest.raises(ValueError):
+        model.sync_moves(["e2e5"])
+
+
 def test_takeback(model: BoardModel, board_updated_listener: Mock):
     # Test empty move stack
     model.board.reset()
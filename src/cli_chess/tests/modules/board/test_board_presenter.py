@@ -53,32 +53,20 @@ def test_update(model: BoardModel, presenter: BoardPresenter, game_config: GameC
     presenter.view.update.assert_called_with(board_output_data)
 
 
-def test_update_cached_config_values(model: BoardModel, presenter: BoardPresenter, game_config: GameConfig):
-    # Verify the method is listening to game configuration updates
-    assert presenter._update_cached_config_values in game_config.e_game_config_updated.listeners
+def test_game_config_update(model: BoardModel, presenter: BoardPresenter, game_config: GameConfig):
+    # Verify the board is updated on game configuration updates
+    assert presenter.update in game_config.e_game_config_updated.listeners
 
-    # Test initial assignment
-    assert presenter.game_config_values == game_config.get_all_values()
-
-    # Test game_config listener notification is working
-    # (manual calls to _update_cached_config_values shouldn't be required)
+    # The presenter reads the latest configuration snapshot
+    presenter.view.update = Mock()
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "yes")
     game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "no")
-    assert presenter.game_config_values == game_config.get_all_values()
-    assert presenter.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-    assert not presenter.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
-
-    # Remove game config notification listener and verify updates don't come through
-    game_config.e_game_config_updated.remove_listener(presenter._update_cached_config_values)
-    assert presenter.game_config_values == game_config.get_all_values()
-    game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "yes")
-    assert presenter.game_config_values != game_config.get_all_values()
+    assert presenter.view.update.call_count == 2
+    assert game_config.get_snapshot().blindfold_chess
+    assert presenter.get_piece_str(chess.E1) == ""
 
-    # With listener removed, manually call the function and verify it works by itself
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "no")
-    assert presenter.game_config_values != game_config.get_all_values()
-    presenter._update_cached_config_values()
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.get_piece_str(chess.E1) == "K"
 
 
 def test_make_move(model: BoardModel, presenter: BoardPresenter):
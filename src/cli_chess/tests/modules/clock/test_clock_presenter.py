@@ -0,0 +1,113 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.core.game import GameModelBase
+from cli_chess.modules.clock import ClockPresenter
+from cli_chess.modules.clock.clock_presenter import TICK_MARGIN_SECONDS
+from cli_chess.utils.event import ui_dispatcher
+from chess import WHITE, BLACK
+from unittest.mock import Mock
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def model():
+    return GameModelBase()
+
+
+@pytest.fixture
+def presenter(model: GameModelBase):
+    presenter = ClockPresenter(model)
+    yield presenter
+    presenter.stop()
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('cli_chess.modules.clock.clock_presenter.monotonic', lambda: now[0])
+    monkeypatch.setattr('cli_chess.core.game.game_model_base.monotonic', lambda: now[0])
+    return now
+
+
+def set_clock(model: GameModelBase, white_time, black_time, running: bool, units="ms"):
+    model.game_metadata['clock']['units'] = units
+    model.game_metadata['clock']['white']['time'] = white_time
+    model.game_metadata['clock']['black']['time'] = black_time
+    model._set_clock_running(running)
+
+
+def test_clock_display(model: GameModelBase, presenter: ClockPresenter, now):
+    assert presenter.get_clock_display(WHITE) == "--:--"
+    set_clock(model, 180000, 3723000, running=False)
+    assert presenter.get_clock_display(WHITE) == "03:00"
+    assert presenter.get_clock_display(BLACK) == "01:02:03"
+
+    # Clocks which aren't running don't count down
+    now[0] += 5
+    assert presenter.get_clock_display(WHITE) == "03:00"
+    assert presenter.get_tick_interval() is None
+
+
+def test_countdown(model: GameModelBase, presenter: ClockPresenter, now):
+    set_clock(model, 60.5, 60, running=True, units="sec")
+
+    # Only the clock of the side to move counts down
+    now[0] += 0.3
+    assert presenter.get_clock_display(WHITE) == "01:00"
+    assert presenter.get_tick_interval() == pytest.approx(0.2 + TICK_MARGIN_SECONDS)
+    now[0] += 0.5
+    assert presenter.get_clock_display(WHITE) == "00:59"
+    assert presenter.get_clock_display(BLACK) == "01:00"
+    assert presenter.get_tick_interval() == pytest.approx(0.7 + TICK_MARGIN_SECONDS)
+
+    model.board_model.make_move("e4")
+    set_clock(model, 59.7, 60, running=True, units="sec")
+    now[0] += 2
+    assert presenter.get_clock_display(WHITE) == "00:59"
+    assert presenter.get_clock_display(BLACK) == "00:58"
+
+    # Clocks stop at zero
+    now[0] += 120
+    assert presenter.get_clock_display(BLACK) == "00:00"
+    assert presenter.get_tick_interval() is None
+
+
+@pytest.mark.enable_socket
+def test_ticker(model: GameModelBase, presenter: ClockPresenter):
+    loop = asyncio.new_event_loop()
+    invalidate = Mock()
+    ui_dispatcher.attach(loop, invalidate=invalidate)
+    try:
+        # Nothing is scheduled while the clocks are idle
+        set_clock(model, 30000, 30000, running=False)
+        presenter.update(successfulMoveMade=True)
+        loop.run_until_complete(asyncio.sleep(0.1))
+        invalidate.assert_not_called()
+
+        set_clock(model, 30150, 30000, running=True)
+        presenter.update(successfulMoveMade=True)
+        assert presenter.view_lower.time_str == "00:30"
+        loop.run_until_complete(asyncio.sleep(0.3))
+        assert presenter.view_lower.time_str == "00:29"
+        invalidate.assert_called_once()
+
+        presenter.stop()
+        loop.run_until_complete(asyncio.sleep(1.1))
+        invalidate.assert_called_once()
+    finally:
+        ui_dispatcher.detach()
+        loop.close()
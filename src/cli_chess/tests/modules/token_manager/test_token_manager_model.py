@@ -14,10 +14,16 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from cli_chess.modules.token_manager import TokenManagerModel
+from cli_chess.modules.token_manager.token_manager_model import TOKEN_VALIDATION_TTL_SECONDS, INVALID_TOKEN_ERROR, TOKEN_CONNECTION_ERROR
 from cli_chess.utils.config import LichessConfig
+from cli_chess.tests.fake_lichess import wait_for
 from berserk import clients
+from berserk.exceptions import ApiError, ResponseError
+from requests import ConnectionError, Response
 from os import remove
 from unittest.mock import Mock
+from time import sleep, time
+import threading
 import pytest
 
 
@@ -90,6 +96,95 @@ def test_validate_token(model: TokenManagerModel, monkeypatch):
     assert model.validate_token(api_token="lip_validToken") == mock_success_test_tokens()['lip_validToken']
 
 
+def test_validation_cache(model: TokenManagerModel, lichess_config: LichessConfig, monkeypatch):
+    test_tokens = Mock(side_effect=mock_success_test_tokens)
+    monkeypatch.setattr(clients.OAuth, "test_tokens", test_tokens)
+    assert model.update_linked_account(api_token="lip_validToken")
+    assert test_tokens.call_count == 1
+    assert "lip_validToken" not in lichess_config.get_value(lichess_config.Keys.VALIDATED_TOKEN_HASH)
+
+    # The scopes of an unchanged token are trusted until the TTL expires
+    assert model.update_linked_account(api_token="lip_validToken")
+    assert test_tokens.call_count == 1
+    assert model.linked_account == "testUser"
+
+    expired = time() - TOKEN_VALIDATION_TTL_SECONDS - 1
+    lichess_config.set_value(lichess_config.Keys.VALIDATED_TOKEN_TIME, str(int(expired)))
+    assert model.update_linked_account(api_token="lip_validToken")
+    assert test_tokens.call_count == 2
+
+    # A different token is always validated
+    monkeypatch.setattr(clients.OAuth, "test_tokens", mock_fail_test_tokens)
+    assert not model.update_linked_account(api_token="lip_badToken")
+
+
+def test_update_linked_account_async(model: TokenManagerModel, lichess_config: LichessConfig, monkeypatch):
+    release = threading.Event()
+
+    def slow_test_tokens(*args):
+        release.wait(5)
+        return mock_success_test_tokens()
+
+    monkeypatch.setattr(clients.OAuth, "test_tokens", slow_test_tokens)
+    model.update_linked_account_async("lip_validToken")
+    assert model.validation_pending and not model.linked_account
+
+    release.set()
+    assert wait_for(lambda: not model.validation_pending)
+    assert model.linked_account == "testUser" and not model.validation_error
+    assert lichess_config.get_value(lichess_config.Keys.API_TOKEN) == "lip_validToken"
+
+    monkeypatch.setattr(clients.OAuth, "test_tokens", mock_fail_test_tokens)
+    model.update_linked_account_async("lip_badToken")
+    assert wait_for(lambda: not model.validation_pending)
+    assert model.validation_error == INVALID_TOKEN_ERROR
+    assert lichess_config.get_value(lichess_config.Keys.API_TOKEN) == "lip_validToken"
+
+
+@pytest.mark.parametrize("error, validation_error", [
+    (ApiError(ConnectionError("Offline")), TOKEN_CONNECTION_ERROR),
+    (401, INVALID_TOKEN_ERROR),
+    (503, TOKEN_CONNECTION_ERROR),
+])
+def test_validation_errors(model: TokenManagerModel, lichess_config: LichessConfig, monkeypatch, error, validation_error):
+    if isinstance(error, int):
+        response = Response()
+        response.status_code = error
+        error = ResponseError(response)
+
+    # Only a token rejected by Lichess is reported as invalid
+    monkeypatch.setattr(clients.OAuth, "test_tokens", Mock(side_effect=error))
+    lichess_config.set_value(lichess_config.Keys.API_TOKEN, "lip_validToken")
+    model.update_linked_account_async("lip_newToken")
+    assert wait_for(lambda: not model.validation_pending)
+    assert model.validation_error == validation_error
+    assert lichess_config.get_value(lichess_config.Keys.API_TOKEN) == "lip_validToken"
+
+
+def test_superseded_validation(model: TokenManagerModel, lichess_config: LichessConfig, monkeypatch):
+    release = threading.Event()
+
+    def slow_test_tokens(*args):
+        release.wait(5)
+        return {'lip_staleToken': dict(mock_success_test_tokens()['lip_validToken'], userId='staleUser')}
+
+    # The existing token is still being validated when a new token is linked
+    lichess_config.set_value(lichess_config.Keys.API_TOKEN, "lip_staleToken")
+    monkeypatch.setattr(clients.OAuth, "test_tokens", slow_test_tokens)
+    model.validate_existing_linked_account()
+    assert model.validation_pending
+
+    monkeypatch.setattr(clients.OAuth, "test_tokens", mock_success_test_tokens)
+    assert model.update_linked_account(api_token="lip_validToken")
+    assert not model.validation_pending
+
+    # The result of the stale validation is dropped
+    release.set()
+    sleep(0.1)
+    assert model.linked_account == "testUser"
+    assert lichess_config.get_value(lichess_config.Keys.API_TOKEN) == "lip_validToken"
+
+
 def test_save_account_data(model: TokenManagerModel, lichess_config: LichessConfig, model_listener: Mock):
     assert lichess_config.get_value(lichess_config.Keys.API_TOKEN) == ""
     model_listener.assert_not_called()
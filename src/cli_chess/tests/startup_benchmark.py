@@ -0,0 +1,66 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the import time of cli-chess using `python -X importtime`. The
+   commands which exit right away (e.g. --version) should start quickly, so
+   they must not import the UI or any of the UI_PACKAGES.
+
+   Run with: python -m cli_chess.tests.startup_benchmark --help
+"""
+
+from typing import List, Tuple
+import subprocess
+import tempfile
+import argparse
+import sys
+import os
+
+# Packages which are slow to import and are only needed once the UI is loaded
+UI_PACKAGES = ("prompt_toolkit", "berserk", "requests", "chess")
+
+
+def run_startup(args: List[str]) -> Tuple[subprocess.CompletedProcess, List[Tuple[str, float]]]:
+    """Runs cli-chess with the passed in arguments and returns the completed process along
+       with the imported modules and their cumulative import time in milliseconds. A
+       temporary home directory is used so the user's configuration isn't touched.
+    """
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        process = subprocess.run([sys.executable, "-X", "importtime", "-m", "cli_chess", *args],
+                                 capture_output=True, text=True, env=env)
+
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((module.strip(), int(cumulative) / 1000))
+    return process, imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("-t", "--top", type=int, default=15, help="Number of the slowest imports to print")
+    parser.add_argument("args", nargs="*", default=["--version"], help="Arguments to start cli-chess with")
+    args = parser.parse_args()
+
+    _, imports = run_startup(args.args)
+    print(f"{len(imports)} modules imported")
+    for module, cumulative in sorted(imports, key=lambda i: i[1], reverse=True)[:args.top]:
+        print(f"{cumulative:8.1f}ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.tests.startup_benchmark import run_startup, UI_PACKAGES
+import pytest
+
+
+@pytest.mark.parametrize("args", [["--version"], ["--print-config"]])
+def test_info_commands_skip_ui(args):
+    process, imports = run_startup(args)
+
+    assert process.returncode == 0, process.stderr
+    modules = {module for module, _ in imports}
+    assert not any(module.startswith(("cli_chess.core.main.main_presenter", "cli_chess.menus", "cli_chess.modules")) for module in modules)
+    assert not [module for module in modules if module.split(".")[0] in UI_PACKAGES]
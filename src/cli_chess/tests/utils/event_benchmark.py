@@ -0,0 +1,78 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the cost of dispatching an event, comparing listeners which are
+   notified of every update and check the kwargs themselves (as the game
+   presenters used to) to listeners subscribed to the topics they handle.
+
+   Run with: python -m cli_chess.tests.utils.event_benchmark --help
+"""
+
+from cli_chess.utils.event import Event
+from time import perf_counter
+from typing import Dict, List
+import argparse
+
+
+class _Listener:
+    """A listener which acts on a single topic"""
+    def __init__(self, topic: str):
+        self.topic = topic
+        self.calls = 0
+
+    def update(self, **kwargs) -> None:
+        if self.topic in kwargs:
+            self.calls += 1
+
+
+def _create_event(listeners: List[_Listener], use_topics: bool) -> Event:
+    event = Event()
+    for listener in listeners:
+        event.add_listener(listener.update, topics=(listener.topic,) if use_topics else None)
+    return event
+
+
+def run_benchmark(notifications: int = 100000, listener_count: int = 10) -> Dict[str, float]:
+    """Returns the dispatch cost per event (in microseconds) with and without topics.
+       Each listener handles its own topic, and each event is of a single topic.
+    """
+    results = {}
+    topics = [f"topic{i}" for i in range(listener_count)]
+    kwargs = [{topic: True} for topic in topics]
+    for name, use_topics in (("all listeners", False), ("topics", True)):
+        listeners = [_Listener(topic) for topic in topics]
+        event = _create_event(listeners, use_topics)
+
+        start = perf_counter()
+        for i in range(notifications):
+            event.notify(**kwargs[i % listener_count])
+        results[name] = (perf_counter() - start) / notifications * 1e6
+
+        assert sum(listener.calls for listener in listeners) == notifications
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event dispatch benchmark")
+    parser.add_argument("-n", "--notifications", type=int, default=100000, help="Number of events to notify")
+    parser.add_argument("-l", "--listeners", type=int, default=10, help="Number of listeners (one per topic)")
+    args = parser.parse_args()
+
+    for name, cost in run_benchmark(args.notifications, args.listeners).items():
+        print(f"{name}: {cost:.2f}us per event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.common import RetryPolicy, retry
+from time import monotonic
+from unittest.mock import Mock
+import pytest
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('cli_chess.utils.common.sleep', sleeps.append)
+    return sleeps
+
+
+def test_retry_attempts(sleeps):
+    fn = Mock(side_effect=ValueError("Failed"))
+    with pytest.raises(ValueError):
+        retry(times=3, exceptions=(ValueError,))(fn)()
+    assert fn.call_count == 3 and len(sleeps) == 2
+
+    # Exceptions which aren't listed aren't retried
+    fn = Mock(side_effect=KeyError("Failed"))
+    with pytest.raises(KeyError):
+        retry(times=3, exceptions=(ValueError,))(fn)()
+    assert fn.call_count == 1
+
+    fn = Mock(side_effect=[ValueError("Failed"), "Done"])
+    assert retry(times=3, exceptions=(ValueError,))(fn)() == "Done"
+    assert fn.call_count == 2
+
+
+def test_backoff(sleeps):
+    policy = RetryPolicy(attempts=6, base_delay=0.25, max_delay=2.0, jitter=0)
+    with pytest.raises(ValueError):
+        policy.run(Mock(side_effect=ValueError("Failed")))
+    assert sleeps == [0.25, 0.5, 1.0, 2.0, 2.0]
+
+
+def test_jitter():
+    policy = RetryPolicy(base_delay=1.0, jitter=0.5)
+    delays = [policy.get_delay(1) for _ in range(100)]
+    assert all(0.5 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_on(sleeps):
+    fn = Mock(side_effect=ValueError("Not retryable"))
+    policy = RetryPolicy(attempts=3, retry_on=lambda e: "Not" not in str(e))
+    with pytest.raises(ValueError):
+        policy.run(fn)
+    assert fn.call_count == 1 and not sleeps
+
+
+def test_deadline(sleeps):
+    fn = Mock(side_effect=ValueError("Failed"))
+    policy = RetryPolicy(attempts=5, base_delay=1.0, jitter=0)
+    with pytest.raises(ValueError):
+        policy.run(fn, deadline=monotonic() + 1.5)
+
+    # Retries which would be made after the deadline are given up
+    assert fn.call_count == 2 and sleeps == [1.0]
+
+
+def test_min_delay(sleeps):
+    policy = RetryPolicy(attempts=2, base_delay=0.1, jitter=0, min_delay=lambda e: 5.0 if "Paused" in str(e) else 0)
+    policy.run(Mock(side_effect=[ValueError("Paused"), None]))
+    policy.run(Mock(side_effect=[ValueError("Failed"), None]))
+    assert sleeps == [5.0, 0.1]
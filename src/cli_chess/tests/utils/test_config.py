@@ -0,0 +1,129 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.config import GameConfig, LichessConfig, ConfigDocument
+from os import listdir
+import configparser
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr('cli_chess.utils.config.get_config_path', lambda: str(tmp_path) + "/")
+    return tmp_path
+
+
+def read_file(filename: str) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read(filename)
+    return parser
+
+
+def test_shared_document(config_path):
+    game_config = GameConfig("unit_test_config.ini")
+    lichess_config = LichessConfig("unit_test_config.ini")
+    assert game_config.document is lichess_config.document
+
+    # Writes of one section don't drop the values written by another
+    lichess_config.set_value(lichess_config.Keys.API_TOKEN, "lip_unitTest")
+    game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "True")
+    parser = read_file(game_config.full_filename)
+    assert parser.get("lichess", "api_token") == "lip_unitTest"
+    assert parser.getboolean("game", "blindfold_chess")
+
+    # Writes are atomic, so no temporary files are left behind
+    assert listdir(config_path) == ["unit_test_config.ini"]
+
+
+def test_reload_on_external_change(config_path):
+    game_config = GameConfig("unit_test_config.ini")
+    game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "True")
+
+    (config_path / "unit_test_config.ini").unlink()
+    game_config = GameConfig("unit_test_config.ini")
+    assert not game_config.get_boolean(game_config.Keys.BLINDFOLD_CHESS)
+
+
+def test_document_write(config_path):
+    filename = str(config_path / "sub" / "document.ini")
+    document = ConfigDocument(filename)
+    document.parser["section"] = {"key": "value"}
+    document.write()
+    assert read_file(filename).get("section", "key") == "value"
+
+
+def test_create_section_single_write(config_path, monkeypatch):
+    writes = []
+    original_write = ConfigDocument.write
+    monkeypatch.setattr(ConfigDocument, "write", lambda self: writes.append(self) or original_write(self))
+    GameConfig("unit_test_config.ini")
+    assert len(writes) == 1
+
+
+def test_batch(config_path, monkeypatch):
+    game_config = GameConfig("unit_test_config.ini")
+    notifications = []
+    game_config.e_game_config_updated.add_listener(lambda: notifications.append(True))
+    writes = []
+    original_write = ConfigDocument.write
+    monkeypatch.setattr(ConfigDocument, "write", lambda self: writes.append(self) or original_write(self))
+
+    with game_config.batch():
+        game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "True")
+        with game_config.batch():
+            game_config.set_value(game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE, "True")
+        assert not writes and not notifications
+
+    assert len(writes) == 1 and len(notifications) == 1
+    parser = read_file(game_config.full_filename)
+    assert parser.getboolean("game", "blindfold_chess")
+    assert parser.getboolean("game", "show_move_list_in_unicode")
+
+
+def test_debounced_writes(config_path, monkeypatch):
+    game_config = GameConfig("unit_test_config.ini")
+    notifications = []
+    game_config.e_game_config_updated.add_listener(lambda: notifications.append(True))
+    writes = []
+    original_write = ConfigDocument.write
+    monkeypatch.setattr(ConfigDocument, "write", lambda self: writes.append(self) or original_write(self))
+
+    for enabled in (True, False, True):
+        game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, str(enabled), debounce=True)
+
+    # Listeners are notified right away, while the file is written once
+    assert len(notifications) == 3 and not writes
+    game_config.document.flush()
+    game_config.document.flush()
+    assert len(writes) == 1
+    assert read_file(game_config.full_filename).getboolean("game", "blindfold_chess")
+
+
+def test_game_config_snapshot(config_path):
+    game_config = GameConfig("unit_test_config.ini")
+    snapshot = game_config.get_snapshot()
+    assert snapshot.show_board_coordinates and not snapshot.blindfold_chess
+    assert game_config.get_snapshot() is snapshot
+    with pytest.raises(AttributeError):
+        snapshot.blindfold_chess = True
+
+    # A new snapshot is swapped in on change, before listeners are notified
+    snapshots = []
+    game_config.e_game_config_updated.add_listener(lambda: snapshots.append(game_config.get_snapshot()))
+    game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "True")
+    assert snapshots[0].blindfold_chess and not snapshot.blindfold_chess
+
+    # Sections sharing the document see the same values
+    assert GameConfig("unit_test_config.ini").get_snapshot() == snapshots[0]
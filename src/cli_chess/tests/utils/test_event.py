@@ -14,7 +14,12 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from cli_chess.utils import Event, EventManager
+from cli_chess.utils.event import ui_dispatcher, event_tracer
+from cli_chess.tests.utils.event_benchmark import run_benchmark
 from unittest.mock import Mock
+import threading
+import asyncio
+import gc
 import pytest
 
 
@@ -35,6 +40,39 @@ def event(listener1):
     return event
 
 
+@pytest.fixture
+def invalidate():
+    return Mock()
+
+
+@pytest.fixture
+def ui_loop(invalidate: Mock):
+    loop = asyncio.new_event_loop()
+    ui_dispatcher.attach(loop, invalidate=invalidate)
+    yield loop
+    ui_dispatcher.detach()
+    loop.close()
+
+
+def notify_from_thread(event: Event, *args, **kwargs):
+    thread = threading.Thread(target=lambda: event.notify(*args, **kwargs))
+    thread.start()
+    thread.join()
+
+
+def run_loop(loop: asyncio.AbstractEventLoop):
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+
+@pytest.fixture
+def tracer():
+    event_tracer.reset()
+    event_tracer.start(dump_on_exit=False)
+    yield event_tracer
+    event_tracer.stop()
+    event_tracer.reset()
+
+
 @pytest.fixture
 def event_manager():
     event_manger = EventManager()
@@ -92,6 +130,174 @@ class TestEvent:
         listener1.assert_not_called()
         listener2.assert_not_called()
 
+    def test_topics(self, event: Event, listener1: Mock, listener2: Mock):
+        event.add_listener(listener2, topics=("successfulMoveMade", "boardOrientationChanged"))
+
+        # Listeners with topics are only notified of updates of these topics
+        event.notify(tvPositionUpdated=True)
+        event.notify()
+        listener2.assert_not_called()
+        event.notify(successfulMoveMade=True, isGameOver=False)
+        listener2.assert_called_once_with(successfulMoveMade=True, isGameOver=False)
+        assert listener1.call_count == 3
+
+        # Subscribing again widens the subscription
+        event.add_listener(listener2, topics=("tvPositionUpdated",))
+        event.notify(tvPositionUpdated=True)
+        assert listener2.call_count == 2
+        event.add_listener(listener2)
+        event.notify()
+        assert listener2.call_count == 3
+
+    def test_dispatch_benchmark(self):
+        results = run_benchmark(notifications=1000, listener_count=5)
+        assert set(results) == {"all listeners", "topics"}
+
+    def test_weak_listener(self, event: Event, listener1: Mock):
+        class Listener:
+            def __init__(self):
+                self.calls = 0
+
+            def update(self):
+                self.calls += 1
+
+        listener = Listener()
+        event.add_listener(listener.update, weak=True)
+        event.add_listener(listener.update, weak=True)
+        assert event.listeners.count(listener.update) == 1
+
+        event.notify()
+        assert listener.calls == 1
+
+        # The listener doesn't keep its object alive, and is removed once collected
+        del listener
+        gc.collect()
+        assert event.listeners == [listener1]
+        event.notify()
+
+        listener = Listener()
+        event.add_listener(listener.update, ui=True, weak=True)
+        event.remove_listener(listener.update)
+        assert event.listeners == [listener1]
+
+
+@pytest.mark.enable_socket  # The event loop uses a socket pair to wake up
+class TestUIDispatcher:
+    def test_ui_listener(self, ui_loop, event: Event, listener1: Mock):
+        calls = []
+        ui_listener = Mock(side_effect=lambda *args, **kwargs: calls.append(threading.get_ident()))
+        event.add_listener(ui_listener, ui=True)
+        assert ui_listener in event.listeners
+
+        # Regular listeners are called on the notifying thread, UI listeners on the loop
+        notify_from_thread(event, move=1)
+        listener1.assert_called_once_with(move=1)
+        ui_listener.assert_not_called()
+        run_loop(ui_loop)
+        ui_listener.assert_called_once_with(move=1)
+        assert calls == [threading.get_ident()]
+
+        # Notifications made on the loop thread are not posted
+        event.notify(move=2)
+        ui_listener.assert_called_with(move=2)
+
+        event.remove_listener(ui_listener)
+        assert ui_listener not in event.listeners
+
+    def test_coalescing(self, ui_loop, event: Event):
+        ui_listener = Mock()
+        event.add_listener(ui_listener, ui=True)
+        for _ in range(10):
+            notify_from_thread(event)
+        notify_from_thread(event, gameOver=True)
+        notify_from_thread(event)
+
+        # Consecutive identical calls are coalesced, and calls are never reordered
+        run_loop(ui_loop)
+        assert ui_listener.call_args_list == [((), {}), ((), {'gameOver': True}), ((), {})]
+
+        # A call is not merged into an earlier one posted before another listener's call
+        calls = []
+        event.remove_listener(ui_listener)
+        event.add_listener(lambda **kwargs: calls.append(("board", kwargs)), ui=True)
+        other_event = Event()
+        other_event.add_listener(lambda **kwargs: calls.append(("clock", kwargs)), ui=True)
+        notify_from_thread(event, move=1)
+        notify_from_thread(other_event, move=1)
+        notify_from_thread(event, move=1)
+        run_loop(ui_loop)
+        assert calls == [("board", {'move': 1}), ("clock", {'move': 1}), ("board", {'move': 1})]
+
+    def test_detached(self, event: Event):
+        ui_listener = Mock()
+        event.add_listener(ui_listener, ui=True)
+        notify_from_thread(event)
+        ui_listener.assert_called_once()
+        assert ui_dispatcher.call_later(0, Mock()) is None
+
+    def test_invalidate(self, ui_loop, invalidate: Mock, event: Event):
+        # The UI is redrawn once per batch of posted calls
+        event.add_listener(Mock(), ui=True)
+        for move in range(3):
+            notify_from_thread(event, move=move)
+        invalidate.assert_not_called()
+        run_loop(ui_loop)
+        invalidate.assert_called_once()
+
+    def test_call_later(self, ui_loop, invalidate: Mock):
+        callback = Mock()
+        ui_dispatcher.call_later(0, callback)
+        cancelled = Mock()
+        ui_dispatcher.call_later(0, cancelled).cancel()
+        run_loop(ui_loop)
+        callback.assert_called_once()
+        cancelled.assert_not_called()
+        invalidate.assert_called_once()
+
+        # Calls can only be scheduled from the loop's thread
+        handles = []
+        thread = threading.Thread(target=lambda: handles.append(ui_dispatcher.call_later(0, callback)))
+        thread.start()
+        thread.join()
+        assert handles == [None]
+
+
+class TestEventTracer:
+    class Model:
+        def __init__(self):
+            self.e_model_updated = Event()
+
+        def notify_updated(self, **kwargs):
+            self.e_model_updated.notify(**kwargs)
+
+    class Presenter:
+        def update(self, **kwargs):
+            pass
+
+    def test_trace(self, tracer, listener1: Mock):
+        model = self.Model()
+        presenter = self.Presenter()
+        model.e_model_updated.add_listener(presenter.update)
+        model.e_model_updated.add_listener(listener1, topics=("successfulMoveMade",))
+        for _ in range(3):
+            model.notify_updated()
+        model.notify_updated(successfulMoveMade=True)
+
+        event_name = "Model.notify_updated"
+        assert tracer.get_notification_counts() == {event_name: 4}
+        stats = {entry['listener']: entry for entry in tracer.get_listener_stats()}
+        assert stats["Presenter.update"]['calls'] == 4
+        assert stats["Presenter.update"]['event'] == event_name
+        assert [entry['calls'] for name, entry in stats.items() if name != "Presenter.update"] == [1]
+        assert 0 <= stats["Presenter.update"]['max_time'] <= stats["Presenter.update"]['total_time']
+        assert "Presenter.update" in tracer.format_stats()
+
+    def test_not_traced_when_stopped(self, tracer, event: Event):
+        tracer.stop()
+        event.notify()
+        assert not tracer.get_notification_counts()
+        assert not tracer.get_listener_stats()
+
 
 class TestEventManager:
     def test_create_event(self, event_manager: EventManager, listener1: Mock):
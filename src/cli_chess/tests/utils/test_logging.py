@@ -0,0 +1,127 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+from cli_chess.utils import logging as cli_chess_logging
+from cli_chess.utils.logging import configure_logger, redact_from_logs, stop_log_writer, LoggingRedactor, parse_log_level, set_log_levels
+import subprocess
+import threading
+import logging
+import pytest
+import sys
+import os
+
+LOGGER_NAME = "unit-test-logger"
+
+
+@pytest.fixture(autouse=True)
+def redactions(monkeypatch):
+    monkeypatch.setattr(cli_chess_logging, "log_redactions", [])
+    monkeypatch.setattr(cli_chess_logging, "_redaction_pattern", None)
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    monkeypatch.setattr('cli_chess.utils.config.get_config_path', lambda: str(tmp_path) + "/")
+    monkeypatch.setattr(cli_chess_logging, "_configured_loggers", [])
+    yield tmp_path
+    stop_log_writer()
+    logging.getLogger(LOGGER_NAME).handlers.clear()
+
+
+@pytest.fixture
+def logger(log_path):
+    return configure_logger(LOGGER_NAME)
+
+
+def read_log(tmp_path) -> str:
+    return (tmp_path / f"{LOGGER_NAME}.log").read_text()
+
+
+def test_redaction():
+    assert LoggingRedactor._filter("lip_token") == "lip_token"
+
+    redact_from_logs("lip_token")
+    redact_from_logs("  lip_token  ")
+    redact_from_logs("lip_token_long")
+    redact_from_logs("a.b*c")
+    assert LoggingRedactor._filter("lip_token_long lip_token a.b*c axbbc") == "******** ******** ******** axbbc"
+
+
+def test_queued_logging(logger: logging.Logger, tmp_path):
+    redact_from_logs("lip_secret")
+
+    # Records are written by the background writer rather than the logging thread
+    writes = []
+    handler = cli_chess_logging._log_file_handlers[0]
+    original_emit = handler.emit
+    handler.emit = lambda record: writes.append(threading.current_thread()) or original_emit(record)
+
+    threads = [threading.Thread(target=lambda i=i: logger.debug("Thread %d: token %s", i, "lip_secret")) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logging.getLogger("other").error("Not written to this log")
+    stop_log_writer()
+
+    output = read_log(tmp_path)
+    assert sorted(line.split("| ")[-1] for line in output.splitlines()) == [f"Thread {i}: token ********" for i in range(5)]
+    assert "lip_secret" not in output
+    assert len(writes) == 5 and not any(thread in threads for thread in writes)
+
+
+def test_log_levels(log_path, monkeypatch):
+    monkeypatch.setitem(cli_chess_logging.DEFAULT_LOG_LEVELS, LOGGER_NAME, logging.INFO)
+    logger = configure_logger(LOGGER_NAME)
+    assert logger.level == logging.INFO
+    assert cli_chess_logging.DEFAULT_LOG_LEVELS["chess.engine"] == logging.INFO
+
+    assert parse_log_level("warning") == (None, logging.WARNING)
+    assert parse_log_level(f"{LOGGER_NAME}=error") == (LOGGER_NAME, logging.ERROR)
+    with pytest.raises(ValueError):
+        parse_log_level("verbose")
+
+    set_log_levels([parse_log_level("ERROR")])
+    assert logger.level == logging.ERROR
+    set_log_levels([parse_log_level(f"{LOGGER_NAME}=DEBUG")])
+    assert logger.level == logging.DEBUG
+
+
+def test_log_rotation(log_path):
+    # The previous session's log is kept as a backup
+    (log_path / f"{LOGGER_NAME}.log").write_text("Previous session\n")
+    logger = configure_logger(LOGGER_NAME, max_bytes=1000, backup_count=2)
+    assert read_log(log_path) == ""
+    assert (log_path / f"{LOGGER_NAME}.log.1").read_text() == "Previous session\n"
+
+    for i in range(100):
+        logger.info("Line %d", i)
+    stop_log_writer()
+
+    # The size of each file is capped, and only the latest lines are kept
+    files = sorted(path.name for path in log_path.iterdir())
+    assert files == [f"{LOGGER_NAME}.log", f"{LOGGER_NAME}.log.1", f"{LOGGER_NAME}.log.2"]
+    assert all(path.stat().st_size <= 1000 for path in log_path.iterdir())
+    assert read_log(log_path).splitlines()[-1].endswith("Line 99")
+
+
+def test_logging_at_exit(tmp_path):
+    # Records logged by exit handlers registered before the logger was configured are written
+    script = ("import atexit\n"
+              "from cli_chess.utils.logging import configure_logger\n"
+              "atexit.register(lambda: logger.error('Logged at exit'))\n"
+              f"logger = configure_logger('{LOGGER_NAME}')\n")
+    env = dict(os.environ, HOME=str(tmp_path))
+    subprocess.run([sys.executable, "-c", script], check=True, env=env)
+    assert "Logged at exit" in (tmp_path / ".config" / "cli-chess" / f"{LOGGER_NAME}.log").read_text()
@@ -0,0 +1,132 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.render_scheduler import RenderScheduler
+from cli_chess.utils.event import ui_dispatcher
+from unittest.mock import Mock
+import threading
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.enable_socket
+
+
+class Target:
+    def __init__(self, frame_interval: float):
+        self.frame_interval = frame_interval
+        self.state = 0
+        self.rendered = []
+        self.threads = set()
+
+    def render(self):
+        self.rendered.append(self.state)
+        self.threads.add(threading.get_ident())
+
+
+@pytest.fixture
+def invalidate():
+    return Mock()
+
+
+@pytest.fixture
+def loop(invalidate: Mock):
+    loop = asyncio.new_event_loop()
+    ui_dispatcher.attach(loop, invalidate=invalidate)
+    yield loop
+    ui_dispatcher.detach()
+    loop.close()
+
+
+@pytest.fixture
+def scheduler(loop):
+    scheduler = RenderScheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+def run_for(loop: asyncio.AbstractEventLoop, seconds: float) -> None:
+    loop.run_until_complete(asyncio.sleep(seconds))
+
+
+def test_render(scheduler: RenderScheduler, loop, invalidate: Mock):
+    target = Target(frame_interval=0.01)
+    scheduler.request_render(target)
+    assert not target.rendered
+    run_for(loop, 0.05)
+    assert target.rendered == [0]
+    assert target.threads == {threading.get_ident()}
+    invalidate.assert_called_once()
+
+
+def test_requests_from_other_threads(scheduler: RenderScheduler, loop):
+    # Requests are posted to the UI loop, where the target is rendered
+    target = Target(frame_interval=0.01)
+    thread = threading.Thread(target=scheduler.request_render, args=(target,))
+    thread.start()
+    thread.join()
+    assert not target.rendered
+    run_for(loop, 0.05)
+    assert target.rendered == [0]
+    assert target.threads == {threading.get_ident()}
+
+
+def test_frame_budget(scheduler: RenderScheduler, loop):
+    # A burst of updates within a frame is coalesced, and the latest state is rendered
+    target = Target(frame_interval=0.2)
+    for state in range(100):
+        target.state = state
+        scheduler.request_render(target)
+        run_for(loop, 0.005)
+
+    run_for(loop, 0.25)
+    assert target.rendered[-1] == 99
+    assert len(target.rendered) <= 4
+
+
+def test_per_target_frame_budget(scheduler: RenderScheduler, loop):
+    fast = Target(frame_interval=0.01)
+    slow = Target(frame_interval=10)
+    for _ in range(20):
+        scheduler.request_render(fast)
+        scheduler.request_render(slow)
+        run_for(loop, 0.02)
+
+    assert len(fast.rendered) >= 10
+    assert len(slow.rendered) == 1
+
+
+def test_forget_and_stop(scheduler: RenderScheduler, loop):
+    target = Target(frame_interval=10)
+    scheduler.request_render(target)
+    run_for(loop, 0.01)
+    assert len(target.rendered) == 1
+
+    # A pending render is dropped
+    scheduler.request_render(target)
+    scheduler.forget(target)
+    scheduler.stop()
+    scheduler.request_render(target)
+    run_for(loop, 0.05)
+    assert len(target.rendered) == 1
+
+
+def test_without_ui_loop():
+    scheduler = RenderScheduler()
+    scheduler.start()
+    target = Target(frame_interval=10)
+    scheduler.request_render(target)
+    scheduler.request_render(target)
+    assert target.rendered == [0, 0]
@@ -0,0 +1,107 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils import ui_common
+from cli_chess.utils.ui_common import get_custom_style, get_combined_style, change_views
+from prompt_toolkit.application import Application
+from prompt_toolkit.application.current import set_app
+from prompt_toolkit.input import DummyInput
+from prompt_toolkit.output import DummyOutput
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import Window
+from unittest.mock import Mock
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr('cli_chess.utils.ui_common.get_config_path', lambda: str(tmp_path) + "/")
+    monkeypatch.setattr('cli_chess.utils.ui_common._combined_style_cache', None)
+    return tmp_path
+
+
+def write_custom_style(config_path, text: str) -> None:
+    (config_path / "custom_style.py").write_text(text)
+
+
+def test_custom_style(config_path):
+    # The skeleton is created when the file doesn't exist
+    assert get_custom_style() == {}
+    assert (config_path / "custom_style.py").read_text().startswith("#")
+
+    write_custom_style(config_path, "# Comment\n{\n    'label': 'fg:red',  # Comment\n}")
+    assert get_custom_style() == {'label': 'fg:red'}
+
+
+@pytest.mark.parametrize("text", ["__import__('os').getcwd()", "['label', 'fg:red']", "{'label': "])
+def test_invalid_custom_style(config_path, text):
+    write_custom_style(config_path, text)
+    with pytest.raises((ValueError, SyntaxError)):
+        get_custom_style()
+    with pytest.raises((ValueError, SyntaxError)):
+        get_combined_style()
+
+
+def test_combined_style_cache(config_path, monkeypatch):
+    write_custom_style(config_path, "{'label': 'fg:red'}")
+    parses = []
+    monkeypatch.setattr('cli_chess.utils.ui_common.get_custom_style', lambda: parses.append(True) or get_custom_style())
+
+    style = get_combined_style()
+    assert get_combined_style() is style
+    assert len(parses) == 1
+    assert ("label", "fg:red") in style.styles[-1].style_rules
+
+    # The style is only compiled again once the file changes
+    write_custom_style(config_path, "{'label': 'fg:blue'}")
+    assert get_combined_style() is not style
+    assert len(parses) == 2
+    assert style.styles[0] is ui_common.DEFAULT_STYLE
+
+
+class View:
+    def __init__(self):
+        self.container = Window()
+        self.key_bindings_created = 0
+
+    def get_key_bindings(self) -> KeyBindings:
+        self.key_bindings_created += 1
+        bindings = KeyBindings()
+        bindings.add("c-x")(lambda event: None)
+        return bindings
+
+    def __pt_container__(self) -> Window:
+        return self.container
+
+
+def test_change_views(monkeypatch):
+    global_bindings = KeyBindings()
+    global_bindings.add("c-r")(lambda event: None)
+    main_view = Mock(get_global_key_bindings=Mock(return_value=global_bindings))
+    monkeypatch.setattr('cli_chess.core.main.main_view.main_view', main_view, raising=False)
+
+    app = Application(input=DummyInput(), output=DummyOutput())
+    with set_app(app):
+        menu, game = View(), View()
+        change_views(menu)
+        layout, key_bindings = app.layout, app.key_bindings
+        assert {binding.keys for binding in key_bindings.bindings} == {("c-x",), ("c-r",)}
+
+        # Returning to a view reuses its layout and key bindings
+        change_views(game)
+        assert app.layout is not layout
+        change_views(menu)
+        assert app.layout is layout and app.key_bindings is key_bindings
+        assert menu.key_bindings_created == 1 and main_view.get_global_key_bindings.call_count == 2
@@ -0,0 +1,108 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.workers import WorkerPool
+from cli_chess.utils.common import threaded
+from cli_chess.tests.fake_lichess import wait_for
+from concurrent.futures import wait
+from unittest.mock import Mock
+import threading
+import pytest
+
+
+@pytest.fixture
+def pool():
+    return WorkerPool(max_workers=4, name="test-worker", idle_timeout=0.1)
+
+
+def test_bounded_threads(pool: WorkerPool):
+    release = threading.Event()
+    running = []
+    threads_before = threading.active_count()
+
+    def task(i):
+        running.append(threading.current_thread().name)
+        release.wait(5)
+        return i
+
+    futures = [pool.submit(task, i) for i in range(50)]
+    assert wait_for(lambda: len(running) == 4)
+    assert pool.get_thread_count() == 4
+    assert threading.active_count() - threads_before == 4
+    assert all(name.startswith("test-worker-") for name in running)
+
+    release.set()
+    wait(futures, timeout=5)
+    assert [future.result() for future in futures] == list(range(50))
+    assert threading.active_count() - threads_before <= 4
+
+    # Idle workers exit
+    assert wait_for(lambda: pool.get_thread_count() == 0)
+
+
+def test_idle_workers_are_reused(pool: WorkerPool):
+    for i in range(20):
+        assert pool.submit(lambda: i).result(timeout=5) == i
+    assert pool.get_thread_count() == 1
+
+
+def test_exceptions(pool: WorkerPool):
+    listener = Mock()
+    pool.e_task_failed.add_listener(listener)
+
+    def fail():
+        raise ValueError("Task error")
+
+    owner = object()
+    future = pool.submit(fail, owner=owner)
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    listener.assert_called_once()
+    assert listener.call_args.kwargs['owner'] is owner
+    assert listener.call_args.kwargs['task'].endswith("fail")
+    assert isinstance(listener.call_args.kwargs['error'], ValueError)
+
+    # The worker keeps running tasks after an exception
+    assert pool.submit(lambda: True).result(timeout=5)
+
+
+def test_cancel(pool: WorkerPool):
+    release = threading.Event()
+    owner, other_owner = object(), object()
+    running = [pool.submit(release.wait, 5, owner=owner) for _ in range(4)]
+    assert wait_for(lambda: all(future.running() for future in running))
+
+    queued = [pool.submit(lambda: True, owner=owner) for _ in range(3)]
+    other = pool.submit(lambda: True, owner=other_owner)
+    assert pool.cancel(owner) == 3
+
+    # Running tasks and the tasks of other owners are left to finish
+    release.set()
+    assert all(future.cancelled() for future in queued)
+    assert all(future.result(timeout=5) for future in running)
+    assert other.result(timeout=5)
+    assert pool.cancel(owner) == 0
+
+
+def test_threaded():
+    class Model:
+        @threaded
+        def work(self, value):
+            """Does work"""
+            return threading.current_thread().name, value
+
+    name, value = Model().work(1).result(timeout=5)
+    assert name.startswith("cli-chess-worker-") and value == 1
+    assert Model.work.__doc__ == "Does work"
@@ -1,7 +1,13 @@
-from .common import AlertType, is_linux_os, is_windows_os, is_mac_os, str_to_bool, threaded, retry, open_url_in_browser, RequestSuccessfullySent
-from .config import force_recreate_configs, print_program_config
-from .event import Event, EventManager
-from .logging import log, redact_from_logs
-from .argparse import setup_argparse
-from .styles import default
-from .ui_common import AlertContainer
+from .lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".common": ("AlertType", "is_linux_os", "is_windows_os", "is_mac_os", "str_to_bool", "threaded", "retry", "RetryPolicy",
+                "open_url_in_browser", "RequestSuccessfullySent"),
+    ".config": ("force_recreate_configs", "print_program_config"),
+    ".event": ("Event", "EventManager", "ui_dispatcher", "event_tracer"),
+    ".workers": ("worker_pool",),
+    ".logging": ("log", "redact_from_logs"),
+    ".argparse": ("setup_argparse",),
+    ".styles": ("default",),
+    ".ui_common": ("AlertContainer",),
+})
@@ -15,9 +15,9 @@
 
 import argparse
 from cli_chess.__metadata__ import __name__, __version__, __description__
-from cli_chess.utils.logging import log, redact_from_logs
+from cli_chess.utils.logging import log, redact_from_logs, parse_log_level, DEFAULT_LOG_LEVELS, LOG_LEVEL_NAMES
 from cli_chess.utils.config import get_config_path
-from cli_chess.core.api import required_token_scopes
+from cli_chess.core.api.token_scopes import required_token_scopes
 
 
 class ArgumentParser(argparse.ArgumentParser):
@@ -37,6 +37,14 @@ class ArgumentParser(argparse.ArgumentParser):
         return arguments
 
 
+def log_level_argument(value: str):
+    """Argument type of the --log-level argument"""
+    try:
+        return parse_log_level(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def setup_argparse() -> ArgumentParser:
     """Sets up argparse and parses the arguments passed in at startup"""
     parser = ArgumentParser(description=f"{__name__}: {__description__}")
@@ -63,5 +71,24 @@ def setup_argparse() -> ArgumentParser:
         help="Prints the cli-chess configuration file to the terminal and exits.",
         action="store_true"
     )
+    debug_group.add_argument(
+        "--journal",
+        metavar="FILE",
+        type=str,
+        help="Appends every event received from the Lichess streams to FILE (NDJSON) so it can be replayed later."
+    )
+    debug_group.add_argument(
+        "--log-level",
+        metavar="[LOGGER=]LEVEL",
+        type=log_level_argument,
+        action="append",
+        help=f"Sets the log level ({', '.join(LOG_LEVEL_NAMES)}) of all loggers, or of a single logger "
+             f"({', '.join(DEFAULT_LOG_LEVELS)}) using LOGGER=LEVEL. Can be repeated."
+    )
+    debug_group.add_argument(
+        "--trace-events",
+        help="Records the time spent in each event listener. The results are written to the log on exit, or with Ctrl+T.",
+        action="store_true"
+    )
 
     return parser
@@ -15,10 +15,14 @@
 
 from __future__ import annotations
 from cli_chess.utils.logging import log
+from cli_chess.utils.workers import worker_pool
+from concurrent.futures import Future
+from functools import wraps
 from platform import system
-from typing import Tuple, Type
-import threading
+from time import monotonic, sleep
+from typing import Callable, Optional, Tuple, Type
 import subprocess
+import random
 import enum
 import os
 
@@ -93,26 +97,79 @@ def open_url_in_browser(url: str):
 
 
 def threaded(fn):
-    """Decorator for a threaded function"""
-    def wrapper(*args, **kwargs):
-        threading.Thread(target=fn, args=args, kwargs=kwargs, daemon=True).start()
+    """Decorator to run a function on the shared worker pool. Calls return the
+       future of the task. The task is owned by the first argument (the instance
+       for methods), so queued tasks can be cancelled using `worker_pool.cancel()`.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs) -> Future:
+        return worker_pool.submit(fn, *args, owner=args[0] if args else None, **kwargs)
     return wrapper
 
 
+class RetryPolicy:
+    """Retries a function with exponential backoff and jitter. The delay before
+       retry (n) is `base_delay * 2 ** (n - 1)`, capped at `max_delay`, and is
+       reduced by a random fraction (up to `jitter`) so clients which failed
+       together don't retry together. Only the `exceptions` for which `retry_on`
+       returns True are retried. `min_delay` can lengthen the delay based on the
+       exception (e.g. the time left of a rate limit pause). When a deadline
+       (a monotonic time) is passed to `run()`, a retry which couldn't be made
+       before it isn't attempted.
+    """
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0, jitter: float = 0.5,
+                 exceptions: Tuple[Type[Exception], ...] = (Exception,),
+                 retry_on: Optional[Callable[[Exception], bool]] = None,
+                 min_delay: Optional[Callable[[Exception], float]] = None):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.exceptions = exceptions
+        self.retry_on = retry_on
+        self.min_delay = min_delay
+
+    def get_delay(self, retry: int) -> float:
+        """Returns the number of seconds to wait before the passed in retry (starting at 1)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def run(self, fn: Callable, *args, deadline: Optional[float] = None, **kwargs):
+        """Calls the function, retrying it per the policy. Makes at most
+           `attempts` calls and raises the last exception if they all fail.
+        """
+        attempt = 1
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except self.exceptions as e:
+                if attempt >= self.attempts or (self.retry_on and not self.retry_on(e)):
+                    raise
+
+                delay = self.get_delay(attempt)
+                if self.min_delay:
+                    delay = max(delay, self.min_delay(e))
+                if deadline is not None and monotonic() + delay >= deadline:
+                    log.error(f"Not retrying {fn} as the deadline would be passed. Exception = {e}")
+                    raise
+
+                log.error(f"Exception when attempting to run {fn}. Attempt {attempt} of {self.attempts}, "
+                          f"retrying in {delay:.2f} seconds. Exception = {e}")
+                sleep(delay)
+                attempt += 1
+
+
 def retry(times: int, exceptions: Tuple[Type[Exception], ...]):
-    """Decorator to retry a function. Retries the wrapped function
-       (x) times if the exceptions listed in `exceptions` are thrown.
+    """Decorator to retry a function. The wrapped function is called up to
+       (x) times if the exceptions listed in `exceptions` are thrown, backing
+       off between attempts. See `RetryPolicy` for finer control.
        Example exceptions parameter: exceptions=(ValueError, KeyError)
     """
+    policy = RetryPolicy(attempts=times, exceptions=exceptions)
+
     def wrapper(func):
+        @wraps(func)
         def retry_fn(*args, **kwargs):
-            attempt = 1
-            while attempt <= times:
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    log.error(f"Exception when attempting to run {func}. Attempt {attempt} of {times}. Exception = {e}")
-                    attempt += 1
-            return func(*args, **kwargs)
+            return policy.run(func, *args, **kwargs)
         return retry_fn
     return wrapper
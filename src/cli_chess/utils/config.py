@@ -19,12 +19,18 @@ from cli_chess.utils.event import Event
 from cli_chess.utils.common import VALID_COLOR_DEPTHS
 from getpass import getuser
 from enum import Enum
+from dataclasses import dataclass
 import configparser
+import threading
+import atexit
+import tempfile
 import os
-from typing import List
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 
 all_configs: List["SectionBase"] = []
 DEFAULT_CONFIG_FILENAME = "config.ini"
+WRITE_DEBOUNCE_SECONDS = 0.5
 
 
 def get_config_path() -> str:
@@ -45,9 +51,11 @@ def force_recreate_configs() -> None:
         if os.path.exists(config.full_filename):
             os.remove(config.full_filename)
 
-    # second loop to handle recreation
+    # Configs in the same file share a document, so each document is only cleared once
+    for document in {id(config.document): config.document for config in all_configs}.values():
+        document.read()
+
     for config in all_configs:
-        config.parser = config._get_parser() # noqa
         config.create_section()
 
 
@@ -69,30 +77,152 @@ def print_program_config() -> None:
                 print(e)
 
 
+class ConfigDocument:
+    """The parsed contents of a configuration file. All config sections stored
+       in the same file view into the same document, so the file is read once
+       and every write includes the latest values of all sections. Writes
+       replace the file atomically (write to a temporary file, then rename).
+    """
+    def __init__(self, full_filename: str) -> None:
+        self.full_filename = full_filename
+        self.parser = configparser.ConfigParser()
+        self.lock = threading.RLock()
+        self.generation = 0
+        self._file_signature: Optional[Tuple[int, int]] = None
+        self._write_timer: Optional[threading.Timer] = None
+        self.read()
+
+    def read(self) -> None:
+        """(Re)reads the configuration file"""
+        with self.lock:
+            parser = configparser.ConfigParser()
+            parser.read(self.full_filename)
+            self.parser = parser
+            self.generation += 1
+            self._file_signature = self._get_file_signature()
+
+    def reload_if_changed(self) -> None:
+        """Rereads the configuration file if it was changed or removed outside of this document"""
+        with self.lock:
+            if self._get_file_signature() != self._file_signature:
+                self.read()
+
+    def write_later(self, delay: float = WRITE_DEBOUNCE_SECONDS) -> None:
+        """Writes the document once no further changes have been made for `delay`
+           seconds. This avoids rewriting the file on every change of a setting
+           that's being toggled interactively. Pending writes are flushed on exit.
+        """
+        with self.lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+            self._write_timer = threading.Timer(delay, self.flush)
+            self._write_timer.daemon = True
+            self._write_timer.start()
+
+    def flush(self) -> None:
+        """Writes the document if a delayed write is pending"""
+        with self.lock:
+            if self._write_timer:
+                self.write()
+
+    def write(self) -> None:
+        """Atomically writes the document to the configuration file"""
+        with self.lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+                self._write_timer = None
+
+            file_path = os.path.dirname(self.full_filename)
+            os.makedirs(file_path, exist_ok=True)
+
+            fd, temp_filename = tempfile.mkstemp(dir=file_path, prefix=".config-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as config_file:
+                    self.parser.write(config_file)
+                os.replace(temp_filename, self.full_filename)
+            except Exception:
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+                raise
+            self._file_signature = self._get_file_signature()
+
+    def _get_file_signature(self) -> Optional[Tuple[int, int]]:
+        """Returns the modification time and size of the file, or None if it doesn't exist"""
+        try:
+            stat = os.stat(self.full_filename)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+
+_documents: Dict[str, ConfigDocument] = {}
+_documents_lock = threading.Lock()
+
+
+def get_config_document(full_filename: str) -> ConfigDocument:
+    """Returns the shared document of the configuration file"""
+    with _documents_lock:
+        document = _documents.get(full_filename)
+        if document is None:
+            document = _documents[full_filename] = ConfigDocument(full_filename)
+            atexit.register(document.flush)
+        else:
+            document.reload_if_changed()
+        return document
+
+
 class BaseConfig:
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME) -> None:
         """Default base class constructor"""
         self.file_path = get_config_path()
         self.full_filename = self.file_path + filename
-        self.parser = self._get_parser()
+        self.document = get_config_document(self.full_filename)
+        self._batch_depth = 0
+        self._batch_changed = False
 
         # Event called on any configuration write event (across sections)
         self.e_config_updated = Event()
 
-    def _get_parser(self) -> "ConfigParser":  # noqa: F821
-        """Returns the config parser object"""
-        parser = configparser.ConfigParser()
-        parser.read(self.full_filename)
-        return parser
+    @property
+    def parser(self) -> configparser.ConfigParser:
+        """Returns the parser of the shared configuration document"""
+        return self.document.parser
 
     def write_config(self) -> None:
         """Writes to the configuration file"""
-        if not os.path.exists(self.file_path):
-            os.makedirs(self.file_path)
+        self.document.write()
+        self._notify_config_updated()
+
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners that the configuration has been updated"""
+        self.e_config_updated.notify()
 
-        with open(self.full_filename, 'w') as config_file:
-            self.parser.write(config_file)
-            self.e_config_updated.notify()
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Groups the changes made within the context into a single write
+           of the configuration file and a single update notification
+        """
+        with self.document.lock:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._batch_changed:
+                    self._batch_changed = False
+                    self.write_config()
+
+    def _save(self, debounce: bool = False) -> None:
+        """Saves a change to the configuration. Listeners are notified right away, but
+           when debouncing (or batching), the file is written once the changes are done.
+        """
+        if self._batch_depth:
+            self._batch_changed = True
+        elif debounce:
+            self.document.write_later()
+            self._notify_config_updated()
+        else:
+            self.write_config()
 
     def config_exists(self) -> bool:
         """Returns True if the configuration file exists"""
@@ -100,14 +230,18 @@ class BaseConfig:
 
     def add_section(self, section: str) -> None:
         """Add a section to the configuration file"""
-        self.parser[section] = {}
-        self.write_config()
+        with self.document.lock:
+            self.parser[section] = {}
+            self._save()
 
-    def set_key_value(self, section: str, key: str, value: str) -> None:
-        """Set (or add) a key/value to a section in the configuration file"""
+    def set_key_value(self, section: str, key: str, value: str, debounce: bool = False) -> None:
+        """Set (or add) a key/value to a section in the configuration file.
+           Set `debounce` for interactive changes to delay writing the file.
+        """
         # TODO: Raise error if section does not exist
-        self.parser[section][key] = str(value.strip() if isinstance(value, str) else value)
-        self.write_config()
+        with self.document.lock:
+            self.parser[section][key] = str(value.strip() if isinstance(value, str) else value)
+            self._save(debounce)
 
     def get_config_filename(self) -> str:
         """Returns the configuration filename"""
@@ -167,18 +301,20 @@ class SectionBase(BaseConfig):
            as all expected keys. If the section is missing, the entire section is recreated.
            If a key is missing from the section, the key will be re-added with its default value.
         """
-        if self._section_exists():
-            for key in self.section_keys:
-                if not self._section_has_key(key):
-                    super().set_key_value(self.section_name, key.name, key.default_value)
-        else:
-            self.create_section()
+        with self.batch():
+            if self._section_exists():
+                for key in self.section_keys:
+                    if not self._section_has_key(key):
+                        super().set_key_value(self.section_name, key.name, key.default_value)
+            else:
+                self.create_section()
 
     def create_section(self) -> None:
         """Creates this section using key value defaults"""
-        super().add_section(self.section_name)
-        for key in self.section_keys:
-            super().set_key_value(self.section_name, key.name, key.default_value)
+        with self.batch():
+            super().add_section(self.section_name)
+            for key in self.section_keys:
+                super().set_key_value(self.section_name, key.name, key.default_value)
 
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
@@ -190,9 +326,11 @@ class SectionBase(BaseConfig):
         """Get the value of the key passed in from the configuration file"""
         return super().get_key_value(self.section_name, key.name, False)
 
-    def set_value(self, key: Enum, value: str) -> None:
-        """Set a keys value in the configuration file"""
-        super().set_key_value(self.section_name, key.name, value)
+    def set_value(self, key: Enum, value: str, debounce: bool = False) -> None:
+        """Set a keys value in the configuration file. Set `debounce`
+           for interactive changes to delay writing the file.
+        """
+        super().set_key_value(self.section_name, key.name, value, debounce)
 
     def get_boolean(self, key: Enum) -> bool:
         """Retrieve the boolean value at the passed in section/key pair"""
@@ -228,12 +366,29 @@ class PlayerInfoConfig(SectionBase):
         self.e_player_info_config_updated = Event()
         super().__init__(section_name="player_info", section_keys=self.Keys, filename=filename)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners that the configuration has been updated"""
+        super()._notify_config_updated()
         self.e_player_info_config_updated.notify()
 
 
+@dataclass(frozen=True)
+class GameConfigSnapshot:
+    """An immutable, typed copy of the game configuration values. A new snapshot
+       replaces the previous one on every configuration change, so the values can
+       be read as plain attributes without parsing the configuration.
+    """
+    __slots__ = ("show_board_coordinates", "show_board_highlights", "blindfold_chess", "use_unicode_pieces",
+                 "show_move_list_in_unicode", "show_material_diff_in_unicode", "pad_unicode")
+    show_board_coordinates: bool
+    show_board_highlights: bool
+    blindfold_chess: bool
+    use_unicode_pieces: bool
+    show_move_list_in_unicode: bool
+    show_material_diff_in_unicode: bool
+    pad_unicode: bool
+
+
 class GameConfig(SectionBase):
     """Creates and manages the "game" configuration. This configuration can
        either live in its own file, or be appended as a section by using a
@@ -265,13 +420,36 @@ class GameConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_game_config_updated = Event()
+        self._snapshot: Optional[GameConfigSnapshot] = None
+        self._snapshot_generation = -1
         super().__init__(section_name="game", section_keys=self.Keys, filename=filename)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners that the configuration has been updated"""
+        self._update_snapshot()
+        super()._notify_config_updated()
         self.e_game_config_updated.notify()
 
+    def get_snapshot(self) -> GameConfigSnapshot:
+        """Returns the snapshot of the current game configuration values"""
+        if self._snapshot is None or self._snapshot_generation != self.document.generation:
+            # The configuration file was reread since the snapshot was made
+            self._update_snapshot()
+        return self._snapshot
+
+    def _update_snapshot(self) -> None:
+        """Replaces the snapshot with the latest configuration values"""
+        with self.document.lock:
+            generation = self.document.generation
+            values = {}
+            for key in self.Keys:
+                try:
+                    values[key.value] = self.parser.getboolean(self.section_name, key.name)
+                except (ValueError, configparser.Error):
+                    values[key.value] = key.default_value
+        self._snapshot = GameConfigSnapshot(**values)
+        self._snapshot_generation = generation
+
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
            The keys of the dictionary is this sections Key enum.
@@ -314,9 +492,9 @@ class TerminalConfig(SectionBase):
             super().set_value(self.Keys.TERMINAL_COLOR_DEPTH, self.Keys.TERMINAL_COLOR_DEPTH.default_value)
         return super().get_key_value(self.section_name, key.name, False)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners that the configuration has been updated"""
+        super()._notify_config_updated()
         self.e_program_config_updated.notify()
 
 
@@ -328,12 +506,22 @@ class LichessConfig(SectionBase):
     """
     class Keys(Enum):
         API_TOKEN = "api_token"
+        TV_ARCHIVE_DIRECTORY = "tv_archive_directory"
+        VALIDATED_TOKEN_HASH = "validated_token_hash"
+        VALIDATED_TOKEN_USER = "validated_token_user"
+        VALIDATED_TOKEN_SCOPES = "validated_token_scopes"
+        VALIDATED_TOKEN_TIME = "validated_token_time"
 
         @property
         def default_value(self):
             """Returns the default value for the key"""
             default_lookup = {
-                self.API_TOKEN: ""
+                self.API_TOKEN: "",
+                self.TV_ARCHIVE_DIRECTORY: "",
+                self.VALIDATED_TOKEN_HASH: "",
+                self.VALIDATED_TOKEN_USER: "",
+                self.VALIDATED_TOKEN_SCOPES: "",
+                self.VALIDATED_TOKEN_TIME: "",
             }
             return default_lookup[self]
 
@@ -342,19 +530,19 @@ class LichessConfig(SectionBase):
         super().__init__(section_name="lichess", section_keys=self.Keys, filename=filename)
         redact_from_logs(self.get_value(self.Keys.API_TOKEN))
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners that the configuration has been updated"""
+        super()._notify_config_updated()
         self.e_lichess_config_updated.notify()
 
-    def set_value(self, key, value: str) -> None:
+    def set_value(self, key, value: str, debounce: bool = False) -> None:
         """Set a keys value in the configuration file. Overrides the base
            method to allow for API token log redaction if the value being
            set is an API token.
         """
         if key == self.Keys.API_TOKEN and value:
             redact_from_logs(value)
-        super().set_key_value(self.section_name, key.name, value)
+        super().set_key_value(self.section_name, key.name, value, debounce)
 
 
 player_info_config = PlayerInfoConfig()
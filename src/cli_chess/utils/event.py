@@ -14,7 +14,15 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import annotations
-from typing import Callable, List
+from cli_chess.utils.logging import log
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import asyncio
+import inspect
+import weakref
+import atexit
+import sys
 
 
 class Event:
@@ -22,14 +30,36 @@ class Event:
        which listeners can subscribe to with a callable. The callable will be
        notified when the event is triggered (using notify()). Generallty, this
        class should not be instantiated directly, but rather from the EventManager class.
+
+       Listeners added with `topics` are only notified when the event is triggered
+       with at least one of the topics as a keyword argument (e.g. a listener of
+       the "successfulMoveMade" topic is called by `notify(successfulMoveMade=True)`).
+       Listeners added without topics are notified of everything.
+
+       Listeners added with `ui=True` are always called on the UI event loop. When
+       the event is triggered from another thread (e.g. a stream thread), the call
+       is posted to the loop rather than made on the notifying thread.
+
+       Listeners added with `weak=True` don't keep their object alive, and are
+       removed automatically once it's garbage collected. Use this for listeners
+       on long-lived events (such as configuration events) which would otherwise
+       keep a presenter alive after its view is no longer in use.
     """
     def __init__(self):
-        self.listeners = []
+        self.listeners: List[_Listener] = []
 
-    def add_listener(self, listener: Callable) -> None:
-        """Adds the passed in listener to the notification list"""
-        if listener not in self.listeners:
-            self.listeners.append(listener)
+    def add_listener(self, listener: Callable, ui: bool = False, weak: bool = False, topics: Optional[Iterable[str]] = None) -> None:
+        """Adds the passed in listener to the notification list. Set `ui` for listeners
+           which must be called on the UI event loop, `weak` to only hold a weak reference
+           to the listener, and `topics` to only be notified of specific updates.
+        """
+        if listener in self.listeners:
+            # Already subscribed, widen the existing subscription
+            entry = self.listeners[self.listeners.index(listener)]
+            entry.ui = entry.ui or ui
+            entry.topics = None if entry.topics is None or topics is None else entry.topics.union(topics)
+        else:
+            self.listeners.append(_Listener(listener, ui, weak, topics, self._remove_dead_listener))
 
     def remove_listener(self, listener: Callable) -> None:
         """Removes the passed in listener from the notification list"""
@@ -40,11 +70,292 @@ class Event:
         """Removes all listeners associated to this event"""
         self.listeners.clear()
 
+    def _remove_dead_listener(self, listener: _Listener) -> None:
+        """Removes a weak listener whose object was garbage collected"""
+        try:
+            # Dead weak listeners only compare equal to themselves
+            self.listeners.remove(listener)
+        except ValueError:
+            pass
+
     def notify(self, *args, **kwargs) -> None:
         """Notifies all listeners of the event"""
-        for listener in self.listeners:
+        if event_tracer.enabled:
+            self._notify_traced(_describe_caller(sys._getframe(1)), args, kwargs)
+            return
+
+        for listener in tuple(self.listeners):
+            if listener.topics is not None and listener.topics.isdisjoint(kwargs):
+                continue
+            if listener.ui and ui_dispatcher.post(listener, args, kwargs):
+                continue
+            listener(*args, **kwargs)
+
+    def _notify_traced(self, event_name: str, args: tuple, kwargs: dict) -> None:
+        """Notifies all listeners of the event while recording the time spent in each"""
+        event_tracer.record_notification(event_name)
+        for listener in tuple(self.listeners):
+            if listener.topics is not None and listener.topics.isdisjoint(kwargs):
+                continue
+            if listener.ui and ui_dispatcher.post(listener, args, kwargs):
+                continue
+            start = perf_counter()
+            try:
+                listener(*args, **kwargs)
+            finally:
+                event_tracer.record_call(event_name, listener, perf_counter() - start)
+
+
+class _Listener:
+    """A listener of an event along with its subscription options. Compares
+       equal to the callable it holds, so it can be found and removed using
+       the callable.
+    """
+    __slots__ = ("_listener", "_ref", "ui", "topics")
+
+    def __init__(self, listener: Callable, ui: bool, weak: bool, topics: Optional[Iterable[str]],
+                 on_dead: Callable[[_Listener], None]):
+        self.ui = ui
+        self.topics = frozenset(topics) if topics is not None else None
+        self._listener: Optional[Callable] = None
+        self._ref: Optional[weakref.ref] = None
+        if weak:
+            ref_type = weakref.WeakMethod if inspect.ismethod(listener) else weakref.ref
+            self._ref = ref_type(listener, lambda _: on_dead(self))
+        else:
+            self._listener = listener
+
+    def get(self) -> Optional[Callable]:
+        """Returns the callable, or None if it was a weak listener that has been collected"""
+        return self._listener if self._ref is None else self._ref()
+
+    def __call__(self, *args, **kwargs) -> None:
+        listener = self.get()
+        if listener is not None:
             listener(*args, **kwargs)
 
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        listener = self.get()
+        if isinstance(other, _Listener):
+            other = other.get()
+        return listener is not None and listener == other
+
+    __hash__ = None
+
+
+class UIDispatcher:
+    """Posts calls from other threads to the UI event loop. Calls are run in the
+       order they were posted. A call which is identical to the last call still
+       waiting to run (same listener and arguments) is coalesced into it, so a
+       burst of updates from a stream thread results in a single update. Only
+       the last call is merged, as merging into an earlier one would reorder it
+       ahead of the calls posted in between.
+       The UI is invalidated (redrawn) once after each batch of posted calls.
+    """
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._invalidate: Optional[Callable[[], None]] = None
+        self._pending: List[Tuple[Callable, tuple, dict]] = []
+        self._lock = threading.Lock()
+
+    def attach(self, loop: Optional[asyncio.AbstractEventLoop] = None, invalidate: Optional[Callable[[], None]] = None) -> None:
+        """Attaches the dispatcher to the passed in loop (defaults to the running
+           loop). This must be called from the thread running the loop. `invalidate`
+           is called to redraw the UI after posted and timed calls have run.
+        """
+        with self._lock:
+            self._loop = loop or asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._invalidate = invalidate
+            self._pending.clear()
+
+    def detach(self) -> None:
+        """Detaches the dispatcher from the loop. Pending calls are dropped
+           and calls are made on the notifying thread again.
+        """
+        with self._lock:
+            self._loop = None
+            self._loop_thread_id = None
+            self._invalidate = None
+            self._pending.clear()
+
+    def is_attached(self) -> bool:
+        """Returns True if the dispatcher is attached to a loop"""
+        return self._loop is not None
+
+    def post(self, listener: Callable, args: tuple, kwargs: dict) -> bool:
+        """Posts the call to the UI loop. Returns False if the call should
+           instead be made directly, as the dispatcher isn't attached to a
+           loop or the caller is already running on the loop's thread.
+        """
+        with self._lock:
+            if self._loop is None or threading.get_ident() == self._loop_thread_id:
+                return False
+
+            call = (listener, args, kwargs)
+            if self._pending and self._pending[-1] == call:
+                return True
+
+            self._pending.append(call)
+            if len(self._pending) == 1:
+                try:
+                    self._loop.call_soon_threadsafe(self._run_pending)
+                except RuntimeError:
+                    # The loop was closed without detaching
+                    self._pending.clear()
+                    self._loop = None
+                    return False
+            return True
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Optional[asyncio.TimerHandle]:
+        """Schedules the callback to run on the UI loop after `delay` seconds, followed
+           by a redraw. This must be called from the loop's thread. Returns the handle
+           to cancel the call, or None if the dispatcher isn't attached to the loop.
+        """
+        with self._lock:
+            if self._loop is None or threading.get_ident() != self._loop_thread_id:
+                return None
+            return self._loop.call_later(delay, self._run_timed, callback)
+
+    def _run_timed(self, callback: Callable[[], None]) -> None:
+        """Runs a call scheduled with `call_later()` (on the UI loop)"""
+        try:
+            callback()
+        except Exception as e:
+            log.error(f"Event: Error in timed UI call {callback}: {e}")
+        self._do_invalidate()
+
+    def _do_invalidate(self) -> None:
+        invalidate = self._invalidate
+        if invalidate:
+            invalidate()
+
+    def _run_pending(self) -> None:
+        """Runs the calls posted since the last run (on the UI loop)"""
+        with self._lock:
+            calls, self._pending = self._pending, []
+
+        for listener, args, kwargs in calls:
+            start = perf_counter()
+            try:
+                listener(*args, **kwargs)
+            except Exception as e:
+                log.error(f"Event: Error in UI listener {listener}: {e}")
+            finally:
+                if event_tracer.enabled:
+                    event_tracer.record_call(UI_DISPATCH_EVENT_NAME, listener, perf_counter() - start)
+        self._do_invalidate()
+
+
+UI_DISPATCH_EVENT_NAME = "(posted to UI loop)"
+
+
+class _ListenerStats:
+    __slots__ = ("calls", "total_time", "max_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+
+class EventTracer:
+    """Records the number of notifications of each event along with the number of
+       calls, cumulative and maximum time spent in each listener. Events are named
+       after the method which triggered them (e.g. BoardModel._notify_board_model_updated)
+       and listeners after their owner class and method. Calls posted to the UI loop
+       are recorded under a single event, as the notifying event is no longer known.
+       Tracing is off by default as it adds timing overhead to every notification.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._notifications: Dict[str, int] = {}
+        self._listener_stats: Dict[Tuple[str, str], _ListenerStats] = {}
+        self._lock = threading.Lock()
+        self._dump_on_exit_registered = False
+
+    def start(self, dump_on_exit: bool = True) -> None:
+        """Starts tracing. The results are written to the log on exit if `dump_on_exit` is set"""
+        self.enabled = True
+        if dump_on_exit and not self._dump_on_exit_registered:
+            atexit.register(self.dump)
+            self._dump_on_exit_registered = True
+        log.info("Event tracing started")
+
+    def stop(self) -> None:
+        """Stops tracing. Recorded results are kept"""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Clears the recorded results"""
+        with self._lock:
+            self._notifications.clear()
+            self._listener_stats.clear()
+
+    def record_notification(self, event_name: str) -> None:
+        with self._lock:
+            self._notifications[event_name] = self._notifications.get(event_name, 0) + 1
+
+    def record_call(self, event_name: str, listener: Callable, elapsed: float) -> None:
+        key = (event_name, _describe_listener(listener))
+        with self._lock:
+            stats = self._listener_stats.get(key)
+            if stats is None:
+                stats = self._listener_stats[key] = _ListenerStats()
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+    def get_notification_counts(self) -> Dict[str, int]:
+        """Returns the number of notifications of each event"""
+        with self._lock:
+            return dict(self._notifications)
+
+    def get_listener_stats(self) -> List[dict]:
+        """Returns the stats of each listener, sorted by the cumulative time spent in the listener"""
+        with self._lock:
+            stats = [{'event': event_name, 'listener': listener_name, 'calls': stats.calls,
+                      'total_time': stats.total_time, 'max_time': stats.max_time}
+                     for (event_name, listener_name), stats in self._listener_stats.items()]
+        return sorted(stats, key=lambda entry: entry['total_time'], reverse=True)
+
+    def format_stats(self) -> str:
+        """Returns the recorded results as a table"""
+        notifications = self.get_notification_counts()
+        lines = [f"{'event':<50} {'listener':<60} {'notifies':>8} {'calls':>8} {'total ms':>10} {'avg us':>10} {'max ms':>10}"]
+        for entry in self.get_listener_stats():
+            lines.append(f"{entry['event']:<50} {entry['listener']:<60} {notifications.get(entry['event'], 0):>8} "
+                         f"{entry['calls']:>8} {entry['total_time'] * 1e3:>10.2f} "
+                         f"{entry['total_time'] / entry['calls'] * 1e6:>10.1f} {entry['max_time'] * 1e3:>10.2f}")
+        return "\n".join(lines)
+
+    def dump(self) -> None:
+        """Writes the recorded results to the log"""
+        if self._notifications or self._listener_stats:
+            log.info(f"Event tracing results:\n{self.format_stats()}")
+
+
+def _describe_caller(frame) -> str:
+    """Returns the name of the method of the passed in frame, including its owner class"""
+    owner = frame.f_locals.get('self')
+    return f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+
+
+def _describe_listener(listener: Callable) -> str:
+    """Returns the name of the listener, including its owner class"""
+    if isinstance(listener, _Listener):
+        listener = listener.get()
+    if inspect.ismethod(listener):
+        return f"{type(listener.__self__).__name__}.{listener.__func__.__name__}"
+    return getattr(listener, '__qualname__', None) or repr(listener)
+
+
+ui_dispatcher = UIDispatcher()
+event_tracer = EventTracer()
+
 
 class EventManager:
     """Event manager class. Models which use events should create
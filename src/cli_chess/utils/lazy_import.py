@@ -0,0 +1,40 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+import sys
+
+
+def lazy_exports(package: str, exports: Dict[str, Tuple[str, ...]]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Returns the module `__getattr__` and `__dir__` functions (PEP 562) of a package
+       whose exports are only imported once accessed. `exports` maps each submodule
+       (relative to the package) to the names it exports. This way, importing a single
+       submodule (e.g. cli_chess.utils.logging) doesn't load everything the package exports.
+    """
+    lookup = {name: submodule for submodule, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        submodule = lookup.get(name)
+        if submodule is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(import_module(submodule, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(lookup))
+
+    return __getattr__, __dir__
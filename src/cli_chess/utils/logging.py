@@ -13,48 +13,138 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
 import logging
+import atexit
+import queue
+import os
+import re
 
 log = logging.getLogger("cli-chess")
 log_redactions = []
+_redaction_pattern: Optional[re.Pattern] = None
 
+# Records from every thread are put on this queue and written to the log
+# files by a single background thread, so logging never blocks on file I/O
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_file_handlers: List[logging.Handler] = []
+_log_listener: Optional[QueueListener] = None
 
-def configure_logger(name: str, level=logging.DEBUG) -> logging.Logger:
-    """Configures and returns a logger instance"""
+# Log files are rotated once they reach the max size. The previous
+# session's log is also kept as a backup when a new session starts.
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 2
+
+# The chess.engine logger logs every engine "info" line at DEBUG
+DEFAULT_LOG_LEVELS: Dict[str, int] = {
+    "cli-chess": logging.DEBUG,
+    "chess.engine": logging.INFO,
+    "berserk": logging.DEBUG,
+}
+LOG_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_configured_loggers: List[str] = []
+
+
+def configure_logger(name: str, level: Optional[int] = None, max_bytes: int = LOG_MAX_BYTES,
+                     backup_count: int = LOG_BACKUP_COUNT) -> logging.Logger:
+    """Configures and returns a logger instance. The records of the
+       logger are written to its own file by the background log writer.
+       The level defaults to the logger's entry in DEFAULT_LOG_LEVELS.
+    """
     from cli_chess.utils.config import get_config_path
 
     log_file = f"{get_config_path()}" + f"{name}.log"
     log_format = "%(asctime)s.%(msecs)03d | %(levelname)-5s | %(name)s | %(module)s.%(funcName)s | %(message)s"
     time_format = "%m/%d/%Y %I:%M:%S"
 
-    file_handler = logging.FileHandler(log_file, mode="w")
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=max(backup_count, 1))
+    if os.path.getsize(log_file):
+        # Start this session with a fresh log, keeping the previous session's log
+        file_handler.doRollover()
     file_handler.setFormatter(LoggingRedactor(log_format, time_format))
+    file_handler.addFilter(logging.Filter(name))
+    _start_log_writer(file_handler)
 
     logger = logging.getLogger(name)
-    logger.setLevel(level)
-    logger.addHandler(file_handler)
+    logger.setLevel(level if level is not None else DEFAULT_LOG_LEVELS.get(name, logging.DEBUG))
+    logger.addHandler(QueueHandler(_log_queue))
+    if name not in _configured_loggers:
+        _configured_loggers.append(name)
 
     return logger
 
 
+def parse_log_level(value: str) -> Tuple[Optional[str], int]:
+    """Parses a log level argument in the form of LEVEL or LOGGER=LEVEL. Returns
+       the logger name (None for all loggers) and level. Raises a ValueError if invalid.
+    """
+    name, _, level_name = value.rpartition("=")
+    level_name = level_name.strip().upper()
+    if level_name not in LOG_LEVEL_NAMES:
+        raise ValueError(f"Invalid log level: {level_name} (expected one of {', '.join(LOG_LEVEL_NAMES)})")
+    return name.strip() or None, logging.getLevelName(level_name)
+
+
+def set_log_levels(levels: List[Tuple[Optional[str], int]]) -> None:
+    """Sets the levels of the configured loggers. A level without a logger name
+       applies to all configured loggers. Later entries take precedence.
+    """
+    for name, level in levels:
+        for logger_name in ([name] if name else _configured_loggers):
+            logging.getLogger(logger_name).setLevel(level)
+            log.debug(f"Log level of {logger_name} set to {logging.getLevelName(level)}")
+
+
+def _start_log_writer(file_handler: logging.Handler) -> None:
+    """(Re)starts the background log writer with the passed in file handler added"""
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+
+    _log_file_handlers.append(file_handler)
+    _log_listener = QueueListener(_log_queue, *_log_file_handlers)
+    _log_listener.start()
+
+
+def stop_log_writer() -> None:
+    """Writes the queued records and stops the background log writer"""
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+        _log_listener = None
+    for handler in _log_file_handlers:
+        handler.close()
+    _log_file_handlers.clear()
+
+
+# Registered on import, before the modules which log can register their exit
+# handlers. Exit handlers run in reverse order, so the log writer is stopped
+# after them and the records they log are still written.
+atexit.register(stop_log_writer)
+
+
 def redact_from_logs(text: str = "") -> None:
     """Adds the passed in text to the log redaction list"""
+    global _redaction_pattern
     text = text.strip()
     if text and text not in log_redactions:
         log_redactions.append(text)
+        # Longer items first, so an item containing another is fully redacted
+        items = sorted(log_redactions, key=len, reverse=True)
+        _redaction_pattern = re.compile("|".join(re.escape(item) for item in items))
 
 
 class LoggingRedactor(logging.Formatter):
     """Log formatter that redacts matches from being logged.
-       Loops through the `log_redactions` list and replaces the
-       text before outputting it to the log (eg. API keys)
+       Replaces all items of the `log_redactions` list in
+       a single pass before outputting it to the log (eg. API keys)
     """
     @staticmethod
     def _filter(text):
-        redacted_text = text
-        for item in log_redactions:
-            redacted_text = redacted_text.replace(item, "********")
-        return redacted_text
+        if _redaction_pattern is None:
+            return text
+        return _redaction_pattern.sub("********", text)
 
     def format(self, log_record):
         text = logging.Formatter.format(self, log_record)
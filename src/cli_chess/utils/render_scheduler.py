@@ -0,0 +1,123 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.event import ui_dispatcher
+from cli_chess.utils.logging import log
+from asyncio import TimerHandle
+from time import monotonic
+from typing import Any, Dict, Optional, Set
+
+
+class RenderScheduler:
+    """Renders targets on the UI loop, at most once per the target's frame
+       interval, so renders never race the models they read (which are
+       updated on the UI loop). Render requests made within a frame are
+       coalesced so a target receiving a burst of updates renders only its
+       latest state. Requests made from other threads are posted to the
+       UI loop. The UI is redrawn once for each batch of renders. Targets
+       must implement `render()` and a `frame_interval` attribute which is
+       the minimum number of seconds between renders of the target (its
+       frame budget). Without a UI loop, targets are rendered right away.
+    """
+    def __init__(self):
+        self.render_count = 0
+        self._pending: Set[Any] = set()
+        self._last_render: Dict[Any, float] = {}
+        self._timer: Optional[TimerHandle] = None
+        self._timer_due = 0.0
+        self._running = False
+
+    def request_render(self, target: Any) -> None:
+        """Schedules the target to be rendered on its next frame"""
+        if ui_dispatcher.post(self.request_render, (target,), {}):
+            return
+
+        if not self._running:
+            return
+        if not ui_dispatcher.is_attached():
+            self._render(target)
+            return
+        self._pending.add(target)
+        self._schedule()
+
+    def forget(self, target: Any) -> None:
+        """Drops any pending render of the target"""
+        self._pending.discard(target)
+        self._last_render.pop(target, None)
+
+    def start(self) -> None:
+        self._running = True
+
+    def stop(self) -> None:
+        """Stops the scheduler. Pending renders are dropped"""
+        self._running = False
+        self._pending.clear()
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule(self) -> None:
+        """Schedules a run for when the next pending target is due, unless an
+           earlier run is already scheduled
+        """
+        wait = self._get_next_wait()
+        if wait is None:
+            return
+
+        due = monotonic() + wait
+        if self._timer and self._timer_due <= due:
+            return
+        if self._timer:
+            self._timer.cancel()
+        self._timer = ui_dispatcher.call_later(wait, self._run)
+        self._timer_due = due
+
+    def _run(self) -> None:
+        """Renders the due targets (on the UI loop) and schedules the next run"""
+        self._timer = None
+        if not self._running:
+            return
+        self._render_due()
+        self._schedule()
+
+    def _render_due(self) -> None:
+        for target in self._get_due_targets():
+            self._render(target)
+
+    def _render(self, target: Any) -> None:
+        try:
+            target.render()
+        except Exception as e:
+            log.error(f"Render error: {e}")
+        self._last_render[target] = monotonic()
+        self.render_count += 1
+
+    def _get_due_targets(self) -> list:
+        """Removes and returns the pending targets whose frame interval has elapsed"""
+        now = monotonic()
+        due = [target for target in self._pending
+               if now - self._last_render.get(target, float("-inf")) >= target.frame_interval]
+        self._pending.difference_update(due)
+        return due
+
+    def _get_next_wait(self) -> Optional[float]:
+        """Returns the number of seconds until the next pending target is
+           due, or None if nothing is pending
+        """
+        if not self._pending:
+            return None
+        now = monotonic()
+        return max(0.0, min(self._last_render.get(target, float("-inf")) + target.frame_interval - now
+                            for target in self._pending))
@@ -17,18 +17,26 @@ from __future__ import annotations
 from cli_chess.utils import AlertType, log
 from cli_chess.utils.common import VALID_COLOR_DEPTHS
 from cli_chess.utils.config import get_config_path
+from cli_chess.utils.styles import default
 from prompt_toolkit.layout import Window, FormattedTextControl, ConditionalContainer
 from prompt_toolkit.filters import to_filter
 from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
-from prompt_toolkit.key_binding import KeyPressEvent, merge_key_bindings
+from prompt_toolkit.key_binding import KeyPressEvent, KeyBindingsBase, merge_key_bindings
 from prompt_toolkit.application import get_app
 from prompt_toolkit.layout import Layout, Container
-from typing import TypeVar, Callable, cast
+from prompt_toolkit.styles import BaseStyle, Style, merge_styles
+from typing import TypeVar, Callable, Optional, Tuple, cast
+import threading
+import ast
 import os
 
 E = TypeVar("E", bound=Callable[[KeyPressEvent], None])
 T = TypeVar("T", bound=Callable[[MouseEvent], None])
 
+DEFAULT_STYLE = Style.from_dict(default)
+_combined_style_cache: Optional[Tuple[Tuple[str, int, int], BaseStyle]] = None
+_combined_style_lock = threading.Lock()
+
 
 def go_back_to_main_menu() -> None:
     """Returns to the main menu"""
@@ -43,28 +51,42 @@ def change_views(container: Container, focused_element=None):
     log.debug(f"View changed to {type(container).__name__} (id={id(container)})")
     app = get_app()
     focused_element = focused_element if focused_element else container
-    app.layout = Layout(container)
-
+    layout, key_bindings = get_view_state(container)
+    app.layout = layout
+
+    # NOTE: There's a possible PT bug here. There shouldn't be a need to
+    #  assign the current container bindings to the application. The bindings
+    #  should be picked up automatically (and are the majority of the time).
+    #  However, I've seen this drop bindings multiple times (e.g. if spamming
+    #  a menu change quickly, or sometimes after clicking the function bar).
+    app.key_bindings = key_bindings
     try:
-        app.key_bindings = None
         app.layout.focus(focused_element)
-
-        # NOTE: There's a possible PT bug here. There shouldn't be a need to
-        #  assign the current container bindings to the application. The bindings
-        #  should be picked up automatically (and are the majority of the time).
-        #  However, I've seen this drop bindings multiple times (e.g. if spamming
-        #  a menu change quickly, or sometimes after clicking the function bar).
-        from cli_chess.core.main.main_view import main_view
-        app.key_bindings = merge_key_bindings([container.get_key_bindings(), main_view.get_global_key_bindings()])  # noqa
-    except (ValueError, AttributeError):
+    except ValueError:
         # ValueError is expected on elements that cannot be focused. Proceed regardless.
-        # AttributeError is expected on containers that don't define `get_key_bindings()`.
-        # In the case of AttributeError, PT will look at each container to grab bindings.
         pass
 
     repaint_ui()
 
 
+def get_view_state(container: Container) -> Tuple[Layout, Optional[KeyBindingsBase]]:
+    """Returns the layout and application key bindings of the passed in view. These
+       are built on the first switch to the view and are owned by the view, so they
+       are reused when returning to it and dropped along with it. The key bindings
+       are None for views which don't define `get_key_bindings()`, in which case
+       PT will look at each container to grab bindings.
+    """
+    state = getattr(container, "_view_state", None)
+    if state is None:
+        key_bindings = None
+        if hasattr(container, "get_key_bindings"):
+            from cli_chess.core.main.main_view import main_view
+            key_bindings = merge_key_bindings([container.get_key_bindings(), main_view.get_global_key_bindings()])  # noqa
+        state = (Layout(container), key_bindings)
+        container._view_state = state
+    return state
+
+
 def repaint_ui() -> None:
     """Force the ui to repaint"""
     get_app().invalidate()
@@ -104,20 +126,46 @@ def set_color_depth(depth: str) -> None:
 
 
 def get_custom_style() -> dict:
-    """Returns the user defined custom style"""
+    """Returns the user defined custom style. The file is parsed as a
+       literal, so it can't run code. Raises an exception on parsing errors.
+    """
     try:
-        custom_style_path = get_config_path() + "custom_style.py"
-        if not os.path.isfile(custom_style_path) or os.stat(custom_style_path).st_size == 0:
-            create_skeleton_custom_style()
-
+        custom_style_path = _get_custom_style_path()
         with open(custom_style_path, 'r') as file:
-            custom_style = file.read()
-            return eval(custom_style)
+            custom_style = ast.literal_eval(file.read())
+        if not isinstance(custom_style, dict):
+            raise ValueError(f"Expected a dictionary but found {type(custom_style).__name__}")
+        return custom_style
     except Exception as e:
         log.critical(f"Custom style error: {e}")
         raise
 
 
+def get_combined_style() -> BaseStyle:
+    """Returns the cli-chess default style merged with the user defined custom
+       style. The compiled style is cached until the modification time or size of
+       the custom style file changes. Raises an exception on parsing errors.
+    """
+    global _combined_style_cache
+    with _combined_style_lock:
+        custom_style_path = _get_custom_style_path()
+        stat = os.stat(custom_style_path)
+        key = (custom_style_path, stat.st_mtime_ns, stat.st_size)
+        if _combined_style_cache is None or _combined_style_cache[0] != key:
+            style = merge_styles([DEFAULT_STYLE, Style.from_dict(get_custom_style())])
+            _combined_style_cache = (key, style)
+            log.debug("Compiled custom style")
+        return _combined_style_cache[1]
+
+
+def _get_custom_style_path() -> str:
+    """Returns the path of the custom style file, creating the skeleton if it's missing or empty"""
+    custom_style_path = get_config_path() + "custom_style.py"
+    if not os.path.isfile(custom_style_path) or os.stat(custom_style_path).st_size == 0:
+        create_skeleton_custom_style()
+    return custom_style_path
+
+
 def create_skeleton_custom_style() -> None:
     """Creates (or overwrites) the 'custom_style.py' file.
        Raises an exception on generation errors.
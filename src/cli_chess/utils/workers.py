@@ -0,0 +1,124 @@
+# Copyright (C) 2021-2023 Trevor Bayless <trevorbayless1@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from cli_chess.utils.logging import log
+from cli_chess.utils.event import Event
+from concurrent.futures import Future
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Set, Tuple
+import threading
+
+MAX_WORKERS = 8
+WORKER_IDLE_TIMEOUT = 30.0
+
+_Task = Tuple[Future, Callable, tuple, dict, Any]
+
+
+class WorkerPool:
+    """A bounded pool of named daemon worker threads which runs tasks in the
+       background (e.g. engine moves and Lichess requests). Threads are started
+       as needed up to `max_workers`, after which tasks wait in a queue, and they
+       exit after being idle for `idle_timeout` seconds. Tasks are submitted with
+       an optional owner so the queued tasks of an owner can be cancelled (e.g.
+       on game exit). Exceptions raised by tasks are logged and notified through
+       `e_task_failed` (with the task name, owner and error), in addition to
+       being set on the returned future.
+    """
+    def __init__(self, max_workers: int = MAX_WORKERS, name: str = "cli-chess-worker", idle_timeout: float = WORKER_IDLE_TIMEOUT):
+        if max_workers < 1:
+            raise ValueError("The pool requires at least one worker")
+        self.max_workers = max_workers
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.e_task_failed = Event()
+        self._tasks: Deque[_Task] = deque()
+        self._threads: Set[threading.Thread] = set()
+        self._idle = 0
+        self._thread_count = 0
+        self._owner_tasks: Dict[int, Set[Future]] = {}
+        self._cond = threading.Condition()
+
+    def submit(self, fn: Callable, *args, owner: Any = None, **kwargs) -> Future:
+        """Queues the function to be run by a worker and returns its future"""
+        future = Future()
+        with self._cond:
+            if owner is not None:
+                owner_id = id(owner)
+                self._owner_tasks.setdefault(owner_id, set()).add(future)
+                future.add_done_callback(lambda f: self._forget(owner_id, f))
+
+            self._tasks.append((future, fn, args, kwargs, owner))
+            if self._idle >= len(self._tasks):
+                self._cond.notify()
+            elif len(self._threads) < self.max_workers:
+                self._thread_count += 1
+                thread = threading.Thread(target=self._work, name=f"{self.name}-{self._thread_count}", daemon=True)
+                self._threads.add(thread)
+                thread.start()
+        return future
+
+    def cancel(self, owner: Any) -> int:
+        """Cancels the tasks of the owner which haven't started yet and returns
+           the number cancelled. Tasks which are running are left to finish.
+        """
+        with self._cond:
+            futures = list(self._owner_tasks.get(id(owner), ()))
+        cancelled = sum(future.cancel() for future in futures)
+        if cancelled:
+            log.debug("%s: Cancelled %s task(s) of %s", self.name, cancelled, type(owner).__name__)
+        return cancelled
+
+    def get_thread_count(self) -> int:
+        """Returns the number of worker threads alive"""
+        with self._cond:
+            return len(self._threads)
+
+    def _forget(self, owner_id: int, future: Future) -> None:
+        with self._cond:
+            tasks = self._owner_tasks.get(owner_id)
+            if tasks is not None:
+                tasks.discard(future)
+                if not tasks:
+                    del self._owner_tasks[owner_id]
+
+    def _work(self) -> None:
+        """Runs queued tasks until the worker has been idle for `idle_timeout`"""
+        while True:
+            with self._cond:
+                while not self._tasks:
+                    self._idle += 1
+                    notified = self._cond.wait(self.idle_timeout)
+                    self._idle -= 1
+                    if not notified and not self._tasks:
+                        self._threads.discard(threading.current_thread())
+                        return
+                task = self._tasks.popleft()
+            self._run(*task)
+
+    def _run(self, future: Future, fn: Callable, args: tuple, kwargs: dict, owner: Any) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            name = getattr(fn, "__qualname__", repr(fn))
+            log.exception(f"{self.name}: Error in {name}: {e}")
+            future.set_exception(e)
+            self.e_task_failed.notify(task=name, owner=owner, error=e)
+        else:
+            future.set_result(result)
+
+
+worker_pool = WorkerPool()